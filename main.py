@@ -82,6 +82,7 @@ def main():
         # Initialize components
         from src.core.plex_client import PlexClient
         from src.core.file_operations import AtomicFileOperations
+        from src.core.throttle import BandwidthLimiter
         from src.core.cache_manager import CacheManager
         
         # Create Plex client
@@ -97,7 +98,22 @@ def main():
             array_path=config.paths.real_source or '/media',
             max_concurrent_cache=config.performance.max_concurrent_to_cache,
             max_concurrent_array=config.performance.max_concurrent_to_array,
+            min_concurrent_cache=config.performance.min_concurrent_to_cache,
+            min_concurrent_array=config.performance.min_concurrent_to_array,
+            adaptive_concurrency=config.performance.adaptive_concurrency,
             dry_run=config.dry_run,
+            reflink=config.performance.reflink,
+            hardlink_fallback=config.performance.hardlink_fallback,
+            streams_per_disk=config.performance.streams_per_disk,
+            drop_page_cache=config.performance.drop_page_cache,
+            direct_io_min_mb=config.performance.direct_io_min_mb,
+            bandwidth=BandwidthLimiter(
+                to_cache_mb_s=config.performance.max_mb_s_to_cache,
+                to_array_mb_s=config.performance.max_mb_s_to_array,
+                per_disk_to_cache_mb_s=config.performance.max_mb_s_per_disk_to_cache,
+                per_disk_to_array_mb_s=config.performance.max_mb_s_per_disk_to_array,
+                session_backoff_mb_s=config.performance.session_backoff_mb_s,
+            ),
         )
         
         # Create cache manager
@@ -113,22 +129,39 @@ def main():
             logger.info("Shutting down...")
             cache_manager.stop()
         
+        import threading
+        
+        # Set when background startup fails; the main thread then exits with 1
+        startup_failed = threading.Event()
+        
         atexit.register(shutdown)
-        signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+        signal.signal(signal.SIGTERM, lambda *args: sys.exit(1 if startup_failed.is_set() else 0))
         signal.signal(signal.SIGINT, lambda *args: sys.exit(0))
         
-        # Start cache manager
-        if not cache_manager.start():
-            logger.error("Failed to start cache manager")
-            sys.exit(1)
-        
         if args.run_once:
+            # Start cache manager
+            if not cache_manager.start():
+                logger.error("Failed to start cache manager")
+                sys.exit(1)
+            
             # Run single cache cycle
             logger.info("Running single cache cycle...")
             result = cache_manager.run_cache_cycle()
             logger.info(f"Cache cycle complete: {result}")
             return
         
+        # Start cache manager in the background so the API answers while
+        # trackers load and Plex connects
+        def start_manager():
+            if not cache_manager.start():
+                logger.error("Failed to start cache manager")
+                # Exit from the main thread, so atexit stops the manager and
+                # flushes tracker writes
+                startup_failed.set()
+                os.kill(os.getpid(), signal.SIGTERM)
+        
+        threading.Thread(target=start_manager, name="cacherr-startup", daemon=True).start()
+        
         if args.web_only:
             # Just run web server
             from src.api.routes import create_app
@@ -138,7 +171,6 @@ def main():
         else:
             # Run web server with background cache operations
             from src.api.routes import create_app
-            import threading
             import time
             
             app = create_app(cache_manager)
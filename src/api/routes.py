@@ -40,20 +40,34 @@ def api_response(success: bool, data: Any = None, message: str = "", error: str
     }
 
 
+def starting_response():
+    """503 for requests that need the cache manager's startup to have finished."""
+    return jsonify(api_response(False, error="starting")), 503
+
+
 # ============================================================
 # Health & Status Endpoints
 # ============================================================
 
 @api.route('/health', methods=['GET'])
 def health_check():
-    """Health check endpoint."""
+    """Health check endpoint.
+    
+    Returns 200 while trackers are still loading or startup is still
+    running ('starting'), so container healthchecks don't restart the app
+    during a slow load.
+    """
     manager = get_cache_manager()
     healthy = manager is not None and manager._running if manager else False
     
+    status = 'healthy' if healthy else 'unhealthy'
+    if manager is not None and not (manager.ready and manager.started):
+        status = 'starting'
+    
     return jsonify({
-        'status': 'healthy' if healthy else 'unhealthy',
+        'status': status,
         'timestamp': datetime.now(timezone.utc).isoformat(),
-    }), 200 if healthy else 503
+    }), 503 if status == 'unhealthy' else 200
 
 
 @api.route('/status', methods=['GET'])
@@ -88,16 +102,15 @@ def get_cached_files():
     if not manager:
         return jsonify(api_response(False, error="Cache manager not initialized")), 500
     
-    entries = manager.timestamp_tracker.get_all_entries()
-    
     files = []
-    for path, entry in entries.items():
-        files.append({
-            'path': path,
-            'source': entry.get('source', 'unknown'),
-            'cached_at': entry.get('cached_at'),
-            'size_bytes': entry.get('file_size_bytes', 0),
-        })
+    with manager.timestamp_tracker.locked():
+        for path, entry in manager.timestamp_tracker.get_all_entries().items():
+            files.append({
+                'path': path,
+                'source': entry.get('source', 'unknown'),
+                'cached_at': entry.get('cached_at'),
+                'size_bytes': entry.get('file_size_bytes', 0),
+            })
     
     # Sort by cached_at descending
     files.sort(key=lambda x: x.get('cached_at', ''), reverse=True)
@@ -118,6 +131,8 @@ def run_cache_cycle():
     manager = get_cache_manager()
     if not manager:
         return jsonify(api_response(False, error="Cache manager not initialized")), 500
+    if not manager.started:
+        return starting_response()
     
     try:
         result = manager.run_cache_cycle()
@@ -133,6 +148,8 @@ def run_reconciliation():
     manager = get_cache_manager()
     if not manager:
         return jsonify(api_response(False, error="Cache manager not initialized")), 500
+    if not manager.started:
+        return starting_response()
     
     try:
         result = manager.reconcile()
@@ -148,6 +165,8 @@ def trigger_eviction():
     manager = get_cache_manager()
     if not manager:
         return jsonify(api_response(False, error="Cache manager not initialized")), 500
+    if not manager.started:
+        return starting_response()
     
     try:
         data = request.get_json() or {}
@@ -167,16 +186,10 @@ def trigger_eviction():
                     'message': 'Cache is under threshold'
                 }))
             
-            from .core.trackers import CachePriorityScorer
-            entries = manager.timestamp_tracker.get_all_entries()
             target_bytes = manager._limit_bytes * manager.config.cache_limits.eviction_target_percent / 100
             bytes_to_free = stats.total_size_bytes - target_bytes
             
-            candidates = CachePriorityScorer.get_eviction_candidates(
-                entries,
-                target_bytes=int(bytes_to_free),
-                min_priority=manager.config.cache_limits.eviction_min_priority,
-            )
+            candidates = manager.get_eviction_candidates(bytes_to_free)
             
             return jsonify(api_response(True, data={
                 'dry_run': True,
@@ -204,16 +217,17 @@ def uncache_file(file_path: str):
     manager = get_cache_manager()
     if not manager:
         return jsonify(api_response(False, error="Cache manager not initialized")), 500
+    if not manager.started:
+        return starting_response()
     
     # Prepend / if not present
     if not file_path.startswith('/'):
         file_path = '/' + file_path
     
     try:
-        result = manager.file_ops.restore_to_array(file_path)
+        result = manager.file_ops.submit_restore(file_path).result()
         
         if result.success:
-            manager.timestamp_tracker.remove_entry(file_path)
             return jsonify(api_response(True, message=f"File restored to array"))
         else:
             return jsonify(api_response(False, error=result.error)), 400
@@ -324,6 +338,44 @@ def update_config():
         return jsonify(api_response(False, error=str(e))), 500
 
 
+# ============================================================
+# Bandwidth Endpoints
+# ============================================================
+
+@api.route('/bandwidth', methods=['GET'])
+def get_bandwidth():
+    """Get transfer bandwidth limits and actual throughput (MB/s)."""
+    manager = get_cache_manager()
+    if not manager:
+        return jsonify(api_response(False, error="Cache manager not initialized")), 500
+    
+    return jsonify(api_response(True, data=manager.file_ops.bandwidth.get_stats()))
+
+
+@api.route('/bandwidth', methods=['PATCH'])
+def update_bandwidth():
+    """Change transfer bandwidth limits at runtime (MB/s, 0 = unlimited)."""
+    manager = get_cache_manager()
+    if not manager:
+        return jsonify(api_response(False, error="Cache manager not initialized")), 500
+    
+    fields = ('to_cache_mb_s', 'to_array_mb_s', 'per_disk_to_cache_mb_s', 'per_disk_to_array_mb_s',
+              'session_backoff_mb_s')
+    try:
+        updates = request.get_json() or {}
+        unknown = set(updates) - set(fields)
+        if unknown:
+            return jsonify(api_response(False, error=f"Unknown fields: {', '.join(sorted(unknown))}")), 400
+        
+        limits = {k: float(v) for k, v in updates.items()}
+        manager.file_ops.bandwidth.set_limits(**limits)
+        
+        return jsonify(api_response(True, data=manager.file_ops.bandwidth.get_stats(),
+                                    message="Bandwidth limits updated"))
+    except (TypeError, ValueError) as e:
+        return jsonify(api_response(False, error=str(e))), 400
+
+
 # ============================================================
 # Utility Endpoints
 # ============================================================
@@ -84,8 +84,8 @@ class CacheLimitSettings(BaseModel):
     # Eviction strategy
     eviction_mode: str = Field(
         default="none",
-        pattern="^(none|fifo|smart)$",
-        description="Eviction strategy: none, fifo, or smart"
+        pattern="^(none|fifo|smart|size_aware)$",
+        description="Eviction strategy: none, fifo, smart, or size_aware (least priority lost per byte freed)"
     )
     eviction_threshold_percent: int = Field(
         default=90, ge=1, le=100,
@@ -97,13 +97,23 @@ class CacheLimitSettings(BaseModel):
     )
     eviction_min_priority: int = Field(
         default=60, ge=0, le=100,
-        description="Only evict files with priority below this (smart mode)"
+        description="Only evict files with priority below this (smart/size_aware modes)"
     )
     eviction_protected_hours: float = Field(
         default=2.0, ge=0,
         description="Don't evict files cached within this many hours"
     )
     
+    # Admission control for copies that don't fit the limit or the drive
+    admission_eviction: bool = Field(
+        default=True,
+        description="Evict just enough low-priority files to admit a copy that doesn't fit (needs an eviction mode)"
+    )
+    admission_wait_seconds: int = Field(
+        default=300, ge=0,
+        description="How long a copy that doesn't fit waits for in-flight copies before failing"
+    )
+    
     @field_validator('eviction_target_percent')
     @classmethod
     def target_must_be_less_than_threshold(cls, v, info):
@@ -188,8 +198,61 @@ class PerformanceSettings(BaseModel):
     
     max_concurrent_to_cache: int = Field(default=3, ge=1, le=10, description="Concurrent moves to cache")
     max_concurrent_to_array: int = Field(default=1, ge=1, le=5, description="Concurrent moves to array")
+    adaptive_concurrency: bool = Field(
+        default=True,
+        description="Tune concurrent moves between the min and max from measured throughput"
+    )
+    min_concurrent_to_cache: int = Field(default=1, ge=1, le=10, description="Fewest concurrent moves to cache when adaptive")
+    min_concurrent_to_array: int = Field(default=1, ge=1, le=5, description="Fewest concurrent moves to array when adaptive")
     retry_limit: int = Field(default=5, ge=1, le=20, description="Retry attempts for failed operations")
     delay_seconds: int = Field(default=10, ge=1, le=60, description="Delay between retries")
+    reflink: bool = Field(default=True, description="Clone files with FICLONE when cache and source share a filesystem")
+    hardlink_fallback: bool = Field(
+        default=False,
+        description="Hardlink instead of copying when cache and source share a filesystem but can't reflink"
+    )
+    streams_per_disk: int = Field(
+        default=1, ge=1, le=4,
+        description="Concurrent transfers per physical array disk (/mnt/diskN); no per-disk limit when disks can't be resolved"
+    )
+    drop_page_cache: bool = Field(
+        default=True,
+        description="Drop copied data from the page cache during transfers (keeps Plex's working set cached)"
+    )
+    direct_io_min_mb: int = Field(
+        default=0, ge=0,
+        description="Copy files of at least this many MB with O_DIRECT, bypassing the page cache (0 = off)"
+    )
+    
+    # Bandwidth limits in MB/s (0 = unlimited), adjustable at runtime via /api/bandwidth
+    max_mb_s_to_cache: float = Field(default=0, ge=0, description="Total copy rate to cache")
+    max_mb_s_to_array: float = Field(default=0, ge=0, description="Total copy rate back to array")
+    max_mb_s_per_disk_to_cache: float = Field(default=0, ge=0, description="Copy rate to cache per source disk")
+    max_mb_s_per_disk_to_array: float = Field(default=0, ge=0, description="Copy rate to array per target disk")
+    session_backoff_mb_s: float = Field(
+        default=20, ge=0,
+        description="Copy rate on a disk someone is streaming from (0 = no backoff)"
+    )
+
+
+class StorageSettings(BaseModel):
+    """Tracker persistence settings."""
+    model_config = ConfigDict(validate_default=True, extra='ignore')
+    
+    tracker_backend: str = Field(
+        default="sqlite",
+        pattern="^(json|sqlite|journal)$",
+        description="Tracker storage: sqlite (row-level, WAL), journal (JSON snapshot + append log) or json (legacy files)"
+    )
+    database_file: str = Field(default="cacherr.db", description="SQLite database file in config directory")
+    max_dirty_seconds: float = Field(
+        default=5.0, gt=0, le=300,
+        description="Max seconds batched tracker changes may stay unsaved"
+    )
+    journal_compact_bytes: int = Field(
+        default=4 * 1024 * 1024, ge=64 * 1024,
+        description="Journal size that triggers snapshot compaction (journal backend)"
+    )
 
 
 class NotificationSettings(BaseModel):
@@ -231,6 +294,7 @@ class CacherrSettings(BaseModel):
     realtime: RealtimeSettings = Field(default_factory=RealtimeSettings)
     reconciliation: ReconciliationSettings = Field(default_factory=ReconciliationSettings)
     performance: PerformanceSettings = Field(default_factory=PerformanceSettings)
+    storage: StorageSettings = Field(default_factory=StorageSettings)
     notifications: NotificationSettings = Field(default_factory=NotificationSettings)
     paths: PathSettings = Field(default_factory=PathSettings)
     
@@ -266,6 +330,8 @@ class CacherrSettings(BaseModel):
                 eviction_threshold_percent=int(os.getenv("CACHE_EVICTION_THRESHOLD", "90")),
                 eviction_target_percent=int(os.getenv("CACHE_EVICTION_TARGET", "80")),
                 eviction_min_priority=int(os.getenv("CACHE_EVICTION_MIN_PRIORITY", "60")),
+                admission_eviction=os.getenv("CACHE_ADMISSION_EVICTION", "true").lower() == "true",
+                admission_wait_seconds=int(os.getenv("CACHE_ADMISSION_WAIT", "300")),
             ),
             retention=RetentionSettings(
                 min_retention_hours=float(os.getenv("MIN_RETENTION_HOURS", "12")),
@@ -286,6 +352,22 @@ class CacherrSettings(BaseModel):
             performance=PerformanceSettings(
                 max_concurrent_to_cache=int(os.getenv("MAX_CONCURRENT_MOVES_CACHE", "3")),
                 max_concurrent_to_array=int(os.getenv("MAX_CONCURRENT_MOVES_ARRAY", "1")),
+                adaptive_concurrency=os.getenv("ADAPTIVE_CONCURRENCY", "true").lower() == "true",
+                min_concurrent_to_cache=int(os.getenv("MIN_CONCURRENT_MOVES_CACHE", "1")),
+                min_concurrent_to_array=int(os.getenv("MIN_CONCURRENT_MOVES_ARRAY", "1")),
+                reflink=os.getenv("REFLINK", "true").lower() == "true",
+                hardlink_fallback=os.getenv("HARDLINK_FALLBACK", "false").lower() == "true",
+                streams_per_disk=int(os.getenv("STREAMS_PER_DISK", "1")),
+                drop_page_cache=os.getenv("DROP_PAGE_CACHE", "true").lower() == "true",
+                direct_io_min_mb=int(os.getenv("DIRECT_IO_MIN_MB", "0")),
+                max_mb_s_to_cache=float(os.getenv("MAX_MB_S_TO_CACHE", "0")),
+                max_mb_s_to_array=float(os.getenv("MAX_MB_S_TO_ARRAY", "0")),
+                max_mb_s_per_disk_to_cache=float(os.getenv("MAX_MB_S_PER_DISK_TO_CACHE", "0")),
+                max_mb_s_per_disk_to_array=float(os.getenv("MAX_MB_S_PER_DISK_TO_ARRAY", "0")),
+                session_backoff_mb_s=float(os.getenv("SESSION_BACKOFF_MB_S", "20")),
+            ),
+            storage=StorageSettings(
+                tracker_backend=os.getenv("TRACKER_BACKEND", "sqlite"),
             ),
             notifications=NotificationSettings(
                 webhook_url=os.getenv("WEBHOOK_URL", ""),
@@ -0,0 +1,138 @@
+"""
+Backup file index for Cacherr.
+
+Caching a file renames the original to a hidden backup next to it
+(.name.plexcached, or .name.N.plexcached if that is taken). Finding the
+backup for a restore used to mean probing up to ten candidate names with
+a stat each. BackupIndex lists each directory once with os.scandir and
+answers every later lookup in that directory from memory. Backups that
+Cacherr creates or removes itself are applied to the index as they
+happen; the cache manager drops the index at the start of each cycle to
+pick up anything changed behind its back.
+"""
+
+import os
+import logging
+import threading
+from typing import Dict, List, Set, Tuple, Any, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class _DirectoryBackups:
+    """Backups found in one directory."""
+
+    def __init__(self):
+        self.names: Set[str] = set()
+        # Original file name -> numbers of its numbered backups
+        self.numbered: Dict[str, Set[int]] = {}
+
+
+class BackupIndex:
+    """Per-directory index of backup files, built from one scandir per directory."""
+
+    def __init__(self, extension: str):
+        """
+        Initialize backup index.
+
+        Args:
+            extension: Backup file extension (e.g. ".plexcached")
+        """
+        self.extension = extension
+
+        self._lock = threading.Lock()
+        self._directories: Dict[str, _DirectoryBackups] = {}
+        # Changes made while a directory is being scanned: (added, name)
+        self._pending: Dict[str, List[Tuple[bool, str]]] = {}
+        self._counters = {'scans': 0, 'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def find(self, original_path: str) -> Optional[str]:
+        """Backup of an original file: the unnumbered one first, then the lowest numbered."""
+        directory, name = os.path.split(original_path)
+        backups = self._directory(directory)
+
+        with self._lock:
+            backup_name = f".{name}{self.extension}"
+            if backup_name not in backups.names:
+                numbers = backups.numbered.get(name)
+                backup_name = f".{name}.{min(numbers)}{self.extension}" if numbers else None
+            self._counters['hits' if backup_name else 'misses'] += 1
+
+        return os.path.join(directory, backup_name) if backup_name else None
+
+    def add(self, backup_path: str) -> None:
+        """Record a backup just created."""
+        self._update(backup_path, True)
+
+    def discard(self, backup_path: str) -> None:
+        """Record a backup just renamed or removed."""
+        self._update(backup_path, False)
+
+    def invalidate(self) -> None:
+        """Forget all directories; they are listed again on next use."""
+        with self._lock:
+            self._directories.clear()
+            self._counters['invalidations'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index statistics for status reporting."""
+        with self._lock:
+            return {
+                'directories': len(self._directories),
+                'backups': sum(len(d.names) for d in self._directories.values()),
+                **self._counters,
+            }
+
+    def _directory(self, directory: str) -> _DirectoryBackups:
+        with self._lock:
+            backups = self._directories.get(directory)
+            if backups is not None:
+                return backups
+            self._pending.setdefault(directory, [])
+
+        backups = _DirectoryBackups()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    self._apply(backups, entry.name, True)
+        except OSError as e:
+            logger.debug(f"Could not list {directory} for backups: {e}")
+
+        with self._lock:
+            for added, name in self._pending.pop(directory, []):
+                self._apply(backups, name, added)
+            self._directories[directory] = backups
+            self._counters['scans'] += 1
+        return backups
+
+    def _update(self, backup_path: str, added: bool) -> None:
+        directory, name = os.path.split(backup_path)
+        with self._lock:
+            backups = self._directories.get(directory)
+            if backups is not None:
+                self._apply(backups, name, added)
+            elif directory in self._pending:
+                self._pending[directory].append((added, name))
+
+    def _apply(self, backups: _DirectoryBackups, name: str, added: bool) -> None:
+        """Add or remove one directory entry (ignores anything that isn't a backup)."""
+        if not (name.startswith('.') and name.endswith(self.extension)):
+            return
+        stem = name[1:-len(self.extension)]
+        if added:
+            backups.names.add(name)
+        else:
+            backups.names.discard(name)
+
+        # ".name.N.plexcached" may also be the unnumbered backup of "name.N";
+        # find() checks the unnumbered name first, like the original probing did
+        original, _, number = stem.rpartition('.')
+        if original and number.isdigit():
+            numbers = backups.numbered.setdefault(original, set())
+            if added:
+                numbers.add(int(number))
+            else:
+                numbers.discard(int(number))
+                if not numbers:
+                    del backups.numbered[original]
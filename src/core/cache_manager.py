@@ -16,6 +16,7 @@ import time
 import shutil
 import logging
 import threading
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Set, Optional, Any, Tuple
@@ -23,19 +24,27 @@ from dataclasses import dataclass, field
 from enum import Enum
 
 from .trackers import (
+    BaseTracker,
     CacheTimestampTracker,
     WatchlistTracker,
     OnDeckTracker,
-    CachePriorityScorer,
     EpisodeInfo,
+    CachePriorityScorer,
 )
 from .file_operations import (
     AtomicFileOperations,
     SubtitleFinder,
     OperationResult,
+    OperationType,
     format_bytes,
 )
+from .transfers import TransferJob, TransferPriority
 from .plex_client import PlexClient, OnDeckItem, WatchlistItem, ActiveSession
+from .retention import RetentionScheduler
+from .path_table import path_table
+from ..db.store import TrackerStore, JsonTrackerStore
+from ..db.sqlite import TrackerDatabase, SqliteTrackerStore
+from ..db.journal import JournalTrackerStore
 
 
 logger = logging.getLogger(__name__)
@@ -57,6 +66,7 @@ class CacheStats:
     limit_bytes: int = 0
     used_percent: float = 0.0
     file_count: int = 0
+    partial_bytes: int = 0  # Unfinished copies (.part files), included in total_size_bytes
     health: CacheHealth = CacheHealth.UNLIMITED
     
     # Breakdown by source
@@ -75,6 +85,7 @@ class CacheStats:
             'limit_human': format_bytes(self.limit_bytes) if self.limit_bytes > 0 else 'Unlimited',
             'used_percent': round(self.used_percent, 1),
             'file_count': self.file_count,
+            'partial_bytes': self.partial_bytes,
             'health': self.health.value,
             'breakdown': {
                 'ondeck': {'count': self.ondeck_count, 'bytes': self.ondeck_bytes},
@@ -111,6 +122,7 @@ class ReconciliationResult:
     orphaned_found: int = 0
     untracked_found: int = 0
     stale_removed: int = 0
+    partials_removed: int = 0
     errors: List[str] = field(default_factory=list)
     
     def to_dict(self) -> Dict[str, Any]:
@@ -119,6 +131,7 @@ class ReconciliationResult:
             'orphaned_found': self.orphaned_found,
             'untracked_found': self.untracked_found,
             'stale_removed': self.stale_removed,
+            'partials_removed': self.partials_removed,
             'errors': self.errors,
         }
 
@@ -154,19 +167,45 @@ class CacheManager:
         self.config = config
         self.config_dir = Path(config_dir)
         
-        # Initialize trackers
+        # Seconds spent per startup phase, reported in get_status()
+        self.startup_timings: Dict[str, float] = {}
+        init_start = time.monotonic()
+        
+        # Initialize trackers (loaded in the background; calls wait until ready)
+        self._db: Optional[TrackerDatabase] = None
+        if config.storage.tracker_backend == 'sqlite':
+            self._db = TrackerDatabase(str(self.config_dir / config.storage.database_file))
+        
         self.timestamp_tracker = CacheTimestampTracker(
-            str(self.config_dir / "cache_timestamps.json")
+            str(self.config_dir / "cache_timestamps.json"),
+            store=self._create_store("cache_timestamp", "cache_timestamps.json"),
+            lazy=True,
         )
         self.watchlist_tracker = WatchlistTracker(
-            str(self.config_dir / "watchlist_tracker.json")
+            str(self.config_dir / "watchlist_tracker.json"),
+            store=self._create_store("watchlist", "watchlist_tracker.json"),
+            lazy=True,
         )
         self.ondeck_tracker = OnDeckTracker(
-            str(self.config_dir / "ondeck_tracker.json")
+            str(self.config_dir / "ondeck_tracker.json"),
+            store=self._create_store("ondeck", "ondeck_tracker.json"),
+            lazy=True,
+        )
+        for tracker in self._trackers():
+            tracker.max_dirty_seconds = config.storage.max_dirty_seconds
+        
+        # Restore deadlines, so retention checks skip files that can't expire yet
+        self.retention_scheduler = RetentionScheduler(
+            self.timestamp_tracker, self.ondeck_tracker, self.watchlist_tracker, config
         )
         
+        # Record finished transfers, whoever requested them
+        self.file_ops.record_cached = self._record_cached
+        self.file_ops.transfers.add_listener(self._on_transfer_complete)
+        
         # State
         self._running = False
+        self._started = threading.Event()  # Set once start() has finished
         self._lock = threading.RLock()
         self._active_sessions: Dict[str, ActiveSession] = {}
         self._session_monitor_thread: Optional[threading.Thread] = None
@@ -174,8 +213,52 @@ class CacheManager:
         # Parse cache limit
         self._limit_bytes = self._parse_limit(config.cache_limits.cache_limit)
         
+        # Admit copies only while they fit the cache limit and the drive
+        self.file_ops.space.configure(
+            limit_bytes=self._limit_bytes,
+            usage=self._cache_usage,
+            make_room=self._make_room if config.cache_limits.admission_eviction else None,
+            wait_seconds=config.cache_limits.admission_wait_seconds,
+        )
+        
+        self.startup_timings['init'] = time.monotonic() - init_start
         logger.info("Cache manager initialized")
     
+    @property
+    def ready(self) -> bool:
+        """Whether all trackers have finished loading."""
+        return all(tracker.ready for tracker in self._trackers())
+    
+    @property
+    def started(self) -> bool:
+        """Whether start() has finished (stores attached, startup reconciliation done)."""
+        return self._started.is_set()
+    
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until all trackers have loaded. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for tracker in self._trackers():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not tracker.wait_ready(remaining):
+                return False
+        return True
+    
+    def _trackers(self) -> List[BaseTracker]:
+        """All trackers owned by this manager."""
+        return [self.timestamp_tracker, self.watchlist_tracker, self.ondeck_tracker]
+    
+    def _create_store(self, name: str, filename: str) -> Optional[TrackerStore]:
+        """Create the configured store for a tracker (None = legacy JSON file)."""
+        if self._db is not None:
+            return SqliteTrackerStore(self._db, name, legacy_file=str(self.config_dir / filename))
+        if self.config.storage.tracker_backend == 'journal':
+            return JournalTrackerStore(
+                str(self.config_dir / filename),
+                name,
+                compact_bytes=self.config.storage.journal_compact_bytes,
+            )
+        return None
+    
     def _parse_limit(self, limit_str: str) -> int:
         """Parse cache limit string to bytes."""
         if not limit_str or limit_str.strip() in ('', '0'):
@@ -215,19 +298,44 @@ class CacheManager:
     
     def start(self) -> bool:
         """Start cache manager background services."""
-        if self._running:
+        if self._running or self.started:
             return True
         
         try:
             # Connect to Plex
+            phase = time.monotonic()
             if not self.plex.connect():
                 logger.error("Failed to connect to Plex")
                 return False
+            self.startup_timings['plex_connect'] = time.monotonic() - phase
+            
+            # Everything below needs tracker data
+            phase = time.monotonic()
+            self.wait_ready()
+            self.startup_timings['trackers_wait'] = time.monotonic() - phase
+            
+            # Persist the symlink registry, so restores find backups without searching
+            phase = time.monotonic()
+            self.file_ops.attach_registry_store(
+                self._create_store("symlink_registry", "symlink_registry.json")
+                or JsonTrackerStore(str(self.config_dir / "symlink_registry.json"), "symlink_registry")
+            )
+            self.startup_timings['symlink_registry'] = time.monotonic() - phase
+            
+            # Persist the transfer queue and resume transfers from before a restart
+            phase = time.monotonic()
+            self.file_ops.transfers.attach_store(
+                self._create_store("transfer_queue", "transfer_queue.json")
+                or JsonTrackerStore(str(self.config_dir / "transfer_queue.json"), "transfer_queue")
+            )
+            self.startup_timings['transfer_queue'] = time.monotonic() - phase
             
             # Run initial reconciliation
             if self.config.reconciliation.auto_on_startup:
                 logger.info("Running startup reconciliation...")
+                phase = time.monotonic()
                 self.reconcile()
+                self.startup_timings['reconcile'] = time.monotonic() - phase
             
             # Start session monitor
             if self.config.realtime.enabled:
@@ -240,6 +348,7 @@ class CacheManager:
                 self._session_monitor_thread.start()
                 logger.info("Real-time session monitor started")
             
+            self._started.set()
             return True
             
         except Exception as e:
@@ -253,6 +362,14 @@ class CacheManager:
         if self._session_monitor_thread and self._session_monitor_thread.is_alive():
             self._session_monitor_thread.join(timeout=10)
         
+        self.file_ops.stop()
+        
+        for tracker in self._trackers():
+            tracker.close()
+        
+        if self._db is not None:
+            self._db.close()
+        
         logger.info("Cache manager stopped")
     
     def run_cache_cycle(self) -> Dict[str, Any]:
@@ -281,6 +398,12 @@ class CacheManager:
             'errors': [],
         }
         
+        # Transfers and trackers aren't set up until start() finishes
+        if not self.started:
+            logger.info("Cache manager still starting, skipping cache cycle")
+            summary['skipped'] = 'starting'
+            return summary
+        
         try:
             # Check for active sessions
             if self.config.exit_if_active_session and self.plex.has_active_sessions():
@@ -291,6 +414,9 @@ class CacheManager:
             # Get active file paths (never touch these)
             active_files = self.plex.get_active_file_paths()
             
+            # List backup directories afresh this cycle
+            self.file_ops.backups.invalidate()
+            
             # Clear OnDeck tracker for fresh run
             self.ondeck_tracker.clear_for_run()
             
@@ -313,10 +439,11 @@ class CacheManager:
             
             # TODO: Get Trakt trending items
             
-            # Collect all files to cache
-            files_to_cache = self._collect_files_to_cache(
-                ondeck_items, watchlist_items, active_files
-            )
+            # Collect all files to cache (list tracker updates saved once)
+            with self.ondeck_tracker.batch(), self.watchlist_tracker.batch():
+                files_to_cache = self._collect_files_to_cache(
+                    ondeck_items, watchlist_items, active_files
+                )
             
             # Cache files
             if files_to_cache:
@@ -344,11 +471,11 @@ class CacheManager:
     def _collect_files_to_cache(self,
                                  ondeck_items: List[OnDeckItem],
                                  watchlist_items: List[WatchlistItem],
-                                 active_files: Set[str]) -> List[Tuple[str, str]]:
+                                 active_files: Set[str]) -> List[Tuple[str, str, int]]:
         """
         Collect files that need to be cached.
         
-        Returns list of (file_path, source) tuples.
+        Returns list of (file_path, source, transfer priority) tuples.
         """
         files_to_cache = []
         seen_paths = set()
@@ -362,7 +489,11 @@ class CacheManager:
             if self._is_already_cached(item.file_path):
                 continue
             
-            files_to_cache.append((item.file_path, 'ondeck'))
+            files_to_cache.append((
+                item.file_path,
+                'ondeck',
+                TransferPriority.for_source('ondeck', item.is_current_ondeck),
+            ))
             seen_paths.add(item.file_path)
             
             # Update tracker
@@ -390,7 +521,7 @@ class CacheManager:
             if self._is_already_cached(item.file_path):
                 continue
             
-            files_to_cache.append((item.file_path, 'watchlist'))
+            files_to_cache.append((item.file_path, 'watchlist', TransferPriority.WATCHLIST))
             seen_paths.add(item.file_path)
             
             # Update tracker
@@ -402,61 +533,91 @@ class CacheManager:
         
         # Add subtitles
         all_files = []
-        for path, source in files_to_cache:
-            all_files.append((path, source))
+        for path, source, priority in files_to_cache:
+            all_files.append((path, source, priority))
             for subtitle in SubtitleFinder.find_subtitles(path):
                 if subtitle not in seen_paths:
-                    all_files.append((subtitle, source))
+                    all_files.append((subtitle, source, priority))
                     seen_paths.add(subtitle)
         
         return all_files
     
-    def _cache_files(self, files: List[Tuple[str, str]]) -> List[OperationResult]:
-        """Cache a list of files."""
-        results = []
+    def _cache_files(self, files: List[Tuple[str, str, int]]) -> List[OperationResult]:
+        """Cache a list of files (recorded by _on_transfer_complete as each lands)."""
+        total = len(files)
+        done = 0
         
-        for file_path, source in files:
-            result = self.file_ops.copy_to_cache_atomic(file_path)
-            results.append(result)
-            
+        def progress(result: OperationResult) -> None:
+            nonlocal done
+            done += 1
+            name = Path(result.source_path).name
             if result.success:
-                # Record timestamp
-                file_size = 0
-                try:
-                    file_size = Path(result.dest_path).stat().st_size
-                except:
-                    pass
-                
-                self.timestamp_tracker.record(
-                    file_path,
-                    source=source,
-                    file_size=file_size
-                )
+                logger.info(f"Cached [{done}/{total}]: {name}")
+            else:
+                logger.warning(f"Cache failed [{done}/{total}]: {name}: {result.error}")
         
-        return results
+        with self.timestamp_tracker.batch():
+            return self.file_ops.batch_cache(
+                [file_path for file_path, _, _ in files],
+                callback=progress,
+                sources={file_path: source for file_path, source, _ in files},
+                priorities={file_path: priority for file_path, _, priority in files},
+            )
+    
+    def _record_cached(self, job: TransferJob, result: OperationResult) -> None:
+        """Record a file cached by a queued transfer, while its space is still reserved."""
+        file_size = 0
+        try:
+            file_size = Path(result.dest_path).stat().st_size
+        except OSError:
+            pass
+        
+        self.timestamp_tracker.record(
+            job.path,
+            source=job.source,
+            file_size=file_size
+        )
+    
+    def _on_transfer_complete(self, job: TransferJob, result: Optional[OperationResult]) -> None:
+        """Update the timestamp tracker after a queued restore finishes."""
+        if result is None or not result.success:
+            return
+        
+        if job.operation == OperationType.RESTORE:
+            self.timestamp_tracker.remove_entry(job.path)
+            self.file_ops.space.notify_freed()
     
     def _check_retention_and_restore(self, active_files: Set[str]) -> List[OperationResult]:
         """Check retention policies and restore expired files."""
-        results = []
-        
-        # Get all tracked files
-        entries = self.timestamp_tracker.get_all_entries()
+        restores: Dict[str, Future] = {}
         
-        for file_path, entry in entries.items():
-            # Skip active files
-            if file_path in active_files:
-                continue
-            
-            # Check if file should be restored
-            should_restore, reason = self._should_restore(file_path, entry)
+        with self.timestamp_tracker.batch():
+            # Only files whose restore deadline passed or whose lists changed
+            for file_path in self.retention_scheduler.pop_due():
+                entry = self.timestamp_tracker.get_entry(file_path)
+                if entry is None:
+                    continue
+                
+                # Skip active files
+                if file_path in active_files:
+                    self.retention_scheduler.defer(file_path)
+                    continue
+                
+                # Check if file should be restored
+                should_restore, reason = self._should_restore(file_path, entry)
+                
+                if should_restore:
+                    logger.info(f"Restoring: {Path(file_path).name} ({reason})")
+                    restores[file_path] = self.file_ops.submit_restore(file_path, source='retention')
+                    continue
+                
+                self.retention_scheduler.reschedule(file_path)
             
-            if should_restore:
-                logger.info(f"Restoring: {Path(file_path).name} ({reason})")
-                result = self.file_ops.restore_to_array(file_path)
+            results = []
+            for file_path, result in self.file_ops.iter_results(restores, OperationType.RESTORE):
                 results.append(result)
-                
-                if result.success:
-                    self.timestamp_tracker.remove_entry(file_path)
+                if not result.success:
+                    self.retention_scheduler.reschedule(file_path)
         
         return results
     
@@ -525,36 +686,126 @@ class CacheManager:
         logger.info(f"Cache eviction needed: {format_bytes(bytes_to_free)} to free")
         
         # Get eviction candidates
-        entries = self.timestamp_tracker.get_all_entries()
-        candidates = CachePriorityScorer.get_eviction_candidates(
-            entries,
-            target_bytes=int(bytes_to_free),
-            min_priority=self.config.cache_limits.eviction_min_priority,
-            actively_playing_files=active_files,
-            protected_hours=self.config.cache_limits.eviction_protected_hours,
-        )
+        candidates = self.get_eviction_candidates(bytes_to_free, active_files)
         
         if not candidates:
             logger.warning("No eviction candidates found")
             return result
         
         # Evict files
-        for path, priority, size in candidates:
-            logger.info(f"Evicting (priority {priority}): {Path(path).name}")
-            op_result = self.file_ops.restore_to_array(path)
-            
-            if op_result.success:
-                result.files_evicted += 1
-                result.bytes_freed += size
-                self.timestamp_tracker.remove_entry(path)
-            else:
-                result.errors.append(f"Failed to evict {path}: {op_result.error}")
+        with self.timestamp_tracker.batch():
+            futures = {}
+            sizes = {}
+            for path, priority, size in candidates:
+                logger.info(f"Evicting (priority {priority}): {Path(path).name}")
+                futures[path] = self.file_ops.submit_restore(path, source='eviction')
+                sizes[path] = size
+            
+            for path, op_result in self.file_ops.iter_results(futures, OperationType.RESTORE):
+                if op_result.success:
+                    result.files_evicted += 1
+                    result.bytes_freed += sizes[path]
+                else:
+                    result.errors.append(f"Failed to evict {path}: {op_result.error}")
         
         result.performed = True
         logger.info(f"Eviction complete: {result.files_evicted} files, {format_bytes(result.bytes_freed)} freed")
         
         return result
     
+    def get_eviction_candidates(self,
+                                target_bytes: float,
+                                active_files: Optional[Set[str]] = None,
+                                min_priority: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """Files to evict to free target_bytes, scored with current OnDeck positions.
+        
+        Only files scoring below min_priority (default: the configured
+        eviction_min_priority) are returned.
+        
+        Returns (path, priority, size) sorted by priority ascending.
+        """
+        if min_priority is None:
+            min_priority = self.config.cache_limits.eviction_min_priority
+        return self.timestamp_tracker.get_eviction_candidates(
+            target_bytes=int(target_bytes),
+            min_priority=min_priority,
+            actively_playing_files=active_files,
+            protected_hours=self.config.cache_limits.eviction_protected_hours,
+            strategy=self._eviction_strategy(),
+            context=self.ondeck_tracker.get_scoring_context(),
+            number_episodes_setting=self.config.plex.number_episodes,
+        )
+    
+    def _make_room(self, nbytes: int, priority: Optional[int] = None) -> int:
+        """Evict just enough files worth less than an incoming copy to admit it.
+        
+        Called on the SpaceLedger's eviction thread with the copy's
+        TransferPriority; returns bytes freed by the restores this call
+        started (files another eviction is already restoring don't count).
+        """
+        if not self.config.cache_limits.eviction_enabled:
+            return 0
+        
+        # Files already being restored are freeing space for someone else
+        skip = self.get_active_file_paths() | self.file_ops.transfers.active_paths(OperationType.RESTORE)
+        candidates = self.get_eviction_candidates(nbytes, skip, self._eviction_floor(priority))
+        if not candidates:
+            logger.info(f"No eviction candidates to free {format_bytes(nbytes)} for a new copy")
+            return 0
+        
+        logger.info(f"Evicting {len(candidates)} files to make room for {format_bytes(nbytes)}")
+        futures = {}
+        sizes = {}
+        for path, score, size in candidates:
+            logger.info(f"Evicting (priority {score}): {Path(path).name}")
+            futures[path] = self.file_ops.submit_restore(path, source='eviction')
+            sizes[path] = size
+        
+        freed = 0
+        for path, result in self.file_ops.iter_results(futures, OperationType.RESTORE):
+            if result.success:
+                freed += sizes[path]
+            else:
+                logger.warning(f"Failed to evict {path}: {result.error}")
+        return freed
+    
+    def _eviction_floor(self, priority: Optional[int]) -> int:
+        """Score from which files are kept when making room for a copy of this priority.
+        
+        The incoming file's score without the recency bonus, so being new
+        alone never outranks a file that is already cached.
+        """
+        min_priority = self.config.cache_limits.eviction_min_priority
+        if priority is None:
+            return min_priority
+        
+        sources = {
+            TransferPriority.ACTIVE_WATCHING: 'active_watching',
+            TransferPriority.ONDECK_CURRENT: 'ondeck',
+            TransferPriority.ONDECK_NEXT: 'ondeck',
+            TransferPriority.WATCHLIST: 'watchlist',
+            TransferPriority.TRAKT: 'trakt',
+        }
+        incoming = {
+            'source': sources.get(priority, 'manual'),
+            'episode_info': {
+                'is_current_ondeck': priority == TransferPriority.ONDECK_CURRENT,
+                'episodes_ahead': 1 if priority == TransferPriority.ONDECK_NEXT else 0,
+            },
+        }
+        score = CachePriorityScorer.base_score(incoming, self.config.plex.number_episodes)
+        return min(min_priority, score)
+    
+    def _eviction_strategy(self) -> str:
+        """Victim selection strategy for the configured eviction mode."""
+        if self.config.cache_limits.eviction_mode == 'size_aware':
+            return 'size_aware'
+        return 'priority'
+    
+    def _cache_usage(self) -> int:
+        """Bytes held on the cache by cached files and unfinished copies."""
+        return self.timestamp_tracker.total_size() + self.file_ops.partial_bytes()
+    
     def get_cache_stats(self) -> CacheStats:
         """Get current cache statistics."""
         stats = CacheStats()
@@ -568,23 +819,25 @@ class CacheManager:
         total_size = 0
         file_count = 0
         
-        for entry in self.timestamp_tracker.get_all_entries().values():
-            size = entry.get('file_size_bytes', 0)
-            total_size += size
-            file_count += 1
-            
-            source = entry.get('source', 'unknown')
-            if source == 'ondeck':
-                stats.ondeck_count += 1
-                stats.ondeck_bytes += size
-            elif source == 'watchlist':
-                stats.watchlist_count += 1
-                stats.watchlist_bytes += size
-            elif source == 'trakt':
-                stats.trakt_count += 1
-                stats.trakt_bytes += size
-        
-        stats.total_size_bytes = total_size
+        with self.timestamp_tracker.locked():
+            for entry in self.timestamp_tracker.get_all_entries().values():
+                size = entry.get('file_size_bytes', 0)
+                total_size += size
+                file_count += 1
+                
+                source = entry.get('source', 'unknown')
+                if source == 'ondeck':
+                    stats.ondeck_count += 1
+                    stats.ondeck_bytes += size
+                elif source == 'watchlist':
+                    stats.watchlist_count += 1
+                    stats.watchlist_bytes += size
+                elif source == 'trakt':
+                    stats.trakt_count += 1
+                    stats.trakt_bytes += size
+        
+        stats.partial_bytes = self.file_ops.partial_bytes()
+        stats.total_size_bytes = total_size + stats.partial_bytes
         stats.file_count = file_count
         
         # Calculate health
@@ -615,14 +868,19 @@ class CacheManager:
         
         try:
             # Check for orphaned entries
-            entries = self.timestamp_tracker.get_all_entries()
-            result.files_checked = len(entries)
+            with self.timestamp_tracker.locked():
+                paths = list(self.timestamp_tracker.get_all_entries())
+            result.files_checked = len(paths)
+            
+            with self.timestamp_tracker.batch():
+                for path in paths:
+                    if not os.path.exists(path) and not os.path.islink(path):
+                        result.orphaned_found += 1
+                        logger.warning(f"Orphaned entry: {path}")
+                        self.timestamp_tracker.remove_entry(path)
             
-            for path in list(entries.keys()):
-                if not os.path.exists(path) and not os.path.islink(path):
-                    result.orphaned_found += 1
-                    logger.warning(f"Orphaned entry: {path}")
-                    self.timestamp_tracker.remove_entry(path)
+            # Remove .part files of copies nothing will resume
+            result.partials_removed = self.file_ops.cleanup_partial_copies(paths)
             
             # Cleanup stale entries
             result.stale_removed = self.timestamp_tracker.cleanup_missing_files()
@@ -631,7 +889,8 @@ class CacheManager:
             
             logger.info(
                 f"Reconciliation complete: {result.files_checked} checked, "
-                f"{result.orphaned_found} orphaned, {result.stale_removed} stale removed"
+                f"{result.orphaned_found} orphaned, {result.stale_removed} stale removed, "
+                f"{result.partials_removed} partial copies removed"
             )
             
         except Exception as e:
@@ -680,6 +939,9 @@ class CacheManager:
         sessions = self.plex.get_active_sessions()
         current_keys = {s.session_key for s in sessions}
         
+        # Slow transfers on disks people are streaming from
+        self.file_ops.set_active_streams({s.file_path for s in sessions})
+        
         with self._lock:
             # Handle new sessions
             for session in sessions:
@@ -698,12 +960,14 @@ class CacheManager:
         self._active_sessions[session.session_key] = session
         logger.info(f"New session: {session.username} watching '{session.media_title}'")
         
+        # Count playback of already cached files towards their priority
+        self.timestamp_tracker.record_access(session.file_path)
+        
         # Trigger cache if configured
         if self.config.realtime.cache_on_play_start:
             if not self._is_already_cached(session.file_path):
                 logger.info(f"Caching during playback: {session.media_title}")
-                self.file_ops.copy_to_cache_atomic(session.file_path)
-                self.timestamp_tracker.record(session.file_path, source='active_watching')
+                self.file_ops.submit_cache(session.file_path, source='active_watching')
     
     def _update_session(self, session: ActiveSession) -> None:
         """Update an existing session."""
@@ -730,13 +994,38 @@ class CacheManager:
     
     def get_status(self) -> Dict[str, Any]:
         """Get current cache manager status."""
+        trackers = {
+            'cache_timestamp': self.timestamp_tracker.get_stats(),
+            'watchlist': self.watchlist_tracker.get_stats(),
+            'ondeck': self.ondeck_tracker.get_stats(),
+        }
+        startup = {k: round(v, 3) for k, v in self.startup_timings.items()}
+        
+        if not self.ready:
+            # Don't block the API while trackers are still loading
+            return {
+                'running': self._running,
+                'ready': False,
+                'started': self.started,
+                'active_sessions': len(self._active_sessions),
+                'trackers': trackers,
+                'startup': startup,
+            }
+        
         stats = self.get_cache_stats()
         
         return {
             'running': self._running,
+            'ready': True,
+            'started': self.started,
             'stats': stats.to_dict(),
             'active_sessions': len(self._active_sessions),
             'tracked_files': self.timestamp_tracker.count(),
             'ondeck_entries': self.ondeck_tracker.count(),
             'watchlist_entries': self.watchlist_tracker.count(),
+            'trackers': trackers,
+            'startup': startup,
+            'retention_schedule': self.retention_scheduler.get_stats(),
+            'path_table': path_table.get_stats(),
+            'file_operations': self.file_ops.get_stats(),
         }
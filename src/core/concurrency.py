@@ -0,0 +1,144 @@
+"""
+Adaptive transfer concurrency for Cacherr.
+
+A fixed worker count is either too low for a many-disk mix or high
+enough to thrash a single disk. AIMDController measures aggregate
+throughput and per-transfer latency over windows of completed transfers
+and adjusts the number of transfers allowed to run at once: +1 while
+throughput keeps improving, halved when throughput drops or latency
+balloons, and held at the knee where more workers stop helping.
+"""
+
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class AIMDController:
+    """Additive-increase / multiplicative-decrease limit on concurrent transfers."""
+
+    GAIN_THRESHOLD = 0.05  # Throughput gain that justifies another worker
+    LOSS_THRESHOLD = 0.15  # Throughput loss that triggers a decrease
+    LATENCY_FACTOR = 2.0  # Seconds-per-MB growth over the best seen that triggers a decrease
+
+    def __init__(self, name: str, min_limit: int = 1, max_limit: int = 3,
+                 enabled: bool = True):
+        """
+        Initialize controller.
+
+        Args:
+            name: Label for logging and stats
+            min_limit: Fewest concurrent transfers
+            max_limit: Most concurrent transfers
+            enabled: If False, always allow max_limit transfers; if True,
+                start at max_limit and back off from there
+        """
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.enabled = enabled
+        self.limit = self.max_limit
+
+        self._cond = threading.Condition()
+        self._running = 0
+
+        # Current measurement window
+        self._window_start: Optional[float] = None
+        self._window_bytes = 0
+        self._window_seconds = 0.0  # Sum of per-transfer durations
+        self._window_ops = 0
+
+        self._last_throughput: Optional[float] = None
+        self._best_latency: Optional[float] = None  # Seconds per MB
+        self._last_change = "start"
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Run one transfer within the current concurrency limit."""
+        with self._cond:
+            while self._running >= self.limit:
+                self._cond.wait()
+            self._running += 1
+            if self._window_start is None:
+                self._window_start = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._running -= 1
+                self._cond.notify()
+
+    def record(self, nbytes: int, seconds: float) -> None:
+        """Report a finished transfer; adjusts the limit at the end of each window.
+
+        Transfers that moved no data (renames, failures) are ignored.
+        """
+        if not self.enabled or nbytes <= 0 or seconds <= 0:
+            return
+
+        with self._cond:
+            self._window_bytes += nbytes
+            self._window_seconds += seconds
+            self._window_ops += 1
+            if self._window_ops < max(2, self.limit):
+                return
+
+            elapsed = time.monotonic() - (self._window_start or time.monotonic())
+            if elapsed > 0:
+                self._adjust(self._window_bytes / elapsed,
+                             self._window_seconds / (self._window_bytes / 1_000_000))
+
+            self._window_start = time.monotonic() if self._running else None
+            self._window_bytes = 0
+            self._window_seconds = 0.0
+            self._window_ops = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Controller state for status reporting."""
+        with self._cond:
+            return {
+                'adaptive': self.enabled,
+                'limit': self.limit,
+                'min': self.min_limit,
+                'max': self.max_limit,
+                'running': self._running,
+                'throughput_mb_s': round(self._last_throughput / 1_000_000, 1) if self._last_throughput else None,
+                'last_change': self._last_change,
+            }
+
+    def _adjust(self, throughput: float, latency: float) -> None:
+        """Pick the next limit from a window's throughput (B/s) and latency (s/MB)."""
+        previous = self._last_throughput
+        old_limit = self.limit
+
+        if self._best_latency is None or latency < self._best_latency:
+            self._best_latency = latency
+
+        if latency > self._best_latency * self.LATENCY_FACTOR and self.limit > self.min_limit:
+            self.limit = max(self.min_limit, self.limit // 2)
+            self._last_change = "decrease (latency)"
+        elif previous is not None and throughput < previous * (1 - self.LOSS_THRESHOLD):
+            self.limit = max(self.min_limit, self.limit // 2)
+            self._last_change = "decrease (throughput)"
+        elif previous is None or throughput > previous * (1 + self.GAIN_THRESHOLD):
+            self.limit = min(self.max_limit, self.limit + 1)
+            self._last_change = "increase"
+        elif self._last_change == "increase" and self.limit > self.min_limit:
+            # The last worker added nothing: step back to the knee
+            self.limit -= 1
+            self._last_change = "knee"
+        else:
+            self._last_change = "hold"
+
+        self._last_throughput = throughput
+        if self.limit != old_limit:
+            logger.debug(
+                f"{self.name} concurrency {old_limit} -> {self.limit} "
+                f"({throughput / 1_000_000:.0f} MB/s, {latency:.2f} s/MB)"
+            )
+            self._cond.notify_all()
@@ -0,0 +1,245 @@
+"""
+Per-disk I/O scheduling for Cacherr.
+
+On Unraid every file under the user share (/mnt/user) really lives on one
+array disk (/mnt/diskN). Running several copies against the same spindle
+makes its heads seek between streams, while other disks sit idle.
+DiskScheduler resolves files to their backing disk and limits each disk
+to a fixed number of concurrent streams, so parallelism goes across disks
+instead of onto one.
+
+Without disk mounts (e.g. a container that only sees /mnt/user), files
+are still grouped by device for ordering and stats, but not limited: one
+device there can span every disk of the array. The disk mounts are listed
+again every MOUNT_REFRESH_SECONDS, and sooner when a path can't be
+resolved to one of them, so disks added later are picked up.
+
+The transfer queue takes slots with try_acquire() when it picks a job, so
+a job for a busy disk waits in the queue rather than holding a worker.
+"""
+
+import os
+import glob
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Iterator, Any, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class DiskScheduler:
+    """Resolves paths to disks and hands out per-disk stream slots."""
+
+    # Unraid layout: user shares are unions of the same share on each disk
+    USER_SHARE_ROOT = "/mnt/user"
+    DISK_GLOB = "/mnt/disk[0-9]*"
+
+    # Resolved paths kept before the cache is reset
+    MAX_CACHED_PATHS = 50000
+
+    # How often the disk mounts are listed again
+    MOUNT_REFRESH_SECONDS = 60.0
+    # Soonest re-listing after a path didn't resolve to any disk mount
+    MOUNT_RETRY_SECONDS = 5.0
+
+    def __init__(self,
+                 streams_per_disk: int = 1,
+                 user_share_root: str = USER_SHARE_ROOT,
+                 disk_glob: str = DISK_GLOB):
+        """
+        Initialize disk scheduler.
+
+        Args:
+            streams_per_disk: Concurrent transfers allowed per disk
+            user_share_root: Union filesystem whose files live on single disks
+            disk_glob: Glob matching the individual disk mounts
+        """
+        self.streams_per_disk = max(1, streams_per_disk)
+        self.user_share_root = user_share_root.rstrip('/')
+        self.disk_glob = disk_glob
+
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._disk_mounts: Optional[List[str]] = None
+        self._mounts_listed = 0.0
+        self._resolved: Dict[str, str] = {}
+        # disk -> {'queued', 'active', 'completed'}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        # Slots taken by the current thread: disk -> nesting depth
+        self._held = threading.local()
+
+    def resolve(self, path: str) -> str:
+        """Name of the disk backing a path (e.g. 'disk3', or 'dev:2049')."""
+        with self._lock:
+            disk = self._resolved.get(path)
+        if disk is not None:
+            return disk
+
+        disk = self._resolve_uncached(path)
+        with self._lock:
+            if len(self._resolved) >= self.MAX_CACHED_PATHS:
+                self._resolved.clear()
+            self._resolved[path] = disk
+        return disk
+
+    def interleave(self, paths: List[str]) -> List[str]:
+        """Reorder paths round-robin by disk, keeping order within each disk.
+
+        Workers taking tasks in this order start on different disks instead
+        of queueing behind the same one.
+        """
+        by_disk: Dict[str, deque] = {}
+        for path in paths:
+            by_disk.setdefault(self.resolve(path), deque()).append(path)
+
+        ordered = []
+        queues = list(by_disk.values())
+        while queues:
+            for queue in queues:
+                ordered.append(queue.popleft())
+            queues = [q for q in queues if q]
+        return ordered
+
+    @contextmanager
+    def slot(self, path: str) -> Iterator[str]:
+        """Hold one of the backing disk's stream slots while transferring.
+
+        Waits for a free slot. A thread that already holds a slot on the
+        disk (e.g. the transfer queue took it for this job) reuses it.
+
+        Usage:
+            with scheduler.slot(source_path):
+                copy(...)
+        """
+        disk = self.resolve(path)
+        held = self._held_slots()
+        if held.get(disk):
+            held[disk] += 1
+            try:
+                yield disk
+            finally:
+                held[disk] -= 1
+            return
+
+        limited = self.is_physical(disk)
+        with self._cond:
+            counters = self._disk_counters(disk)
+            counters['queued'] += 1
+            while limited and counters['active'] >= self.streams_per_disk:
+                self._cond.wait()
+            counters['queued'] -= 1
+            counters['active'] += 1
+        held[disk] = 1
+        try:
+            yield disk
+        finally:
+            self.release(disk)
+
+    def try_acquire(self, disk: str) -> bool:
+        """Take a stream slot on a disk for this thread without waiting.
+
+        Returns False if the disk already runs streams_per_disk transfers.
+        Every successful call must be paired with release(disk).
+        """
+        limited = self.is_physical(disk)
+        with self._lock:
+            counters = self._disk_counters(disk)
+            if limited and counters['active'] >= self.streams_per_disk:
+                return False
+            counters['active'] += 1
+        self._held_slots()[disk] = 1
+        return True
+
+    def release(self, disk: str) -> None:
+        """Give back a slot taken by try_acquire() or slot()."""
+        self._held_slots().pop(disk, None)
+        with self._cond:
+            counters = self._disk_counters(disk)
+            counters['active'] -= 1
+            counters['completed'] += 1
+            self._cond.notify_all()
+
+    def is_physical(self, disk: str) -> bool:
+        """Whether a resolved disk is one of the disk mounts (and gets slots)."""
+        return any(os.path.basename(mount) == disk for mount in self._mounts())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-disk queue statistics for status reporting."""
+        with self._lock:
+            return {
+                'streams_per_disk': self.streams_per_disk,
+                'per_disk_limit': bool(self._disk_mounts),
+                'disks': {disk: dict(counters) for disk, counters in sorted(self._counters.items())},
+            }
+
+    def _disk_counters(self, disk: str) -> Dict[str, int]:
+        """Counters for a disk (caller holds the lock)."""
+        return self._counters.setdefault(disk, {'queued': 0, 'active': 0, 'completed': 0})
+
+    def _held_slots(self) -> Dict[str, int]:
+        held = getattr(self._held, 'slots', None)
+        if held is None:
+            held = self._held.slots = {}
+        return held
+
+    def _mounts(self, max_age: Optional[float] = None) -> List[str]:
+        """Disk mounts, listed again once they are older than max_age seconds."""
+        max_age = self.MOUNT_REFRESH_SECONDS if max_age is None else max_age
+        mounts = self._disk_mounts
+        if mounts is not None and time.monotonic() - self._mounts_listed < max_age:
+            return mounts
+
+        listed = sorted(glob.glob(self.disk_glob))
+        with self._lock:
+            self._mounts_listed = time.monotonic()
+            if listed != self._disk_mounts:
+                if self._disk_mounts is not None:
+                    logger.info(f"Disk mounts changed: {', '.join(listed) or 'none'}")
+                    self._resolved.clear()  # Paths may live on a new disk now
+                self._disk_mounts = listed
+        return listed
+
+    def _match_mount(self, real: str, mounts: List[str]) -> Optional[str]:
+        """Disk holding a resolved path, if it is on one of the mounts."""
+        # User share file: find the disk holding the same relative path
+        prefix = self.user_share_root + '/'
+        if real.startswith(prefix):
+            relative = real[len(prefix):]
+            for mount in mounts:
+                if os.path.lexists(os.path.join(mount, relative)):
+                    return os.path.basename(mount)
+
+        # Already a path on one of the disk mounts
+        for mount in mounts:
+            if real == mount or real.startswith(mount + '/'):
+                return os.path.basename(mount)
+        return None
+
+    def _resolve_uncached(self, path: str) -> str:
+        # Resolve directories but not the file itself: a cached file's
+        # symlink lives on the disk the restored file will be written to
+        real = os.path.join(os.path.realpath(os.path.dirname(path)), os.path.basename(path))
+
+        disk = self._match_mount(real, self._mounts())
+        if disk is None:
+            # Maybe on a disk mounted since the last listing
+            disk = self._match_mount(real, self._mounts(self.MOUNT_RETRY_SECONDS))
+        if disk is not None:
+            return disk
+
+        # Anything else: group by device of the nearest existing path. lstat,
+        # so a cached file's symlink counts for the array, not the cache SSD
+        probe = real
+        while probe and not os.path.lexists(probe):
+            parent = os.path.dirname(probe)
+            if parent == probe:
+                break
+            probe = parent
+        try:
+            return f"dev:{os.lstat(probe).st_dev}"
+        except OSError:
+            return "unknown"
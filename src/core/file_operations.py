@@ -12,17 +12,36 @@ The key operation sequence:
 """
 
 import os
+import json
+import errno
 import shutil
 import logging
 import threading
 import uuid
 import time
+import mmap
 from pathlib import Path
-from typing import Optional, List, Set, Tuple, Dict, Any
+from typing import Optional, List, Set, Tuple, Dict, Any, Callable, Iterator, Iterable
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, Future
+from concurrent.futures import Future, as_completed
 from enum import Enum
 
+from .path_table import path_table
+from .disks import DiskScheduler
+from .throttle import BandwidthLimiter, TO_CACHE, TO_ARRAY
+from .concurrency import AIMDController
+from .transfers import TransferService, TransferJob, TransferPriority, TransferDeferred
+from .space import SpaceLedger, SpaceReservation, SpaceDeferred
+from .backups import BackupIndex
+from ..db.store import TrackerStore
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+    fcntl = None
+
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +49,16 @@ logger = logging.getLogger(__name__)
 # Extension used to mark array files that have been cached
 PLEXCACHED_EXTENSION = ".plexcached"
 
+# In-progress copies are written to <dest>.part with a <dest>.part.json checkpoint
+PART_SUFFIX = ".part"
+CHECKPOINT_SUFFIX = ".part.json"
+PARTIAL_SUFFIXES = (PART_SUFFIX, CHECKPOINT_SUFFIX, CHECKPOINT_SUFFIX + ".tmp")
+
+# Copy errors after which a .part is not worth keeping for a resume
+_DISCARD_PART_ERRNOS = {
+    errno.ENOSPC, errno.ENOENT, errno.ESTALE, getattr(errno, 'EDQUOT', errno.ENOSPC),
+}
+
 
 class OperationType(str, Enum):
     """Types of file operations."""
@@ -48,6 +77,10 @@ class OperationResult:
     bytes_transferred: int = 0
     duration_seconds: float = 0
     error: Optional[str] = None
+    copy_method: Optional[str] = None  # How data was copied (None = no copy)
+    throughput_mb_s: float = 0  # Copy throughput in MB/s
+    throttled_seconds: float = 0  # Time the copy waited on bandwidth limits
+    copy_seconds: float = 0  # Time spent copying data, excluding queueing for disk and space
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -58,9 +91,417 @@ class OperationResult:
             'bytes_transferred': self.bytes_transferred,
             'duration_seconds': round(self.duration_seconds, 2),
             'error': self.error,
+            'copy_method': self.copy_method,
+            'throughput_mb_s': round(self.throughput_mb_s, 1),
+            'throttled_seconds': round(self.throttled_seconds, 1),
+            'copy_seconds': round(self.copy_seconds, 2),
         }
 
 
+class CopyMethod(str, Enum):
+    """How file data was copied."""
+    REFLINK = "reflink"  # FICLONE: shares extents copy-on-write, same filesystem only
+    HARDLINK = "hardlink"  # Same inode, same filesystem only (opt-in)
+    COPY_FILE_RANGE = "copy_file_range"  # In-kernel copy, may offload to the filesystem
+    SENDFILE = "sendfile"  # In-kernel copy through the page cache
+    READINTO = "readinto"  # Userspace loop with a reused buffer
+    DIRECT = "direct"  # O_DIRECT loop bypassing the page cache (large files, opt-in)
+
+
+# Methods that actually move data (links complete instantly)
+MEASURED_COPY_METHODS = frozenset({
+    CopyMethod.COPY_FILE_RANGE, CopyMethod.SENDFILE, CopyMethod.READINTO, CopyMethod.DIRECT,
+})
+
+
+@dataclass
+class CopyReport:
+    """Outcome of a CopyEngine.copy() call."""
+    method: CopyMethod
+    bytes_copied: int  # Bytes copied by this call (excludes a resumed prefix)
+    duration_seconds: float
+    resumed_from: int = 0  # Offset an interrupted copy was resumed at
+    throttled_seconds: float = 0  # Time spent waiting on bandwidth limits
+    
+    @property
+    def throughput_mb_s(self) -> float:
+        if self.duration_seconds <= 0:
+            return 0.0
+        return self.bytes_copied / self.duration_seconds / 1_000_000
+
+
+# Errors meaning "this copy method doesn't work for these files"
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+    getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP), errno.EBADF, errno.ENOTTY,
+    errno.EPERM,
+}
+
+# ioctl(dest_fd, FICLONE, src_fd) from linux/fs.h
+FICLONE = 0x40049409
+
+# Page cache control (Linux; no-ops where unavailable)
+FADVISE_AVAILABLE = hasattr(os, 'posix_fadvise')
+O_DIRECT = getattr(os, 'O_DIRECT', 0)
+DIRECT_ALIGNMENT = 4096  # O_DIRECT offsets and lengths must be block aligned
+
+
+class CopyEngine:
+    """Copies file data with the fastest method the filesystems allow.
+    
+    On the same filesystem, first tries a FICLONE reflink (O(metadata) on
+    btrfs/XFS) and, if enabled, a hardlink. Otherwise tries
+    os.copy_file_range, then os.sendfile, then a readinto loop with a
+    reused per-thread buffer. The first method that works for a (source
+    device, destination device) pair is remembered for later copies. If a
+    method fails part-way, the next one resumes at the same offset.
+    
+    Copies stream with POSIX_FADV_SEQUENTIAL and, with drop_cache, drop
+    source and destination pages behind the write cursor, so a large copy
+    doesn't push Plex's database and active streams out of the page cache.
+    Files of at least direct_io_min_bytes skip the page cache entirely
+    with O_DIRECT where the filesystems support it.
+    """
+    
+    CHUNK_SIZE = 64 * 1024 * 1024  # Bytes per kernel copy call
+    BUFFER_SIZE = 8 * 1024 * 1024  # Userspace buffer for the readinto loop
+    CHECKPOINT_BYTES = 512 * 1024 * 1024  # Data synced between checkpoint callbacks
+    THROTTLED_CHUNK_SIZE = 8 * 1024 * 1024  # Smaller chunks keep throttled copies smooth
+    DROP_BEHIND_BYTES = 64 * 1024 * 1024  # Data copied between page cache drops
+    
+    def __init__(self, reflink: bool = True, hardlink_fallback: bool = False,
+                 drop_cache: bool = True, direct_io_min_bytes: int = 0):
+        """
+        Initialize copy engine.
+        
+        Args:
+            reflink: Try FICLONE when source and destination share a device
+            hardlink_fallback: Hardlink on a shared device that can't reflink.
+                The cache file is then the same inode as the original.
+            drop_cache: Drop copied pages from the page cache as the copy goes
+            direct_io_min_bytes: Copy files at least this large with O_DIRECT
+                (0 = never)
+        """
+        self.reflink = reflink and FCNTL_AVAILABLE
+        self.hardlink_fallback = hardlink_fallback
+        self.drop_cache = drop_cache and FADVISE_AVAILABLE
+        self.direct_io_min_bytes = direct_io_min_bytes if O_DIRECT and FCNTL_AVAILABLE else 0
+        self._lock = threading.Lock()
+        self._methods: Dict[Tuple[int, int], CopyMethod] = {}
+        self._unsupported: Set[Tuple[int, int, CopyMethod]] = set()
+        self._buffers = threading.local()
+        # method -> [copies, bytes, seconds]
+        self._stats: Dict[CopyMethod, List[float]] = {}
+    
+    def copy(self,
+             source_path: str,
+             dest_path: str,
+             resume_offset: int = 0,
+             checkpoint: Optional[Callable[[int], None]] = None,
+             throttle: Optional[Callable[[int], float]] = None,
+             preallocated: Optional[Callable[[], None]] = None,
+             progress: Optional[Callable[[int], None]] = None) -> CopyReport:
+        """Copy file data and metadata (like shutil.copy2).
+        
+        Args:
+            source_path: File to copy
+            dest_path: Destination file
+            resume_offset: Keep the first bytes of an existing dest_path and
+                copy only the rest (must be data already synced to disk)
+            checkpoint: Called with the copied offset each time another
+                CHECKPOINT_BYTES have been fdatasync'd to dest_path
+            throttle: Called with the size of each copied chunk; blocks as
+                bandwidth limits require and returns the seconds it waited.
+                Chunks are kept small while its `limited` attribute (if
+                any) is true.
+            preallocated: If given, the destination's full size is claimed
+                with posix_fallocate before any data is read (raising ENOSPC
+                if it doesn't fit), and this is called once that succeeded
+            progress: Called with the size of each copied chunk
+        """
+        start = time.monotonic()
+        src_stat = os.stat(source_path)
+        key = (src_stat.st_dev, os.stat(os.path.dirname(os.path.abspath(dest_path))).st_dev)
+        
+        method = None
+        copied = src_stat.st_size
+        throttled = 0.0
+        if key[0] == key[1] and resume_offset == 0:
+            method = self._try_link(source_path, dest_path, key)
+            if method is not None:
+                # Shared extents or a second name: no blocks left to claim
+                if preallocated is not None:
+                    preallocated()
+                if progress is not None:
+                    progress(src_stat.st_size)
+
+        if (method is None and self.direct_io_min_bytes
+                and src_stat.st_size >= self.direct_io_min_bytes
+                and resume_offset % DIRECT_ALIGNMENT == 0
+                and self._supported(key, CopyMethod.DIRECT)):
+            try:
+                end, throttled = self._copy_direct(source_path, dest_path, src_stat.st_size,
+                                                   resume_offset, checkpoint, throttle, preallocated,
+                                                   progress)
+                method = CopyMethod.DIRECT
+                copied = end - resume_offset
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                self._mark_unsupported(key, CopyMethod.DIRECT, e)
+        
+        if method is None:
+            mode = 'r+b' if resume_offset > 0 else 'wb'
+            with open(source_path, 'rb', buffering=0) as src, open(dest_path, mode, buffering=0) as dst:
+                if resume_offset > 0:
+                    dst.truncate(resume_offset)
+                self._preallocate(dst.fileno(), src_stat.st_size, resume_offset, preallocated)
+                self._advise(src.fileno(), resume_offset, 0, 'POSIX_FADV_SEQUENTIAL')
+                method, end, throttled = self._copy_fds(src, dst, src_stat.st_size, key,
+                                                        resume_offset, checkpoint, throttle, progress)
+                if end < src_stat.st_size:
+                    dst.truncate(end)  # Source shrank: drop preallocated space past the data
+                if checkpoint is not None:
+                    os.fsync(dst.fileno())
+                if self.drop_cache:
+                    # Destination pages are clean after the fsync; without one
+                    # this starts writeback so they can be reclaimed early
+                    self._advise(src.fileno(), 0, 0, 'POSIX_FADV_DONTNEED')
+                    self._advise(dst.fileno(), 0, 0, 'POSIX_FADV_DONTNEED')
+            copied = end - resume_offset
+        if method != CopyMethod.HARDLINK:
+            shutil.copystat(source_path, dest_path)
+        
+        report = CopyReport(method, copied, time.monotonic() - start, resume_offset, throttled)
+        with self._lock:
+            totals = self._stats.setdefault(method, [0, 0, 0.0])
+            totals[0] += 1
+            totals[1] += report.bytes_copied
+            totals[2] += report.duration_seconds
+        return report
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-method copy totals for status reporting."""
+        with self._lock:
+            return {
+                method.value: {
+                    'copies': int(copies),
+                    'bytes': int(nbytes),
+                    'throughput_mb_s': round(nbytes / seconds / 1_000_000, 1) if seconds > 0 else 0,
+                }
+                for method, (copies, nbytes, seconds) in self._stats.items()
+            }
+    
+    def _advise(self, fd: int, offset: int, length: int, advice: str) -> None:
+        """posix_fadvise() that ignores unsupported platforms and filesystems."""
+        if not FADVISE_AVAILABLE:
+            return
+        try:
+            os.posix_fadvise(fd, offset, length, getattr(os, advice))
+        except OSError as e:
+            logger.debug(f"{advice} failed: {e}")
+    
+    def _preallocate(self, fd: int, size: int, offset: int,
+                     preallocated: Optional[Callable[[], None]]) -> None:
+        """Claim a destination's blocks up front, so a full drive fails now, not mid-copy.
+        
+        Unsupported filesystems are copied without preallocation.
+        """
+        if preallocated is None or size <= offset or not hasattr(os, 'posix_fallocate'):
+            return
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                os.ftruncate(fd, offset)  # Give back anything partially allocated
+                raise
+            if e.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+            logger.debug(f"posix_fallocate unavailable: {e}")
+            return
+        preallocated()
+    
+    def _supported(self, key: Tuple[int, int], method: CopyMethod) -> bool:
+        with self._lock:
+            return (key[0], key[1], method) not in self._unsupported
+    
+    def _mark_unsupported(self, key: Tuple[int, int], method: CopyMethod, error: OSError) -> None:
+        logger.debug(f"{method.value} unavailable for devices {key}: {error}")
+        with self._lock:
+            self._unsupported.add((key[0], key[1], method))
+    
+    def _try_link(self, source_path: str, dest_path: str, key: Tuple[int, int]) -> Optional[CopyMethod]:
+        """Same-filesystem fast paths. Returns None if a data copy is needed."""
+        if self.reflink and self._supported(key, CopyMethod.REFLINK):
+            try:
+                with open(source_path, 'rb') as src, open(dest_path, 'wb') as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return CopyMethod.REFLINK
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                self._mark_unsupported(key, CopyMethod.REFLINK, e)
+        
+        if self.hardlink_fallback and self._supported(key, CopyMethod.HARDLINK):
+            try:
+                if os.path.lexists(dest_path):
+                    os.unlink(dest_path)  # Empty file left by a failed reflink
+                os.link(source_path, dest_path)
+                return CopyMethod.HARDLINK
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                self._mark_unsupported(key, CopyMethod.HARDLINK, e)
+        
+        return None
+    
+    def _candidates(self, key: Tuple[int, int]) -> List[CopyMethod]:
+        methods = []
+        if hasattr(os, 'copy_file_range'):
+            methods.append(CopyMethod.COPY_FILE_RANGE)
+        if hasattr(os, 'sendfile'):
+            methods.append(CopyMethod.SENDFILE)
+        methods.append(CopyMethod.READINTO)
+        
+        with self._lock:
+            known = self._methods.get(key)
+            methods = [m for m in methods if (key[0], key[1], m) not in self._unsupported]
+        if known in methods:
+            methods.remove(known)
+            methods.insert(0, known)
+        return methods
+    
+    def _copy_fds(self, src, dst, size: int, key: Tuple[int, int], offset: int = 0,
+                  checkpoint: Optional[Callable[[int], None]] = None,
+                  throttle: Optional[Callable[[int], float]] = None,
+                  progress: Optional[Callable[[int], None]] = None) -> Tuple[CopyMethod, int, float]:
+        """Copy src to dst from offset. Returns (method, end offset, throttled seconds)."""
+        synced = offset
+        throttled = 0.0
+        # Page cache drop marks: source pages are dropped as soon as they are
+        # copied, destination pages one window later, once written back
+        src_dropped = dst_dropped = offset
+        for method in self._candidates(key):
+            try:
+                while offset < size:
+                    chunk = size - offset
+                    if throttle is not None and getattr(throttle, 'limited', True):
+                        chunk = min(chunk, self.THROTTLED_CHUNK_SIZE)
+                    copied = self._copy_chunk(method, src, dst, offset, chunk)
+                    if copied == 0:
+                        break  # Source shrank while copying
+                    offset += copied
+                    if progress is not None:
+                        progress(copied)
+                    if throttle is not None:
+                        throttled += throttle(copied)
+                    if self.drop_cache and offset - src_dropped >= self.DROP_BEHIND_BYTES:
+                        # DONTNEED drops clean pages and starts writeback of
+                        # dirty ones, so the next call can drop those too
+                        self._advise(src.fileno(), src_dropped, offset - src_dropped, 'POSIX_FADV_DONTNEED')
+                        self._advise(dst.fileno(), dst_dropped, offset - dst_dropped, 'POSIX_FADV_DONTNEED')
+                        dst_dropped = src_dropped
+                        src_dropped = offset
+                    if checkpoint is not None and offset - synced >= self.CHECKPOINT_BYTES:
+                        os.fdatasync(dst.fileno())
+                        synced = offset
+                        checkpoint(offset)
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS or method == CopyMethod.READINTO:
+                    raise
+                self._mark_unsupported(key, method, e)
+                continue
+            
+            with self._lock:
+                self._methods[key] = method
+            return method, offset, throttled
+        
+        raise OSError(errno.ENOTSUP, "No copy method available")
+    
+    def _copy_direct(self, source_path: str, dest_path: str, size: int, offset: int = 0,
+                     checkpoint: Optional[Callable[[int], None]] = None,
+                     throttle: Optional[Callable[[int], float]] = None,
+                     preallocated: Optional[Callable[[], None]] = None,
+                     progress: Optional[Callable[[int], None]] = None) -> Tuple[int, float]:
+        """Copy with O_DIRECT on both files. Returns (end offset, throttled seconds).
+        
+        Raises an unsupported-errno OSError (e.g. EINVAL on tmpfs) if the
+        filesystems can't do direct I/O.
+        """
+        buffer = getattr(self._buffers, 'direct', None)
+        if buffer is None:
+            # Anonymous mmap memory is page aligned, as O_DIRECT requires
+            buffer = self._buffers.direct = memoryview(mmap.mmap(-1, self.BUFFER_SIZE))
+        
+        flags = os.O_WRONLY | os.O_CREAT | O_DIRECT | (0 if offset else os.O_TRUNC)
+        src_fd = os.open(source_path, os.O_RDONLY | O_DIRECT)
+        try:
+            dst_fd = os.open(dest_path, flags, 0o644)
+            try:
+                if offset:
+                    os.ftruncate(dst_fd, offset)
+                self._preallocate(dst_fd, size, offset, preallocated)
+                synced = offset
+                throttled = 0.0
+                while offset < size:
+                    read = os.preadv(src_fd, [buffer], offset)
+                    if read == 0:
+                        break  # Source shrank while copying
+                    aligned = read - read % DIRECT_ALIGNMENT
+                    written = 0
+                    while written < aligned:
+                        written += os.pwritev(dst_fd, [buffer[written:aligned]], offset + written)
+                    if aligned < read:
+                        # Unaligned tail at EOF: finish with buffered I/O
+                        fcntl.fcntl(dst_fd, fcntl.F_SETFL, fcntl.fcntl(dst_fd, fcntl.F_GETFL) & ~O_DIRECT)
+                        while written < read:
+                            written += os.pwrite(dst_fd, buffer[written:read], offset + written)
+                    offset += read
+                    if progress is not None:
+                        progress(read)
+                    if throttle is not None:
+                        throttled += throttle(read)
+                    if checkpoint is not None and offset - synced >= self.CHECKPOINT_BYTES:
+                        os.fdatasync(dst_fd)
+                        synced = offset
+                        checkpoint(offset)
+                if offset < size:
+                    os.ftruncate(dst_fd, offset)
+                if checkpoint is not None:
+                    os.fsync(dst_fd)
+                return offset, throttled
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+    
+    def _copy_chunk(self, method: CopyMethod, src, dst, offset: int, remaining: int) -> int:
+        """Copy up to one chunk at offset. Returns bytes copied (0 at EOF)."""
+        if method == CopyMethod.COPY_FILE_RANGE:
+            return os.copy_file_range(src.fileno(), dst.fileno(), min(remaining, self.CHUNK_SIZE),
+                                      offset, offset)
+        
+        if method == CopyMethod.SENDFILE:
+            # sendfile writes at the destination's file position
+            os.lseek(dst.fileno(), offset, os.SEEK_SET)
+            return os.sendfile(dst.fileno(), src.fileno(), offset, min(remaining, self.CHUNK_SIZE))
+        
+        buffer = getattr(self._buffers, 'view', None)
+        if buffer is None:
+            buffer = self._buffers.view = memoryview(bytearray(self.BUFFER_SIZE))
+        
+        src.seek(offset)
+        read = src.readinto(buffer[:min(remaining, len(buffer))])
+        if not read:
+            return 0
+        
+        dst.seek(offset)
+        written = 0
+        while written < read:
+            written += dst.write(buffer[written:read])
+        return read
+
+
 def format_bytes(size: int) -> str:
     """Format bytes as human-readable string."""
     for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
@@ -110,16 +551,34 @@ class AtomicFileOperations:
                  array_path: str,
                  max_concurrent_cache: int = 3,
                  max_concurrent_array: int = 1,
-                 dry_run: bool = False):
+                 min_concurrent_cache: int = 1,
+                 min_concurrent_array: int = 1,
+                 adaptive_concurrency: bool = True,
+                 dry_run: bool = False,
+                 reflink: bool = True,
+                 hardlink_fallback: bool = False,
+                 streams_per_disk: int = 1,
+                 bandwidth: Optional[BandwidthLimiter] = None,
+                 drop_page_cache: bool = True,
+                 direct_io_min_mb: int = 0):
         """
         Initialize file operations.
         
         Args:
             cache_path: Base path for cache storage
             array_path: Base path for array storage
-            max_concurrent_cache: Concurrent cache operations
-            max_concurrent_array: Concurrent array operations
+            max_concurrent_cache: Concurrent cache operations (upper bound when adaptive)
+            max_concurrent_array: Concurrent array operations (upper bound when adaptive)
+            min_concurrent_cache: Lower bound for adaptive cache concurrency
+            min_concurrent_array: Lower bound for adaptive array concurrency
+            adaptive_concurrency: Tune concurrency from measured throughput and latency
             dry_run: Simulate without moving files
+            reflink: Clone instead of copying when cache and source share a filesystem
+            hardlink_fallback: Hardlink when sharing a filesystem that can't reflink
+            streams_per_disk: Concurrent array transfers allowed per physical disk
+            bandwidth: Transfer rate limits (default: unlimited)
+            drop_page_cache: Keep transfers from filling the page cache
+            direct_io_min_mb: Copy files of at least this size with O_DIRECT (0 = off)
         """
         self.cache_path = Path(cache_path)
         self.array_path = Path(array_path)
@@ -128,15 +587,85 @@ class AtomicFileOperations:
         self.dry_run = dry_run
         
         self._lock = threading.RLock()
-        self._active_operations: Dict[str, Future] = {}
+        self.copy_engine = CopyEngine(
+            reflink=reflink,
+            hardlink_fallback=hardlink_fallback,
+            drop_cache=drop_page_cache,
+            direct_io_min_bytes=direct_io_min_mb * 1024 * 1024,
+        )
+        self.disk_scheduler = DiskScheduler(streams_per_disk)
+        self.bandwidth = bandwidth or BandwidthLimiter()
+        # Space promised to in-flight copies, so they can't overcommit the cache
+        self.space = SpaceLedger(str(self.cache_path))
+        self.cache_concurrency = AIMDController(
+            "Cache", min_concurrent_cache, max_concurrent_cache, adaptive_concurrency
+        )
+        self.array_concurrency = AIMDController(
+            "Array", min_concurrent_array, max_concurrent_array, adaptive_concurrency
+        )
+        # Records files cached by queued transfers while their space is still
+        # reserved: record_cached(job, result) (set by CacheManager)
+        self.record_cached: Optional[Callable[[TransferJob, OperationResult], None]] = None
+        # Long-lived workers for all transfers (CacheManager attaches persistence)
+        self.transfers = TransferService(
+            self._run_transfer,
+            {OperationType.CACHE.value: max_concurrent_cache,
+             OperationType.RESTORE.value: max_concurrent_array},
+            disks=self.disk_scheduler,
+        )
+        
+        # Unfinished copies on the cache: dest path -> bytes its .part occupies
+        self._parts: Dict[str, int] = {}
         
-        # Track symlink mappings for restoration
+        # Track symlink mappings for restoration (CacheManager attaches persistence)
         self._symlink_registry: Dict[str, Dict[str, str]] = {}
         # Format: {original_path: {cached_path, backup_path}}
+        self._registry_store: Optional[TrackerStore] = None
+        # Backups of files the registry doesn't know, listed once per directory
+        self.backups = BackupIndex(PLEXCACHED_EXTENSION)
+    
+    def attach_registry_store(self, store: TrackerStore) -> int:
+        """Persist the symlink registry in a store and load entries saved there.
+        
+        Keeps restores after a restart from having to search for backups.
+        Returns the number of entries loaded.
+        """
+        try:
+            saved = store.load()
+        except Exception as e:
+            logger.warning(f"Could not load symlink registry: {e}")
+            saved = {}
+        
+        with self._lock:
+            loaded = 0
+            for original_path, entry in saved.items():
+                if not isinstance(entry, dict) or original_path in self._symlink_registry:
+                    continue
+                self._symlink_registry[path_table.intern(original_path)] = {
+                    'cached_path': entry.get('cached_path', ''),
+                    'backup_path': entry.get('backup_path', ''),
+                }
+                loaded += 1
+            self._registry_store = store
+            self._registry_store.replace(dict(self._symlink_registry))
+        if loaded:
+            logger.info(f"Loaded {loaded} cached file mappings")
+        return loaded
+    
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop transfer workers and close persistent stores."""
+        self.transfers.stop(timeout)
+        with self._lock:
+            if self._registry_store is not None:
+                self._registry_store.close()
+                self._registry_store = None
     
     def copy_to_cache_atomic(self, 
                              source_path: str,
-                             preserve_structure: bool = True) -> OperationResult:
+                             preserve_structure: bool = True,
+                             priority: Optional[int] = None,
+                             on_cached: Optional[Callable[[OperationResult], None]] = None,
+                             defer_for_space: bool = False) -> OperationResult:
         """
         Copy file to cache and atomically replace original with symlink.
         
@@ -146,15 +675,43 @@ class AtomicFileOperations:
         3. Atomically replace original with symlink
         4. Keep backup of original for restoration
         
+        The copy's cache space stays reserved until on_cached has returned,
+        so the file is counted until it has been recorded.
+        
         Args:
             source_path: Path to file on array
             preserve_structure: Maintain directory structure in cache
+            priority: Transfer priority, so eviction to make room for the
+                file only evicts files worth less
+            on_cached: Called with the result once the file is cached
+                (e.g. to record it in a tracker)
+            defer_for_space: Raise SpaceDeferred instead of waiting while
+                eviction makes room (for callers that retry later)
             
         Returns:
             OperationResult with success status and details
         """
+        try:
+            result = self._copy_to_cache(source_path, preserve_structure, priority, defer_for_space)
+            if result.success and on_cached is not None:
+                try:
+                    on_cached(result)
+                except Exception as e:
+                    logger.error(f"Could not record cached file {source_path}: {e}")
+            return result
+        finally:
+            # Held by a finished copy until now (no-op otherwise)
+            self.space.release(str(self._get_cache_destination(source_path, preserve_structure)))
+    
+    def _copy_to_cache(self,
+                       source_path: str,
+                       preserve_structure: bool,
+                       priority: Optional[int],
+                       defer_for_space: bool) -> OperationResult:
+        """Copy to cache and replace with a symlink; see copy_to_cache_atomic()."""
         source = Path(source_path)
         start_time = time.time()
+        cache_dest = None
         
         try:
             # Validate source
@@ -197,9 +754,28 @@ class AtomicFileOperations:
             cache_dest.parent.mkdir(parents=True, exist_ok=True)
             
             # Step 1: Copy to cache (if not already there)
+            report = None
+            if cache_dest.exists() and cache_dest.stat().st_size != source.stat().st_size:
+                logger.warning(f"Replacing incomplete cache copy: {cache_dest}")
+                cache_dest.unlink()
             if not cache_dest.exists():
-                logger.info(f"Copying to cache: {source.name}")
-                shutil.copy2(source_path, cache_dest)
+                # Fail before touching the source if the cache can't hold the
+                # file; a .part left by an interrupted copy already has its blocks
+                _, offset = self._resume_offset(source_path, str(cache_dest))
+                held = self._allocated_bytes(str(cache_dest) + PART_SUFFIX) if offset else 0
+                needed = source.stat().st_size - held
+                # Disk slot first (already held when run from the transfer
+                # queue): waiting for the disk must not tie up cache space
+                with self.disk_scheduler.slot(source_path) as disk:
+                    with self.space.reserve(str(cache_dest), max(0, needed),
+                                            priority, defer_for_space) as reservation:
+                        logger.info(f"Copying to cache: {source.name}")
+                        report = self._copy_resumable(source_path, str(cache_dest),
+                                                      self.bandwidth.for_transfer(TO_CACHE, disk),
+                                                      reservation)
+                        # Keep the whole file counted (a resumed copy reserved
+                        # only the rest) until copy_to_cache_atomic releases it
+                        self.space.hold(reservation, cache_dest.stat().st_size)
             
             file_size = cache_dest.stat().st_size
             
@@ -212,6 +788,9 @@ class AtomicFileOperations:
                 logger.info(
                     f"✓ Cached: {source.name} ({format_bytes(file_size)}) "
                     f"in {duration:.1f}s"
+                    + (f" via {report.method.value}, {report.throughput_mb_s:.0f} MB/s" if report else "")
+                    + (f", resumed at {format_bytes(report.resumed_from)}" if report and report.resumed_from else "")
+                    + (f", throttled {report.throttled_seconds:.0f}s" if report and report.throttled_seconds >= 1 else "")
                 )
                 return OperationResult(
                     success=True,
@@ -220,6 +799,10 @@ class AtomicFileOperations:
                     operation=OperationType.CACHE,
                     bytes_transferred=file_size,
                     duration_seconds=duration,
+                    copy_method=report.method.value if report else None,
+                    throughput_mb_s=report.throughput_mb_s if report else 0,
+                    throttled_seconds=report.throttled_seconds if report else 0,
+                    copy_seconds=report.duration_seconds if report else 0,
                 )
             else:
                 # Cleanup on failure
@@ -236,6 +819,8 @@ class AtomicFileOperations:
                     error="Symlink replacement failed",
                 )
                 
+        except SpaceDeferred:
+            raise
         except Exception as e:
             logger.error(f"Cache operation failed for {source.name}: {e}")
             return OperationResult(
@@ -270,6 +855,7 @@ class AtomicFileOperations:
         try:
             # Check if it's actually a symlink
             if not symlink.is_symlink():
+                self._unregister(symlink_path)
                 if symlink.exists():
                     logger.debug(f"Not a symlink, already on array: {symlink.name}")
                     return OperationResult(
@@ -301,6 +887,7 @@ class AtomicFileOperations:
             
             # Look for backup file
             backup_path = self._find_backup(symlink_path)
+            report = None
             
             if backup_path and Path(backup_path).exists():
                 # Restore from backup (atomic rename)
@@ -311,6 +898,7 @@ class AtomicFileOperations:
                 
                 # Restore original
                 os.rename(backup_path, symlink_path)
+                self.backups.discard(backup_path)
                 
                 logger.info(f"✓ Restored from backup: {symlink.name}")
             else:
@@ -326,11 +914,10 @@ class AtomicFileOperations:
                 
                 file_size = Path(cache_path).stat().st_size
                 
-                # Remove symlink
-                symlink.unlink()
-                
-                # Copy from cache
-                shutil.copy2(cache_path, symlink_path)
+                # Copy from cache; the rename replaces the symlink atomically
+                with self.disk_scheduler.slot(symlink_path) as disk:
+                    report = self._copy_resumable(cache_path, symlink_path,
+                                                  self.bandwidth.for_transfer(TO_ARRAY, disk))
                 
                 logger.info(f"✓ Restored from cache: {symlink.name}")
             
@@ -343,7 +930,7 @@ class AtomicFileOperations:
                     logger.warning(f"Could not remove cache copy: {e}")
             
             # Clear from registry
-            self._symlink_registry.pop(symlink_path, None)
+            self._unregister(symlink_path)
             
             duration = time.time() - start_time
             
@@ -354,6 +941,10 @@ class AtomicFileOperations:
                 operation=OperationType.RESTORE,
                 bytes_transferred=file_size,
                 duration_seconds=duration,
+                copy_method=report.method.value if report else None,
+                throughput_mb_s=report.throughput_mb_s if report else 0,
+                throttled_seconds=report.throttled_seconds if report else 0,
+                copy_seconds=report.duration_seconds if report else 0,
             )
             
         except Exception as e:
@@ -366,83 +957,325 @@ class AtomicFileOperations:
                 error=str(e),
             )
     
+    def submit_cache(self,
+                     source_path: str,
+                     source: str = "manual",
+                     priority: Optional[int] = None) -> Future:
+        """
+        Queue a copy to cache on the transfer service.
+        
+        Requests for a file that is already queued or being cached share
+        one future.
+        
+        Args:
+            source_path: Path to file on array
+            source: Why the file is cached (tracker source)
+            priority: Queue priority (default: derived from source)
+            
+        Returns:
+            Future resolving to the OperationResult
+        """
+        if priority is None:
+            priority = TransferPriority.for_source(source)
+        return self.transfers.submit(source_path, OperationType.CACHE, source, priority)
+    
+    def submit_restore(self,
+                       symlink_path: str,
+                       remove_cache_copy: bool = True,
+                       source: str = "manual",
+                       priority: Optional[int] = None) -> Future:
+        """Queue a restore on the transfer service (see submit_cache)."""
+        if priority is None:
+            priority = TransferPriority.for_source(source)
+        return self.transfers.submit(symlink_path, OperationType.RESTORE, source, priority,
+                                     remove_cache_copy=remove_cache_copy)
+    
     def batch_cache(self,
                     file_paths: List[str],
-                    callback: Optional[callable] = None) -> List[OperationResult]:
+                    callback: Optional[callable] = None,
+                    source: str = "manual",
+                    sources: Optional[Dict[str, str]] = None,
+                    priorities: Optional[Dict[str, int]] = None) -> List[OperationResult]:
         """
         Cache multiple files with concurrent execution.
         
         Args:
             file_paths: List of files to cache
-            callback: Optional callback(result) after each file
+            callback: Optional callback(result) as each file finishes
+            source: Why the files are cached (sets queue priority)
+            sources: Per-file source overriding `source`
+            priorities: Per-file queue priority overriding the source's
             
         Returns:
-            List of OperationResult for each file
+            List of OperationResult for each file, in completion order
         """
         results = []
-        
-        with ThreadPoolExecutor(max_workers=self.max_concurrent_cache) as executor:
-            futures = {
-                executor.submit(self.copy_to_cache_atomic, path): path
-                for path in file_paths
-            }
-            
-            for future in futures:
-                path = futures[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    if callback:
-                        callback(result)
-                except Exception as e:
-                    result = OperationResult(
-                        success=False,
-                        source_path=path,
-                        dest_path="",
-                        operation=OperationType.CACHE,
-                        error=str(e)
-                    )
-                    results.append(result)
-                    if callback:
-                        callback(result)
-        
+        for result in self.iter_cache(file_paths, source, sources, priorities):
+            results.append(result)
+            if callback:
+                callback(result)
         return results
     
     def batch_restore(self,
                       file_paths: List[str],
                       remove_cache_copies: bool = True,
-                      callback: Optional[callable] = None) -> List[OperationResult]:
+                      callback: Optional[callable] = None,
+                      source: str = "manual") -> List[OperationResult]:
         """
         Restore multiple files with concurrent execution.
+        
+        Results (and callbacks) come in completion order.
         """
         results = []
+        for result in self.iter_restore(file_paths, remove_cache_copies, source):
+            results.append(result)
+            if callback:
+                callback(result)
+        return results
+    
+    def iter_cache(self,
+                   file_paths: List[str],
+                   source: str = "manual",
+                   sources: Optional[Dict[str, str]] = None,
+                   priorities: Optional[Dict[str, int]] = None) -> Iterator[OperationResult]:
+        """Queue files for caching and yield each result as soon as it finishes."""
+        sources = sources or {}
+        priorities = priorities or {}
+        futures = {
+            path: self.submit_cache(path, sources.get(path, source), priorities.get(path))
+            for path in self.disk_scheduler.interleave(file_paths)
+        }
+        for _, result in self.iter_results(futures, OperationType.CACHE):
+            yield result
+    
+    def iter_restore(self,
+                     file_paths: List[str],
+                     remove_cache_copies: bool = True,
+                     source: str = "manual") -> Iterator[OperationResult]:
+        """Queue restores and yield each result as soon as it finishes."""
+        futures = {
+            path: self.submit_restore(path, remove_cache_copies, source)
+            for path in self.disk_scheduler.interleave(file_paths)
+        }
+        for _, result in self.iter_results(futures, OperationType.RESTORE):
+            yield result
+    
+    def iter_results(self,
+                     futures: Dict[str, Future],
+                     operation: OperationType) -> Iterator[Tuple[str, OperationResult]]:
+        """Yield (path, result) for queued transfers in completion order.
         
-        with ThreadPoolExecutor(max_workers=self.max_concurrent_array) as executor:
-            futures = {
-                executor.submit(self.restore_to_array, path, remove_cache_copies): path
-                for path in file_paths
-            }
+        Errors are turned into failed results.
+        """
+        paths = {future: path for path, future in futures.items()}
+        for future in as_completed(paths):
+            path = paths[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = OperationResult(
+                    success=False,
+                    source_path=path,
+                    dest_path="",
+                    operation=operation,
+                    error=str(e)
+                )
+            yield path, result
+    
+    def _run_transfer(self, job: TransferJob) -> OperationResult:
+        """Run a queued transfer within its direction's concurrency limit."""
+        if job.operation == OperationType.RESTORE:
+            controller = self.array_concurrency
+            operation = lambda: self.restore_to_array(job.path, job.options.get('remove_cache_copy', True))
+        else:
+            controller = self.cache_concurrency
+            record = self.record_cached
+            operation = lambda: self.copy_to_cache_atomic(
+                job.path,
+                priority=job.priority,
+                on_cached=(lambda result: record(job, result)) if record else None,
+                defer_for_space=True,
+            )
+        
+        with controller.slot():
+            try:
+                result = operation()
+            except SpaceDeferred as e:
+                # Let the worker run other transfers while eviction makes room
+                raise TransferDeferred(str(e), self.space.RECHECK_SECONDS)
+        # Only real data copies say anything about disk throughput; throttled
+        # copies measure the bandwidth limit instead. Time spent waiting for a
+        # disk slot or cache space is not copy latency.
+        if result.copy_method in MEASURED_COPY_METHODS and result.throttled_seconds <= 0:
+            controller.record(result.bytes_transferred, result.copy_seconds)
+        return result
+    
+    def _copy_resumable(self, source_path: str, dest_path: str,
+                        throttle: Optional[Callable[[int], float]] = None,
+                        reservation: Optional[SpaceReservation] = None) -> CopyReport:
+        """Copy through dest.part with a checkpoint sidecar, then rename into place.
+        
+        An interrupted copy resumes from its last checkpoint, provided the
+        source still has the same size and mtime. dest_path only ever
+        appears complete. With a space reservation, dest.part is
+        preallocated to the full size and progress is reported to it.
+        """
+        part_path = dest_path + PART_SUFFIX
+        checkpoint_path = dest_path + CHECKPOINT_SUFFIX
+        
+        identity, offset = self._resume_offset(source_path, dest_path)
+        if offset:
+            logger.info(f"Resuming copy of {Path(source_path).name} at {format_bytes(offset)}")
+        # The part's existing blocks count as cache usage until the copy lands
+        self._track_part(dest_path, self._allocated_bytes(part_path) if offset else 0)
+        
+        def checkpoint(done: int) -> None:
+            self._write_checkpoint(checkpoint_path, dict(identity, offset=done))
+        
+        try:
+            report = self.copy_engine.copy(
+                source_path, part_path, resume_offset=offset,
+                checkpoint=checkpoint, throttle=throttle,
+                preallocated=reservation.mark_allocated if reservation is not None else None,
+                progress=reservation.add_written if reservation is not None else None,
+            )
+        except Exception as e:
+            # Keep the part only if a checkpoint lets the next attempt resume it
+            if getattr(e, 'errno', None) in _DISCARD_PART_ERRNOS or not os.path.exists(checkpoint_path):
+                self._remove_partial(dest_path)
+            else:
+                self._track_part(dest_path, self._allocated_bytes(part_path))
+            raise
+        os.replace(part_path, dest_path)
+        self._track_part(dest_path, 0)
+        try:
+            os.unlink(checkpoint_path)
+        except FileNotFoundError:
+            pass
+        return report
+    
+    def _resume_offset(self, source_path: str, dest_path: str) -> Tuple[Dict[str, Any], int]:
+        """Source identity and the offset to resume at; deletes a stale part."""
+        src_stat = os.stat(source_path)
+        identity = {
+            'source': source_path,
+            'size': src_stat.st_size,
+            'mtime_ns': src_stat.st_mtime_ns,
+        }
+        offset = self._read_checkpoint(dest_path + CHECKPOINT_SUFFIX, dest_path + PART_SUFFIX, identity)
+        if not offset:
+            self._remove_partial(dest_path)
+        return identity, offset
+    
+    def _track_part(self, dest_path: str, nbytes: int) -> None:
+        """Record the space a .part on the cache holds (0 = none)."""
+        if not self._is_in_cache(dest_path):
+            return  # Restore parts live on the array
+        with self._lock:
+            if nbytes > 0:
+                self._parts[dest_path] = nbytes
+            else:
+                self._parts.pop(dest_path, None)
+    
+    def _remove_partial(self, dest_path: str) -> bool:
+        """Delete a copy's .part and checkpoint files. Returns True if any existed."""
+        removed = False
+        for suffix in PARTIAL_SUFFIXES:
+            try:
+                os.unlink(dest_path + suffix)
+                removed = True
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove {dest_path + suffix}: {e}")
+        self._track_part(dest_path, 0)
+        if removed:
+            logger.debug(f"Removed partial copy: {dest_path}{PART_SUFFIX}")
+        return removed
+    
+    def partial_bytes(self) -> int:
+        """Cache space held by unfinished copies (.part files)."""
+        with self._lock:
+            return sum(self._parts.values())
+    
+    def cleanup_partial_copies(self, restore_paths: Iterable[str] = ()) -> int:
+        """Remove .part files no queued or running transfer will resume.
+        
+        Walks the cache for copies to the cache; restores write their part
+        next to the symlink, so the cached files' paths are checked directly.
+        Parts that are kept are counted in partial_bytes().
+        
+        Args:
+            restore_paths: Original paths of cached files (restore targets)
             
-            for future in futures:
-                path = futures[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    if callback:
-                        callback(result)
-                except Exception as e:
-                    result = OperationResult(
-                        success=False,
-                        source_path=path,
-                        dest_path="",
-                        operation=OperationType.RESTORE,
-                        error=str(e)
-                    )
-                    results.append(result)
-                    if callback:
-                        callback(result)
+        Returns:
+            Number of partial copies removed
+        """
+        queued_cache = {
+            str(self._get_cache_destination(path, True))
+            for path in self.transfers.active_paths(OperationType.CACHE)
+        }
+        queued_restore = self.transfers.active_paths(OperationType.RESTORE)
         
-        return results
+        partial = set()
+        for root, dirs, files in os.walk(self.cache_path):
+            for filename in files:
+                for suffix in PARTIAL_SUFFIXES:
+                    if filename.endswith(suffix):
+                        partial.add(os.path.join(root, filename[:-len(suffix)]))
+                        break
+        
+        removed = 0
+        for dest_path in partial:
+            if dest_path in queued_cache:
+                self._track_part(dest_path, self._allocated_bytes(dest_path + PART_SUFFIX))
+            elif not self.dry_run and self._remove_partial(dest_path):
+                removed += 1
+        
+        for path in restore_paths:
+            if path not in queued_restore and os.path.lexists(path + PART_SUFFIX):
+                if not self.dry_run and self._remove_partial(path):
+                    removed += 1
+        
+        if removed:
+            logger.info(f"Removed {removed} abandoned partial copies")
+        return removed
+    
+    @staticmethod
+    def _allocated_bytes(path: str) -> int:
+        """Disk space a file occupies (0 if it doesn't exist)."""
+        try:
+            return os.stat(path).st_blocks * 512
+        except OSError:
+            return 0
+    
+    def _read_checkpoint(self, checkpoint_path: str, part_path: str,
+                         identity: Dict[str, Any]) -> int:
+        """Offset to resume a copy at (0 = start over)."""
+        try:
+            with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            part_size = os.path.getsize(part_path)
+        except (OSError, ValueError):
+            return 0
+        
+        if any(saved.get(k) != v for k, v in identity.items()):
+            logger.debug(f"Source changed since checkpoint, restarting copy: {part_path}")
+            return 0
+        offset = saved.get('offset', 0)
+        if not isinstance(offset, int) or not 0 <= offset <= part_size:
+            return 0
+        return offset
+    
+    def _write_checkpoint(self, checkpoint_path: str, state: Dict[str, Any]) -> None:
+        """Atomically write a copy checkpoint (data is already synced)."""
+        temp = checkpoint_path + ".tmp"
+        try:
+            with open(temp, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(temp, checkpoint_path)
+        except OSError as e:
+            logger.warning(f"Could not write copy checkpoint: {e}")
     
     def _atomic_symlink_replace(self, original_path: str, cache_path: str) -> bool:
         """
@@ -467,6 +1300,7 @@ class AtomicFileOperations:
             
             # Step 1: Rename original to backup (atomic)
             original.rename(actual_backup)
+            self.backups.add(str(actual_backup))
             
             try:
                 # Step 2: Create symlink
@@ -477,10 +1311,13 @@ class AtomicFileOperations:
                 
                 # Register for restoration
                 with self._lock:
+                    if original_path not in self._symlink_registry:
+                        original_path = path_table.intern(original_path)
                     self._symlink_registry[original_path] = {
                         'cached_path': cache_path,
                         'backup_path': str(actual_backup),
                     }
+                    self._persist_registry(original_path)
                 
                 logger.debug(f"Created atomic symlink: {original.name} -> {cache_path}")
                 return True
@@ -495,6 +1332,7 @@ class AtomicFileOperations:
                     pass
                 try:
                     actual_backup.rename(original_path)
+                    self.backups.discard(str(actual_backup))
                 except:
                     pass
                 return False
@@ -543,22 +1381,64 @@ class AtomicFileOperations:
         """Find backup file for an original path."""
         # Check registry first
         with self._lock:
-            if original_path in self._symlink_registry:
-                return self._symlink_registry[original_path].get('backup_path')
-        
-        # Search for backup file
-        original = Path(original_path)
-        backup = original.parent / f".{original.name}{PLEXCACHED_EXTENSION}"
-        if backup.exists():
-            return str(backup)
+            entry = self._symlink_registry.get(original_path)
+            if entry and entry.get('backup_path'):
+                return entry['backup_path']
         
-        # Check numbered backups
-        for i in range(1, 10):
-            numbered = original.parent / f".{original.name}.{i}{PLEXCACHED_EXTENSION}"
-            if numbered.exists():
-                return str(numbered)
+        # Look it up in the directory listing
+        return self.backups.find(original_path)
+    
+    def _unregister(self, original_path: str) -> None:
+        """Drop a restored file from the symlink registry."""
+        with self._lock:
+            if self._symlink_registry.pop(original_path, None) is not None:
+                self._persist_registry(original_path)
+                path_table.release(original_path)
+    
+    def _persist_registry(self, original_path: str) -> None:
+        """Save one registry change (caller holds the lock)."""
+        if self._registry_store is None:
+            return
+        try:
+            self._registry_store.apply(
+                self._symlink_registry,
+                {original_path: self._symlink_registry.get(original_path)}
+            )
+        except Exception as e:
+            logger.error(f"Could not save symlink registry: {e}")
+    
+    def set_active_streams(self, file_paths: Set[str]) -> None:
+        """Tell the bandwidth limiter which files are being streamed.
         
-        return None
+        Transfers on the disks holding them back off to the session rate.
+        Cached files are streamed from the cache, so symlinks are followed.
+        """
+        disks = {self.disk_scheduler.resolve(os.path.realpath(path)) for path in file_paths}
+        self.bandwidth.set_busy_disks(disks)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """File operation statistics for status reporting."""
+        return {
+            'copy_methods': self.copy_engine.get_stats(),
+            'reflink_enabled': self.copy_engine.reflink,
+            'hardlink_fallback': self.copy_engine.hardlink_fallback,
+            'drop_page_cache': self.copy_engine.drop_cache,
+            'direct_io_min_bytes': self.copy_engine.direct_io_min_bytes,
+            'disk_queues': self.disk_scheduler.get_stats(),
+            'bandwidth': self.bandwidth.get_stats(),
+            'cache_space': self.space.get_stats(),
+            'partial_bytes': self.partial_bytes(),
+            'concurrency': {
+                'to_cache': self.cache_concurrency.get_stats(),
+                'to_array': self.array_concurrency.get_stats(),
+            },
+            'transfers': self.transfers.get_stats(),
+            'backup_index': self.backups.get_stats(),
+            'symlink_registry': {
+                'entries': len(self._symlink_registry),
+                'persistent': self._registry_store is not None,
+            },
+        }
     
     def get_cached_files(self) -> List[str]:
         """Get list of all symlinks pointing to cache."""
@@ -591,6 +1471,7 @@ class AtomicFileOperations:
                         if not self.dry_run:
                             try:
                                 os.unlink(backup_path)
+                                self.backups.discard(backup_path)
                                 removed += 1
                                 logger.debug(f"Removed orphaned backup: {backup_path}")
                             except Exception as e:
@@ -0,0 +1,103 @@
+"""
+Shared path interning for Cacherr.
+
+The same absolute media paths are stored as keys by every tracker and by
+AtomicFileOperations' symlink registry. Routing them through one table
+makes all of those structures reference a single string object per path,
+and reference counting drops a path once the last owner releases it.
+
+The table itself isn't free: each path costs a dict slot, plus a small
+list once a second owner shares it. Interning pays off only for paths
+held by several owners (a cached file is held by the timestamp tracker
+and the symlink registry at least), so get_stats() reports the table's
+own size next to the bytes saved.
+"""
+
+import sys
+import threading
+from typing import Dict, Any, List, Union
+
+
+# Size of the [string, count] slot kept for shared paths
+_SHARED_SLOT_BYTES = sys.getsizeof([None, 0])
+
+
+class PathTable:
+    """Thread-safe, reference-counted string interning table for paths."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # path -> canonical string (one reference) or [canonical string, count]
+        self._paths: Dict[str, Union[str, List[Any]]] = {}
+        # Counters for get_stats(), maintained as paths come and go
+        self._references = 0
+        self._shared = 0  # Paths with more than one reference
+        self._string_bytes = 0
+        self._saved_bytes = 0
+        self._hits = 0  # intern() calls that reused an existing string
+
+    def intern(self, path: str) -> str:
+        """Return the shared string for a path and take a reference to it."""
+        with self._lock:
+            self._references += 1
+            slot = self._paths.get(path)
+            if slot is None:
+                self._paths[path] = path
+                self._string_bytes += sys.getsizeof(path)
+                return path
+            self._hits += 1
+            if type(slot) is str:
+                self._paths[path] = [slot, 2]
+                self._shared += 1
+            else:
+                slot[1] += 1
+                slot = slot[0]
+            self._saved_bytes += sys.getsizeof(slot)
+            return slot
+
+    def release(self, path: str) -> None:
+        """Drop a reference taken by intern()."""
+        with self._lock:
+            slot = self._paths.get(path)
+            if slot is None:
+                return
+            self._references -= 1
+            if type(slot) is str:
+                del self._paths[path]
+                self._string_bytes -= sys.getsizeof(slot)
+                return
+            slot[1] -= 1
+            self._saved_bytes -= sys.getsizeof(slot[0])
+            if slot[1] == 1:
+                self._paths[path] = slot[0]
+                self._shared -= 1
+
+    def canonical(self, path: str) -> str:
+        """Return the shared string for a path without taking a reference."""
+        with self._lock:
+            slot = self._paths.get(path)
+            if slot is None:
+                return path
+            return slot if type(slot) is str else slot[0]
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Memory statistics for status reporting."""
+        with self._lock:
+            table_bytes = sys.getsizeof(self._paths) + self._shared * _SHARED_SLOT_BYTES
+            return {
+                'unique_paths': len(self._paths),
+                'shared_paths': self._shared,
+                'references': self._references,
+                'string_bytes': self._string_bytes,
+                'table_bytes': table_bytes,
+                'saved_bytes': self._saved_bytes,
+                'net_saved_bytes': self._saved_bytes - table_bytes,
+                'intern_hits': self._hits,
+            }
+
+
+# Process-wide table shared by trackers and file operations
+path_table = PathTable()
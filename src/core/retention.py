@@ -0,0 +1,214 @@
+"""
+Retention deadline scheduling for Cacherr.
+
+Instead of re-evaluating every cached file each cycle, the scheduler keeps
+a min-heap of the earliest time each file could become eligible for
+restore. A cycle only inspects files whose deadline has passed or whose
+list membership (OnDeck/watchlist) changed since the last cycle.
+
+Deadlines are conservative: a file may be inspected and kept, but it is
+never inspected later than the full-scan policy would have restored it.
+CacheManager._should_restore() remains the authority on the decision.
+"""
+
+import os
+import time
+import heapq
+import logging
+import threading
+from typing import Dict, List, Set, Tuple, Any, Optional
+
+from .trackers import (
+    CacheTimestampTracker,
+    WatchlistTracker,
+    OnDeckTracker,
+    parse_timestamp,
+)
+from .path_table import path_table
+
+
+logger = logging.getLogger(__name__)
+
+
+NEVER = float('inf')
+
+
+class RetentionScheduler:
+    """Min-heap of restore deadlines for cached files.
+
+    Tracker listeners only mark paths dirty; deadlines are (re)computed in
+    pop_due(), outside of any tracker lock.
+    """
+
+    def __init__(self,
+                 timestamp_tracker: CacheTimestampTracker,
+                 ondeck_tracker: OnDeckTracker,
+                 watchlist_tracker: WatchlistTracker,
+                 config: Any):
+        """
+        Initialize retention scheduler.
+
+        Args:
+            timestamp_tracker: Tracker of cached files
+            ondeck_tracker: OnDeck tracker (protects files while on deck)
+            watchlist_tracker: Watchlist tracker (protects files while listed)
+            config: CacherrSettings; `config.retention` is read every cycle
+        """
+        self.timestamp_tracker = timestamp_tracker
+        self.ondeck_tracker = ondeck_tracker
+        self.watchlist_tracker = watchlist_tracker
+        self.config = config
+
+        self._lock = threading.Lock()
+        self._heap: List[Tuple[float, str]] = []
+        self._deadlines: Dict[str, float] = {}  # Current deadline per path (heap entries may be stale)
+        self._dirty_paths: Set[str] = set()
+        self._dirty_names: Set[str] = set()
+        self._rebuild = True
+        self._policy: Tuple = ()
+
+        timestamp_tracker.add_listener(self._on_timestamp_change)
+        ondeck_tracker.add_listener(self._on_list_change)
+        watchlist_tracker.add_listener(self._on_list_change)
+
+    def _on_timestamp_change(self, file_paths: List[str]) -> None:
+        with self._lock:
+            self._dirty_paths.update(file_paths)
+
+    def _on_list_change(self, file_paths: List[str]) -> None:
+        # List lookups fall back to filename matching, so a change can
+        # affect any cached file with the same name
+        with self._lock:
+            self._dirty_paths.update(file_paths)
+            self._dirty_names.update(os.path.basename(p) for p in file_paths)
+
+    def invalidate(self) -> None:
+        """Recompute every deadline on the next cycle."""
+        with self._lock:
+            self._rebuild = True
+
+    def pop_due(self, now: Optional[float] = None) -> List[str]:
+        """Return cached files that need a retention check now.
+
+        Returned paths are removed from the schedule; call reschedule() for
+        any that are kept.
+        """
+        now = now if now is not None else time.time()
+        self._refresh(now)
+
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, path = heapq.heappop(self._heap)
+                if self._deadlines.get(path) == deadline:
+                    del self._deadlines[path]
+                    due.append(path)
+        return due
+
+    def reschedule(self, file_path: str, now: Optional[float] = None) -> None:
+        """Compute a fresh deadline for a file that was checked and kept."""
+        now = now if now is not None else time.time()
+        deadline = self._compute_deadline(file_path, now)
+        with self._lock:
+            self._push(file_path, deadline)
+
+    def defer(self, file_path: str) -> None:
+        """Check a file again next cycle (e.g. it is currently playing)."""
+        with self._lock:
+            self._dirty_paths.add(file_path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Scheduler statistics for status reporting."""
+        with self._lock:
+            next_deadline = min(self._deadlines.values(), default=None)
+            return {
+                'scheduled': len(self._deadlines),
+                'pending_changes': len(self._dirty_paths) + len(self._dirty_names),
+                'next_deadline': next_deadline if next_deadline != NEVER else None,
+            }
+
+    def _refresh(self, now: float) -> None:
+        """Apply pending tracker changes (and policy changes) to the heap."""
+        policy = self._policy_key()
+        with self._lock:
+            if self._rebuild or policy != self._policy:
+                self._rebuild = False
+                self._policy = policy
+                self._dirty_paths.clear()
+                self._dirty_names.clear()
+                self._heap = []
+                self._deadlines = {}
+                paths = None
+            else:
+                paths = self._dirty_paths
+                names = self._dirty_names
+                self._dirty_paths = set()
+                self._dirty_names = set()
+
+        # Tracker calls happen without holding our lock - tracker listeners
+        # take it while holding their own tracker lock
+        if paths is None:
+            with self.timestamp_tracker.locked():
+                paths = set(self.timestamp_tracker.get_all_entries())
+        else:
+            for name in names:
+                paths.update(self.timestamp_tracker.get_paths_by_name(name))
+
+        deadlines = [(path, self._compute_deadline(path, now)) for path in paths]
+
+        with self._lock:
+            for path, deadline in deadlines:
+                self._push(path, deadline)
+            if len(self._heap) > 2 * len(self._deadlines) + 64:
+                self._heap = [(d, p) for p, d in self._deadlines.items() if d != NEVER]
+                heapq.heapify(self._heap)
+
+    def _push(self, file_path: str, deadline: Optional[float]) -> None:
+        if deadline is None:
+            self._deadlines.pop(file_path, None)
+            return
+        file_path = path_table.canonical(file_path)
+        self._deadlines[file_path] = deadline
+        if deadline != NEVER:
+            heapq.heappush(self._heap, (deadline, file_path))
+
+    def _policy_key(self) -> Tuple:
+        retention = self.config.retention
+        return (retention.min_retention_hours, retention.watchlist_retention_days,
+                retention.max_cache_hours, retention.ondeck_protected)
+
+    def _compute_deadline(self, file_path: str, now: float) -> Optional[float]:
+        """Earliest time the file could be restored (None = not tracked).
+
+        Mirrors CacheManager._should_restore(); anything time-independent
+        (list membership) is re-evaluated through the tracker listeners.
+        """
+        record = self.timestamp_tracker.get_record(file_path)
+        if record is None:
+            return None
+        if record.cached_at is None:
+            return now  # Invalid timestamp - let _should_restore decide every cycle
+
+        retention = self.config.retention
+        min_deadline = record.cached_at + retention.min_retention_hours * 3600
+
+        on_ondeck = self.ondeck_tracker.get_entry(file_path) is not None
+        watchlist_entry = self.watchlist_tracker.get_entry(file_path)
+
+        if not on_ondeck and watchlist_entry is None:
+            return min_deadline
+
+        if on_ondeck and retention.ondeck_protected:
+            return NEVER
+
+        deadline = min_deadline
+        if watchlist_entry is not None:
+            watchlisted_at = parse_timestamp(watchlist_entry.get('watchlisted_at'))
+            if retention.watchlist_retention_days <= 0 or watchlisted_at is None:
+                return NEVER
+            deadline = max(deadline, watchlisted_at + retention.watchlist_retention_days * 86400)
+
+        # Still on a list - only the max cache time can expire it
+        if retention.max_cache_hours <= 0:
+            return NEVER
+        return max(deadline, record.cached_at + retention.max_cache_hours * 3600)
@@ -0,0 +1,313 @@
+"""
+Cache drive space accounting and admission control for Cacherr.
+
+Copies to the cache reserve their full size before they start. Until a
+copy has claimed its blocks with posix_fallocate, its reservation is
+subtracted from the free space statvfs reports, so concurrent copies
+can't all see the same free space and overcommit the drive. Reservations
+also track how much of each copy is still unwritten.
+
+With a cache limit, a copy is also only admitted if the cached bytes plus
+every in-flight reservation stay within the limit. A finished copy holds
+its reservation, at the file's full size, until its caller has recorded
+the file, so the bytes are never missing from both usage and reservations.
+
+A copy that doesn't fit asks for targeted eviction of just the missing
+bytes, of files worth less than the incoming one. Eviction runs on the
+ledger's own thread, never in the copy's worker: a queued copy is
+deferred (SpaceDeferred) so its worker can run other transfers, and a
+direct copy waits for it like for in-flight copies. Only when neither
+eviction nor in-flight copies make room does the copy give up.
+"""
+
+import os
+import time
+import errno
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+MB = 1024 ** 2
+
+
+class SpaceDeferred(OSError):
+    """A copy that can't be admitted until a pending eviction finishes."""
+
+
+class SpaceReservation:
+    """Space promised to one in-flight copy."""
+
+    def __init__(self, key: str, size: int):
+        self.key = key
+        self.size = size
+        self.written = 0
+        self.allocated = False  # Blocks claimed on disk (statvfs reflects them)
+        self.held = False  # Kept after the copy until release()
+
+    def mark_allocated(self) -> None:
+        self.allocated = True
+
+    def add_written(self, nbytes: int) -> None:
+        self.written = min(self.size, self.written + nbytes)
+
+    @property
+    def unwritten(self) -> int:
+        return self.size - self.written
+
+
+class SpaceLedger:
+    """Reservations against the free space of one filesystem and the cache limit."""
+
+    # Re-check free space this often while waiting (statvfs changes aren't signalled)
+    RECHECK_SECONDS = 5.0
+
+    def __init__(self, path: str, limit_bytes: int = 0, wait_seconds: float = 0):
+        """
+        Initialize space ledger.
+
+        Args:
+            path: Any path on the filesystem to account for (e.g. the cache root)
+            limit_bytes: Most bytes the cache may hold (0 = only free space counts)
+            wait_seconds: How long a copy that doesn't fit waits for in-flight copies
+        """
+        self.path = path
+        self.limit_bytes = limit_bytes
+        self.wait_seconds = wait_seconds
+
+        self._cond = threading.Condition()
+        self._reservations: Dict[int, SpaceReservation] = {}
+        self._usage: Optional[Callable[[], int]] = None
+        self._make_room: Optional[Callable[[int, Optional[int]], int]] = None
+        # Eviction requests (key, nbytes, priority) for the eviction thread
+        self._eviction_queue: deque = deque()
+        # Copies that asked for eviction: key -> 'pending' or 'done'
+        self._evictions: Dict[str, str] = {}
+        self._evictor: Optional[threading.Thread] = None
+        self._counters = {'admitted': 0, 'waited': 0, 'deferred': 0, 'eviction_requests': 0,
+                          'evicted_bytes': 0, 'rejected': 0}
+
+    def configure(self,
+                  limit_bytes: Optional[int] = None,
+                  usage: Optional[Callable[[], int]] = None,
+                  make_room: Optional[Callable[[int], int]] = None,
+                  wait_seconds: Optional[float] = None) -> None:
+        """
+        Set admission policy (None = leave unchanged).
+
+        Args:
+            limit_bytes: Most bytes the cache may hold (0 = no limit)
+            usage: Returns bytes currently held by cached files
+            make_room: make_room(nbytes, priority) evicts about nbytes of files
+                worth less than a copy of that priority (None = any evictable
+                file), returns bytes freed. Runs on the ledger's eviction thread.
+            wait_seconds: How long a copy that doesn't fit waits for in-flight copies
+        """
+        with self._cond:
+            if limit_bytes is not None:
+                self.limit_bytes = limit_bytes
+            if usage is not None:
+                self._usage = usage
+            if make_room is not None:
+                self._make_room = make_room
+            if wait_seconds is not None:
+                self.wait_seconds = wait_seconds
+            self._cond.notify_all()
+
+    def notify_freed(self) -> None:
+        """Wake waiting copies after cached files were removed."""
+        with self._cond:
+            self._cond.notify_all()
+
+    def free_bytes(self) -> int:
+        """Free space available to unprivileged writers."""
+        st = os.statvfs(self.path)
+        return st.f_bavail * st.f_frsize
+
+    def available_bytes(self) -> int:
+        """Bytes a new copy could reserve right now."""
+        with self._cond:
+            return -self._shortfall(0)
+
+    @contextmanager
+    def reserve(self,
+                key: str,
+                nbytes: int,
+                priority: Optional[int] = None,
+                defer: bool = False) -> Iterator[SpaceReservation]:
+        """Hold a reservation for the duration of a copy.
+
+        Blocks while waiting for eviction or in-flight copies; raises
+        OSError(ENOSPC) if the copy can't be admitted.
+
+        Args:
+            key: Destination of the copy
+            nbytes: Bytes the copy will add to the cache
+            priority: Priority of the incoming copy (TransferPriority), passed
+                to make_room so only files worth less are evicted for it
+            defer: Raise SpaceDeferred instead of waiting for the eviction
+                this copy asked for (retry later with the same key)
+
+        Usage:
+            with ledger.reserve(dest_path, size) as reservation:
+                copy(...)
+        """
+        reservation = self._admit(key, nbytes, priority, defer)
+        try:
+            yield reservation
+        finally:
+            if not reservation.held:
+                with self._cond:
+                    self._reservations.pop(id(reservation), None)
+                    self._cond.notify_all()
+
+    def hold(self, reservation: SpaceReservation, size: Optional[int] = None) -> None:
+        """Keep a reservation after its copy finishes, until release(key).
+
+        Call this inside the reserve() block once the copy has landed, so
+        the file stays counted until the usage callback includes it. The
+        caller must release(key) once it has recorded the file (or failed).
+
+        Args:
+            reservation: Reservation of the finished copy
+            size: Bytes the landed file occupies, if more than was reserved
+                (a resumed copy only reserved what its .part was missing)
+        """
+        with self._cond:
+            if size is not None and size > reservation.size:
+                reservation.size = size
+            reservation.written = reservation.size
+            reservation.held = True
+
+    def release(self, key: str) -> None:
+        """Drop held reservations for a key (no-op if there are none)."""
+        with self._cond:
+            for rid, reservation in list(self._reservations.items()):
+                if reservation.held and reservation.key == key:
+                    del self._reservations[rid]
+            self._cond.notify_all()
+
+    def reserved_bytes(self) -> int:
+        """Bytes reserved by in-flight copies but not written yet."""
+        with self._cond:
+            return sum(r.unwritten for r in self._reservations.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Reservation statistics for status reporting."""
+        with self._cond:
+            reservations = list(self._reservations.values())
+            try:
+                available = -self._shortfall(0)
+            except OSError:
+                available = None
+            return {
+                'limit_bytes': self.limit_bytes,
+                'reservations': len(reservations),
+                'held': sum(1 for r in reservations if r.held),
+                'reserved_bytes': sum(r.size for r in reservations),
+                'unwritten_bytes': sum(r.unwritten for r in reservations),
+                'available_bytes': available,
+                **self._counters,
+            }
+
+    def _admit(self, key: str, nbytes: int, priority: Optional[int], defer: bool) -> SpaceReservation:
+        reservation = SpaceReservation(key, nbytes)
+        deadline = None
+
+        with self._cond:
+            while True:
+                shortfall = self._shortfall(nbytes)
+                if shortfall <= 0:
+                    self._evictions.pop(key, None)
+                    self._reservations[id(reservation)] = reservation
+                    self._counters['admitted'] += 1
+                    return reservation
+
+                if self._make_room is not None and key not in self._evictions:
+                    self._request_eviction(key, nbytes, priority)
+                evicting = self._evictions.get(key) == 'pending'
+                if evicting and defer:
+                    self._counters['deferred'] += 1
+                    raise SpaceDeferred(
+                        errno.ENOSPC,
+                        f"Waiting for eviction: need {shortfall / MB:.0f} MB more",
+                        key,
+                    )
+
+                # Only eviction and in-flight copies can still change the
+                # picture: copies land within their reservation or fail and
+                # release it
+                if deadline is None:
+                    wait = max(self.wait_seconds, self.RECHECK_SECONDS) if evicting else self.wait_seconds
+                    deadline = time.monotonic() + wait
+                    if self._reservations and self.wait_seconds > 0:
+                        self._counters['waited'] += 1
+                        logger.info(f"Waiting for cache space: {os.path.basename(key)} "
+                                    f"needs {shortfall / MB:.0f} MB more")
+                remaining = deadline - time.monotonic()
+                if (not self._reservations and not evicting) or remaining <= 0:
+                    self._evictions.pop(key, None)
+                    self._counters['rejected'] += 1
+                    raise OSError(
+                        errno.ENOSPC,
+                        f"Not enough cache space: need {nbytes / MB:.0f} MB, "
+                        f"{max(0, nbytes - shortfall) / MB:.0f} MB available",
+                        key,
+                    )
+                self._cond.wait(min(remaining, self.RECHECK_SECONDS))
+
+    def _request_eviction(self, key: str, nbytes: int, priority: Optional[int]) -> None:
+        """Queue targeted eviction for a copy (caller holds the lock)."""
+        self._evictions[key] = 'pending'
+        self._eviction_queue.append((key, nbytes, priority))
+        if self._evictor is None:
+            self._evictor = threading.Thread(
+                target=self._eviction_loop,
+                name="cacherr-space-evict",
+                daemon=True
+            )
+            self._evictor.start()
+        self._cond.notify_all()
+
+    def _eviction_loop(self) -> None:
+        """Evict for queued requests, one at a time, whatever is still missing."""
+        while True:
+            with self._cond:
+                while not self._eviction_queue:
+                    self._cond.wait()
+                key, nbytes, priority = self._eviction_queue.popleft()
+                try:
+                    shortfall = self._shortfall(nbytes)  # Another copy may have made room
+                except OSError as e:
+                    logger.error(f"Could not check cache space: {e}")
+                    shortfall = 0
+
+            freed = 0
+            if shortfall > 0:
+                try:
+                    freed = self._make_room(shortfall, priority)
+                except Exception as e:
+                    logger.error(f"Eviction to make cache space failed: {e}")
+
+            with self._cond:
+                if shortfall > 0:
+                    self._counters['eviction_requests'] += 1
+                    self._counters['evicted_bytes'] += freed
+                if key in self._evictions:
+                    self._evictions[key] = 'done'
+                self._cond.notify_all()
+
+    def _shortfall(self, nbytes: int) -> int:
+        """Bytes missing to admit a copy of nbytes (<= 0 = it fits; caller holds the lock)."""
+        pending = sum(r.size for r in self._reservations.values() if not r.allocated)
+        shortfall = nbytes - (self.free_bytes() - pending)
+
+        if self.limit_bytes > 0 and self._usage is not None:
+            reserved = sum(r.size for r in self._reservations.values())
+            shortfall = max(shortfall, nbytes - (self.limit_bytes - self._usage() - reserved))
+        return shortfall
@@ -0,0 +1,268 @@
+"""
+Bandwidth throttling for Cacherr transfers.
+
+Copies call a throttle after every chunk they write. Each transfer
+direction (to cache, to array) has a global token bucket and one bucket
+per disk; a chunk waits until both allow it. Limits can be changed at
+runtime and take effect on the next chunk.
+
+Disks that someone is streaming from are additionally capped at the
+session backoff rate until playback on them stops.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, Optional, Any, Deque, Tuple, Iterable, Set
+
+
+logger = logging.getLogger(__name__)
+
+
+MB = 1_000_000
+
+TO_CACHE = "to_cache"
+TO_ARRAY = "to_array"
+DIRECTIONS = (TO_CACHE, TO_ARRAY)
+
+
+class TokenBucket:
+    """Thread-safe token bucket metering bytes per second.
+
+    A consumer that exceeds the available tokens takes them on credit and
+    sleeps off the debt, so concurrent callers share the rate fairly.
+    """
+
+    def __init__(self, rate: float = 0, burst_seconds: float = 1.0):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Allowed bytes per second (0 = unlimited)
+            burst_seconds: Seconds of traffic that may accumulate while idle
+        """
+        self._lock = threading.Lock()
+        self.burst_seconds = burst_seconds
+        self.rate = rate
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+
+    def set_rate(self, rate: float) -> None:
+        """Change the allowed rate (0 = unlimited)."""
+        with self._lock:
+            self.rate = rate
+            self._tokens = min(self._tokens, rate * self.burst_seconds)
+
+    def delay_for(self, nbytes: int) -> float:
+        """Take nbytes of tokens; returns how long the caller must wait."""
+        with self._lock:
+            if self.rate <= 0:
+                return 0.0
+            now = time.monotonic()
+            capacity = self.rate * self.burst_seconds
+            self._tokens = min(capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= nbytes
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class _RateMeter:
+    """Bytes per second over a sliding window."""
+
+    WINDOW_SECONDS = 10.0
+
+    def __init__(self):
+        self._samples: Deque[Tuple[float, int]] = deque()
+        self._window_bytes = 0
+
+    def add(self, nbytes: int, now: float) -> None:
+        self._samples.append((now, nbytes))
+        self._window_bytes += nbytes
+        self._expire(now)
+
+    def rate(self, now: float) -> float:
+        self._expire(now)
+        return self._window_bytes / self.WINDOW_SECONDS
+
+    def _expire(self, now: float) -> None:
+        while self._samples and self._samples[0][0] < now - self.WINDOW_SECONDS:
+            self._window_bytes -= self._samples.popleft()[1]
+
+
+class BandwidthLimiter:
+    """Global and per-disk bandwidth limits for both transfer directions."""
+
+    def __init__(self,
+                 to_cache_mb_s: float = 0,
+                 to_array_mb_s: float = 0,
+                 per_disk_to_cache_mb_s: float = 0,
+                 per_disk_to_array_mb_s: float = 0,
+                 session_backoff_mb_s: float = 0):
+        """
+        Initialize bandwidth limiter. All limits are MB/s, 0 = unlimited.
+
+        Args:
+            to_cache_mb_s: Total rate of copies to the cache
+            to_array_mb_s: Total rate of copies back to the array
+            per_disk_to_cache_mb_s: Rate of copies to the cache per source disk
+            per_disk_to_array_mb_s: Rate of copies to the array per target disk
+            session_backoff_mb_s: Rate per direction on disks with active streams
+        """
+        self._lock = threading.Lock()
+        self._limits: Dict[str, Dict[str, float]] = {}
+        self._global: Dict[str, TokenBucket] = {d: TokenBucket() for d in DIRECTIONS}
+        self._per_disk: Dict[Tuple[str, str], TokenBucket] = {}
+        self._session_backoff = 0.0
+        self._busy_disks: Set[str] = set()
+        self._busy_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._meters: Dict[str, _RateMeter] = {d: _RateMeter() for d in DIRECTIONS}
+        self._totals: Dict[str, Dict[str, float]] = {
+            d: {'bytes': 0, 'throttled_seconds': 0.0} for d in DIRECTIONS
+        }
+        self.set_limits(
+            to_cache_mb_s=to_cache_mb_s,
+            to_array_mb_s=to_array_mb_s,
+            per_disk_to_cache_mb_s=per_disk_to_cache_mb_s,
+            per_disk_to_array_mb_s=per_disk_to_array_mb_s,
+            session_backoff_mb_s=session_backoff_mb_s,
+        )
+
+    def set_limits(self,
+                   to_cache_mb_s: Optional[float] = None,
+                   to_array_mb_s: Optional[float] = None,
+                   per_disk_to_cache_mb_s: Optional[float] = None,
+                   per_disk_to_array_mb_s: Optional[float] = None,
+                   session_backoff_mb_s: Optional[float] = None) -> None:
+        """Change limits at runtime (None = leave unchanged)."""
+        changes = {
+            (TO_CACHE, 'global'): to_cache_mb_s,
+            (TO_ARRAY, 'global'): to_array_mb_s,
+            (TO_CACHE, 'per_disk'): per_disk_to_cache_mb_s,
+            (TO_ARRAY, 'per_disk'): per_disk_to_array_mb_s,
+        }
+        # Reject the whole change before applying any of it
+        for value in (*changes.values(), session_backoff_mb_s):
+            if value is not None and value < 0:
+                raise ValueError(f"Bandwidth limit must be >= 0: {value}")
+        
+        with self._lock:
+            for (direction, scope), value in changes.items():
+                if value is None:
+                    continue
+                self._limits.setdefault(direction, {})[scope] = float(value)
+                if scope == 'global':
+                    self._global[direction].set_rate(value * MB)
+                else:
+                    for (bucket_direction, _), bucket in self._per_disk.items():
+                        if bucket_direction == direction:
+                            bucket.set_rate(value * MB)
+            if session_backoff_mb_s is not None:
+                self._session_backoff = float(session_backoff_mb_s)
+                for bucket in self._busy_buckets.values():
+                    bucket.set_rate(self._session_backoff * MB)
+        logger.info(f"Bandwidth limits (MB/s, 0 = unlimited): {self.get_limits()}")
+
+    def get_limits(self) -> Dict[str, Dict[str, float]]:
+        """Current limits in MB/s."""
+        with self._lock:
+            limits: Dict[str, Any] = {direction: dict(values) for direction, values in self._limits.items()}
+            limits['session_backoff'] = self._session_backoff
+            return limits
+
+    def set_busy_disks(self, disks: Iterable[str]) -> None:
+        """Set the disks that currently have playback streams."""
+        busy = set(disks)
+        with self._lock:
+            if busy == self._busy_disks:
+                return
+            started = busy - self._busy_disks
+            stopped = self._busy_disks - busy
+            self._busy_disks = busy
+        if self._session_backoff > 0:
+            if started:
+                logger.info(f"Backing off transfers on streaming disks: {', '.join(sorted(started))}")
+            if stopped:
+                logger.info(f"Resuming full speed on disks: {', '.join(sorted(stopped))}")
+
+    def throttle(self, direction: str, disk: str, nbytes: int) -> float:
+        """Account for nbytes just transferred and wait as the limits require.
+
+        Returns the seconds spent waiting.
+        """
+        with self._lock:
+            bucket = self._per_disk.get((direction, disk))
+            if bucket is None:
+                bucket = self._per_disk[(direction, disk)] = TokenBucket(
+                    self._limits[direction]['per_disk'] * MB
+                )
+            global_bucket = self._global[direction]
+            busy_bucket = None
+            if disk in self._busy_disks and self._session_backoff > 0:
+                busy_bucket = self._busy_buckets.get((direction, disk))
+                if busy_bucket is None:
+                    busy_bucket = self._busy_buckets[(direction, disk)] = TokenBucket(
+                        self._session_backoff * MB
+                    )
+            self._meters[direction].add(nbytes, time.monotonic())
+            self._totals[direction]['bytes'] += nbytes
+
+        delay = max(global_bucket.delay_for(nbytes), bucket.delay_for(nbytes))
+        if busy_bucket is not None:
+            delay = max(delay, busy_bucket.delay_for(nbytes))
+        if delay > 0:
+            time.sleep(delay)
+            with self._lock:
+                self._totals[direction]['throttled_seconds'] += delay
+        return delay
+
+    def is_limited(self, direction: str, disk: str) -> bool:
+        """Whether any limit currently applies to transfers on a disk."""
+        with self._lock:
+            limits = self._limits[direction]
+            return (limits['global'] > 0 or limits['per_disk'] > 0
+                    or (self._session_backoff > 0 and disk in self._busy_disks))
+    
+    def for_transfer(self, direction: str, disk: str) -> "TransferThrottle":
+        """Throttle callback for one transfer, for CopyEngine.copy()."""
+        return TransferThrottle(self, direction, disk)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Allowed vs actual throughput per direction for status reporting."""
+        now = time.monotonic()
+        with self._lock:
+            stats: Dict[str, Any] = {
+                direction: {
+                    'limit_mb_s': self._limits[direction]['global'],
+                    'per_disk_limit_mb_s': self._limits[direction]['per_disk'],
+                    'actual_mb_s': round(self._meters[direction].rate(now) / MB, 1),
+                    'bytes': int(self._totals[direction]['bytes']),
+                    'throttled_seconds': round(self._totals[direction]['throttled_seconds'], 1),
+                }
+                for direction in DIRECTIONS
+            }
+            stats['session_backoff_mb_s'] = self._session_backoff
+            stats['busy_disks'] = sorted(self._busy_disks)
+            return stats
+
+
+class TransferThrottle:
+    """Throttle callback for one transfer (see BandwidthLimiter.for_transfer).
+
+    `limited` tells CopyEngine whether to copy in small chunks; unlimited
+    transfers keep full-size kernel copies but are still metered.
+    """
+
+    def __init__(self, limiter: BandwidthLimiter, direction: str, disk: str):
+        self.limiter = limiter
+        self.direction = direction
+        self.disk = disk
+
+    def __call__(self, nbytes: int) -> float:
+        return self.limiter.throttle(self.direction, self.disk, nbytes)
+
+    @property
+    def limited(self) -> bool:
+        return self.limiter.is_limited(self.direction, self.disk)
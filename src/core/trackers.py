@@ -9,18 +9,181 @@ Provides thread-safe tracking of:
 """
 
 import os
-import json
+import time
+import heapq
+import bisect
 import threading
 import logging
+from collections.abc import Mapping
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any, Set
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple, Any, Set, Iterator, Union, Callable
 from dataclasses import dataclass, field
 
+from .path_table import PathTable, path_table
+from ..db.store import TrackerStore, JsonTrackerStore
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
 
 logger = logging.getLogger(__name__)
 
 
+class CacheSource(str, Enum):
+    """Known reasons a file was cached."""
+    ACTIVE_WATCHING = "active_watching"
+    ONDECK = "ondeck"
+    CONTINUE_WATCHING = "continue_watching"
+    WATCHLIST = "watchlist"
+    TRAKT = "trakt"
+    MANUAL = "manual"
+    UNKNOWN = "unknown"
+
+
+_SOURCES_BY_VALUE = {s.value: s for s in CacheSource}
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """Parse an ISO timestamp (naive = UTC) to epoch seconds, None if invalid."""
+    if not isinstance(value, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class TimestampRecord(Mapping):
+    """Compact cache timestamp entry.
+    
+    Stores the cache time as epoch seconds and the source as a CacheSource
+    member, so retention and eviction loops never parse ISO strings. Reads
+    through the Mapping API see the original dict format (ISO `cached_at`,
+    string `source`), which is also what gets persisted.
+    """
+    __slots__ = ('cached_at', 'source', 'file_size_bytes', 'access_count', 'extra')
+    
+    def __init__(self,
+                 cached_at: Optional[float],
+                 source: Union[CacheSource, str] = CacheSource.UNKNOWN,
+                 file_size_bytes: int = 0,
+                 access_count: int = 0,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.cached_at = cached_at
+        self.source = _SOURCES_BY_VALUE.get(source, source)
+        self.file_size_bytes = file_size_bytes
+        self.access_count = access_count
+        self.extra = extra or None  # Any other keys, rarely present
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TimestampRecord":
+        extra = {k: v for k, v in data.items()
+                 if k not in ('cached_at', 'source', 'file_size_bytes', 'access_count')}
+        cached_at = parse_timestamp(data.get('cached_at'))
+        if cached_at is None and data.get('cached_at') is not None:
+            extra['cached_at'] = data['cached_at']  # Keep unparseable value as-is
+        return cls(
+            cached_at=cached_at,
+            source=data.get('source', 'unknown'),
+            file_size_bytes=data.get('file_size_bytes', 0),
+            access_count=data.get('access_count', 0),
+            extra=extra,
+        )
+    
+    def age_hours(self, now: Optional[float] = None) -> Optional[float]:
+        """Hours since the file was cached, None if the timestamp is invalid."""
+        if self.cached_at is None:
+            return None
+        return ((now if now is not None else time.time()) - self.cached_at) / 3600
+    
+    def _keys(self) -> List[str]:
+        keys = ['source', 'file_size_bytes']
+        if self.cached_at is not None:
+            keys.insert(0, 'cached_at')
+        if self.access_count:
+            keys.append('access_count')
+        if self.extra:
+            keys.extend(self.extra)
+        return keys
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == 'cached_at' and self.cached_at is not None:
+            return datetime.fromtimestamp(self.cached_at, timezone.utc).isoformat()
+        if key == 'source':
+            return self.source.value if isinstance(self.source, CacheSource) else self.source
+        if key == 'file_size_bytes':
+            return self.file_size_bytes
+        if key == 'access_count' and self.access_count:
+            return self.access_count
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+    
+    def __len__(self) -> int:
+        return len(self._keys())
+    
+    def copy(self) -> Dict[str, Any]:
+        """Plain dict copy, matching what dict-based entries returned."""
+        return dict(self)
+    
+    def __repr__(self) -> str:
+        return f"TimestampRecord({dict(self)!r})"
+
+
+def _entry_age_hours(entry: Mapping, now: float) -> Optional[float]:
+    """Age in hours of a tracker entry (record or dict), None if unknown."""
+    if isinstance(entry, TimestampRecord):
+        return entry.age_hours(now)
+    cached_at = parse_timestamp(entry.get('cached_at'))
+    if cached_at is None:
+        return None
+    return (now - cached_at) / 3600
+
+
+class _ReadyLock:
+    """Tracker lock that first waits until the tracker has loaded.
+    
+    Every tracker method takes the lock, so callers block only until their
+    own tracker is ready. The loading thread itself passes straight through.
+    """
+    
+    def __init__(self, ready: threading.Event):
+        self._lock = threading.RLock()
+        self._ready = ready
+        self.loader_ident: Optional[int] = None
+    
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if not self._ready.is_set() and threading.get_ident() != self.loader_ident:
+            if not blocking:
+                return False
+            if not self._ready.wait(None if timeout < 0 else timeout):
+                return False
+        return self._lock.acquire(blocking, timeout)
+    
+    def release(self) -> None:
+        self._lock.release()
+    
+    def __enter__(self) -> bool:
+        return self.acquire()
+    
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
 @dataclass
 class EpisodeInfo:
     """Episode information for TV shows."""
@@ -87,40 +250,210 @@ class TrackedFile:
 
 
 class BaseTracker:
-    """Base class for thread-safe JSON file trackers."""
+    """Base class for thread-safe trackers.
+    
+    Entries live in memory; persistence is delegated to a TrackerStore
+    (whole-file JSON by default, or row-level SQLite).
+    
+    With lazy=True the store is loaded on a background thread and every
+    method blocks until loading finishes. Subclasses must set up their own
+    state before calling BaseTracker.__init__.
+    """
+    
+    # Longest time changes may sit unpersisted inside a batch()
+    MAX_DIRTY_SECONDS = 5.0
+    
+    # Keys are interned here so all trackers share one string per path
+    paths: PathTable = path_table
     
-    def __init__(self, tracker_file: str, tracker_name: str = "tracker"):
+    def __init__(self, tracker_file: str, tracker_name: str = "tracker",
+                 store: Optional[TrackerStore] = None, lazy: bool = False):
         self.tracker_file = tracker_file
         self._tracker_name = tracker_name
-        self._lock = threading.RLock()
+        self._store = store or JsonTrackerStore(tracker_file, tracker_name)
+        self._ready = threading.Event()
+        self._lock = _ReadyLock(self._ready)
         self._data: Dict[str, Dict[str, Any]] = {}
-        self._load()
+        
+        # Secondary index for filename-only lookups: basename -> stored paths
+        self._by_name: Dict[str, List[str]] = {}
+        self.fuzzy_matches = 0  # get_entry() hits resolved by filename only
+        
+        # Callbacks notified with the paths of changed entries
+        self._listeners: List[Callable[[List[str]], None]] = []
+        
+        # Deferred persistence state (see batch())
+        self.max_dirty_seconds = self.MAX_DIRTY_SECONDS
+        self._batch_depth = 0
+        self._pending: Dict[str, None] = {}  # Ordered set of changed paths
+        self._pending_full = False
+        self._flush_timer: Optional[threading.Timer] = None
+        
+        # Seconds spent per load phase (read, index, post_load, total)
+        self.load_timings: Dict[str, float] = {}
+        
+        if lazy:
+            loader = threading.Thread(
+                target=self._load,
+                name=f"cacherr-{tracker_name}-loader",
+                daemon=True
+            )
+            loader.start()
+        else:
+            self._load()
     
     def _load(self) -> None:
-        """Load tracker data from file."""
+        """Load tracker data from the store, then mark the tracker ready."""
+        self._lock.loader_ident = threading.get_ident()
+        start = time.monotonic()
         try:
-            if os.path.exists(self.tracker_file):
-                with open(self.tracker_file, 'r', encoding='utf-8') as f:
-                    self._data = json.load(f)
-                self._post_load()
-                logger.debug(f"Loaded {len(self._data)} {self._tracker_name} entries")
-        except (json.JSONDecodeError, IOError) as e:
+            data = self._store.load()
+            self.load_timings['read'] = time.monotonic() - start
+            
+            phase = time.monotonic()
+            self._replace_data(data)
+            self.load_timings['index'] = time.monotonic() - phase
+            
+            phase = time.monotonic()
+            self._post_load()
+            self.load_timings['post_load'] = time.monotonic() - phase
+            logger.debug(f"Loaded {len(self._data)} {self._tracker_name} entries")
+        except Exception as e:
             logger.warning(f"Could not load {self._tracker_name} file: {e}")
-            self._data = {}
+            self._replace_data({})
+        finally:
+            self.load_timings['total'] = time.monotonic() - start
+            self._lock.loader_ident = None
+            self._ready.set()
+    
+    @property
+    def ready(self) -> bool:
+        """Whether the tracker has finished loading."""
+        return self._ready.is_set()
+    
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the tracker has loaded. Returns False on timeout."""
+        return self._ready.wait(timeout)
     
     def _post_load(self) -> None:
         """Hook for subclasses to process data after loading."""
         pass
     
+    def _set_entry(self, file_path: str, entry: Dict[str, Any]) -> None:
+        """Insert or replace an entry, keeping indexes in sync."""
+        if file_path not in self._data:
+            file_path = self.paths.intern(file_path)
+            self._by_name.setdefault(os.path.basename(file_path), []).append(file_path)
+        self._data[file_path] = entry
+    
+    def _delete_entry(self, file_path: str) -> None:
+        """Delete an entry, keeping indexes in sync."""
+        del self._data[file_path]
+        name = os.path.basename(file_path)
+        paths = self._by_name.get(name)
+        if paths:
+            paths.remove(file_path)
+            if not paths:
+                del self._by_name[name]
+        self.paths.release(file_path)
+    
+    def _replace_data(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """Replace all entries and rebuild indexes."""
+        old_paths = list(self._data)
+        for file_path in old_paths:
+            self.paths.release(file_path)
+        self._data = {}
+        self._by_name = {}
+        for file_path, entry in data.items():
+            self._set_entry(file_path, entry)
+        self._notify(list(dict.fromkeys(old_paths + list(self._data))))
+    
+    def add_listener(self, callback: Callable[[List[str]], None]) -> None:
+        """Register callback(paths) for entry changes.
+        
+        Called with the tracker lock held, so callbacks must not call back
+        into other trackers' locked methods. Registering doesn't wait for
+        loading; entries loaded afterwards are reported like any change.
+        """
+        self._listeners.append(callback)
+    
+    def _notify(self, file_paths: List[str]) -> None:
+        if not file_paths:
+            return
+        for callback in self._listeners:
+            try:
+                callback(file_paths)
+            except Exception as e:
+                logger.error(f"{self._tracker_name} listener error: {e}")
+    
     def _save(self) -> None:
-        """Save tracker data to file."""
+        """Persist all tracker data (used after bulk rewrites)."""
+        with self._lock:
+            self._pending_full = True
+            self._pending.clear()
+            self._schedule_flush()
+    
+    def _save_entries(self, *file_paths: str) -> None:
+        """Persist only the given entries (removed paths are deleted)."""
+        with self._lock:
+            if not self._pending_full:
+                for path in file_paths:
+                    self._pending[path] = None
+            self._schedule_flush()
+            # Every single-entry mutation ends here, including in-place updates
+            self._notify(list(file_paths))
+    
+    def _schedule_flush(self) -> None:
+        """Flush now, or within max_dirty_seconds when inside a batch."""
+        if self._batch_depth == 0:
+            self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.max_dirty_seconds, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def flush(self) -> None:
+        """Write all pending changes to the store."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            
+            if self._pending_full:
+                self._store.replace(self._data)
+            elif self._pending:
+                changes = {path: self._data.get(path) for path in self._pending}
+                self._store.apply(self._data, changes)
+            
+            self._pending_full = False
+            self._pending.clear()
+    
+    def close(self) -> None:
+        """Flush pending changes and release the store."""
+        self.flush()
+        self._store.close()
+    
+    @contextmanager
+    def batch(self) -> Iterator["BaseTracker"]:
+        """Defer persistence until the outermost batch exits.
+        
+        Pending changes are still flushed at least every max_dirty_seconds,
+        so a crash mid-batch loses only a few seconds of state.
+        
+        Usage:
+            with tracker.batch():
+                for path in paths:
+                    tracker.record(path)
+        """
+        with self._lock:
+            self._batch_depth += 1
         try:
-            # Ensure directory exists
-            Path(self.tracker_file).parent.mkdir(parents=True, exist_ok=True)
-            with open(self.tracker_file, 'w', encoding='utf-8') as f:
-                json.dump(self._data, f, indent=2)
-        except IOError as e:
-            logger.error(f"Could not save {self._tracker_name} file: {e}")
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.flush()
     
     def get_entry(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Get entry for a file path."""
@@ -128,30 +461,58 @@ class BaseTracker:
             if file_path in self._data:
                 return self._data[file_path].copy()
             # Try matching by filename only
-            filename = os.path.basename(file_path)
-            for stored_path, entry in self._data.items():
-                if os.path.basename(stored_path) == filename:
-                    return entry.copy()
+            paths = self._by_name.get(os.path.basename(file_path))
+            if paths:
+                self.fuzzy_matches += 1
+                return self._data[paths[0]].copy()
             return None
     
+    def get_paths_by_name(self, filename: str) -> List[str]:
+        """Get all stored paths with the given filename."""
+        with self._lock:
+            return list(self._by_name.get(filename, ()))
+    
     def remove_entry(self, file_path: str) -> bool:
         """Remove entry for a file path."""
         with self._lock:
             if file_path in self._data:
-                del self._data[file_path]
-                self._save()
+                self._delete_entry(file_path)
+                self._save_entries(file_path)
                 return True
             return False
     
-    def get_all_entries(self) -> Dict[str, Dict[str, Any]]:
-        """Get all entries."""
+    def get_all_entries(self) -> Mapping:
+        """Read-only view of all entries (no copy).
+        
+        The view is live: iterate it inside `with tracker.locked():` when
+        other threads may change the tracker, and take a list of what you
+        need before changing the tracker yourself.
+        """
+        with self._lock:
+            return MappingProxyType(self._data)
+    
+    @contextmanager
+    def locked(self) -> Iterator["BaseTracker"]:
+        """Hold the tracker lock, e.g. while iterating get_all_entries()."""
         with self._lock:
-            return self._data.copy()
+            yield self
     
     def count(self) -> int:
         """Get number of entries."""
         with self._lock:
             return len(self._data)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tracker statistics for status reporting (never waits for loading)."""
+        if not self.ready:
+            return {'ready': False, 'entries': 0, 'fuzzy_matches': 0}
+        with self._lock:
+            return {
+                'ready': True,
+                'entries': len(self._data),
+                'fuzzy_matches': self.fuzzy_matches,
+                'load_timings': {k: round(v, 3) for k, v in self.load_timings.items()},
+            }
 
 
 class CacheTimestampTracker(BaseTracker):
@@ -160,27 +521,56 @@ class CacheTimestampTracker(BaseTracker):
     Used for cache retention - files cached recently won't be moved back.
     """
     
-    def __init__(self, tracker_file: str):
-        super().__init__(tracker_file, "cache_timestamp")
+    def __init__(self, tracker_file: str, store: Optional[TrackerStore] = None,
+                 lazy: bool = False):
+        self._eviction_index = EvictionIndex()
+        self._total_bytes = 0  # Sum of file_size_bytes over all records
+        super().__init__(tracker_file, "cache_timestamp", store, lazy)
+    
+    def _set_entry(self, file_path: str, entry: Dict[str, Any]) -> None:
+        old = self._data.get(file_path)
+        super()._set_entry(file_path, entry)
+        if isinstance(old, TimestampRecord):
+            self._total_bytes -= old.file_size_bytes
+        if isinstance(entry, TimestampRecord):  # Raw entries are converted in _post_load
+            self._total_bytes += entry.file_size_bytes
+            self._eviction_index.update(self.paths.canonical(file_path), entry)
+    
+    def _delete_entry(self, file_path: str) -> None:
+        old = self._data.get(file_path)
+        super()._delete_entry(file_path)
+        if isinstance(old, TimestampRecord):
+            self._total_bytes -= old.file_size_bytes
+        self._eviction_index.remove(file_path)
+    
+    def _replace_data(self, data: Dict[str, Dict[str, Any]]) -> None:
+        self._eviction_index.clear()
+        self._total_bytes = 0
+        super()._replace_data(data)
+    
+    def total_size(self) -> int:
+        """Total size of all tracked cached files in bytes."""
+        with self._lock:
+            return self._total_bytes
     
     def _post_load(self) -> None:
-        """Migrate old format (plain string) to new format (dict)."""
+        """Convert entries to records, migrating old format (plain string)."""
         migrated = False
         new_data = {}
         
         for path, value in self._data.items():
             if isinstance(value, str):
                 # Old format: just a timestamp string
-                new_data[path] = {
+                new_data[path] = TimestampRecord.from_dict({
                     'cached_at': value,
                     'source': 'unknown'
-                }
+                })
                 migrated = True
             elif isinstance(value, dict):
-                new_data[path] = value
+                new_data[path] = TimestampRecord.from_dict(value)
         
+        self._replace_data(new_data)
         if migrated:
-            self._data = new_data
             self._save()
             logger.info("Migrated timestamp file to new format")
     
@@ -191,14 +581,19 @@ class CacheTimestampTracker(BaseTracker):
                 logger.debug(f"Timestamp already exists: {file_path}")
                 return
             
-            self._data[file_path] = {
-                'cached_at': datetime.now(timezone.utc).isoformat(),
-                'source': source,
-                'file_size_bytes': file_size,
-            }
-            self._save()
+            self._set_entry(file_path, TimestampRecord(time.time(), source, file_size))
+            self._save_entries(file_path)
             logger.debug(f"Recorded cache timestamp: {file_path} (source: {source})")
     
+    def get_record(self, file_path: str) -> Optional[TimestampRecord]:
+        """Get a copy of the record for exactly this path (no filename fallback)."""
+        with self._lock:
+            entry = self._data.get(file_path)
+            if entry is None:
+                return None
+            return TimestampRecord(entry.cached_at, entry.source, entry.file_size_bytes,
+                                   entry.access_count, dict(entry.extra) if entry.extra else None)
+    
     def is_within_retention(self, file_path: str, retention_hours: float) -> bool:
         """Check if file is still within retention period."""
         with self._lock:
@@ -206,23 +601,11 @@ class CacheTimestampTracker(BaseTracker):
             if not entry:
                 return False
             
-            try:
-                cached_at = entry.get('cached_at')
-                if isinstance(cached_at, str):
-                    cached_time = datetime.fromisoformat(cached_at.replace('Z', '+00:00'))
-                else:
-                    return False
-                
-                now = datetime.now(timezone.utc)
-                if cached_time.tzinfo is None:
-                    cached_time = cached_time.replace(tzinfo=timezone.utc)
-                
-                age_hours = (now - cached_time).total_seconds() / 3600
-                return age_hours < retention_hours
-                
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Invalid timestamp for {file_path}: {e}")
+            age_hours = entry.age_hours()
+            if age_hours is None:
+                logger.warning(f"Invalid timestamp for {file_path}")
                 return False
+            return age_hours < retention_hours
     
     def get_age_hours(self, file_path: str) -> float:
         """Get how many hours the file has been cached."""
@@ -231,17 +614,77 @@ class CacheTimestampTracker(BaseTracker):
             if not entry:
                 return -1
             
-            try:
-                cached_at = entry.get('cached_at')
-                if isinstance(cached_at, str):
-                    cached_time = datetime.fromisoformat(cached_at.replace('Z', '+00:00'))
-                    now = datetime.now(timezone.utc)
-                    if cached_time.tzinfo is None:
-                        cached_time = cached_time.replace(tzinfo=timezone.utc)
-                    return (now - cached_time).total_seconds() / 3600
-            except (ValueError, TypeError):
-                pass
-            return -1
+            age_hours = entry.age_hours()
+            return age_hours if age_hours is not None else -1
+    
+    def record_access(self, file_path: str) -> bool:
+        """Count a playback of a cached file (raises its eviction priority)."""
+        with self._lock:
+            entry = self._data.get(file_path)
+            if entry is None:
+                return False
+            entry.access_count += 1
+            self._eviction_index.update(file_path, entry)
+            self._save_entries(file_path)
+            return True
+    
+    def get_eviction_candidates(self,
+                                target_bytes: int,
+                                min_priority: int = 60,
+                                actively_playing_files: Optional[Set[str]] = None,
+                                protected_hours: float = 2.0,
+                                strategy: str = "priority",
+                                context: Optional[Dict[str, Mapping]] = None,
+                                number_episodes_setting: int = 5) -> List[Tuple[str, int, int]]:
+        """Get files to evict to free target_bytes, using the eviction index.
+        
+        Same contract as CachePriorityScorer.get_eviction_candidates, but
+        only visits the lowest-priority files instead of scoring all of them
+        (size_aware needs every eligible file, so it visits all below
+        min_priority).
+        
+        context maps paths to extra entry keys from other trackers (e.g.
+        OnDeckTracker.get_scoring_context()). Those files are scored with
+        the extra keys and merged into the index order.
+        """
+        if actively_playing_files is None:
+            actively_playing_files = set()
+        
+        candidates = []
+        freed = 0
+        with self._lock:
+            now = time.time()
+            for path, priority, size, age_hours in self._iter_candidates(
+                    context or {}, number_episodes_setting, now):
+                if priority >= min_priority:
+                    break
+                if strategy == "priority" and freed >= target_bytes:
+                    break
+                if path in actively_playing_files:
+                    continue
+                if age_hours is not None and age_hours < protected_hours:
+                    continue
+                candidates.append((path, priority, size))
+                freed += size
+        
+        return CachePriorityScorer.select_victims(candidates, target_bytes, strategy)
+    
+    def _iter_candidates(self,
+                         context: Dict[str, Mapping],
+                         number_episodes_setting: int,
+                         now: float) -> Iterator[Tuple[str, int, int, Optional[float]]]:
+        """Index order, with files that have context re-scored (caller holds the lock)."""
+        overlaid = {path: {**self._data[path], **extra}
+                    for path, extra in context.items() if path in self._data}
+        rescored = []
+        for path, priority in CachePriorityScorer.score_entries(
+                overlaid, number_episodes_setting=number_episodes_setting, now=now):
+            entry = self._data[path]
+            rescored.append((path, priority, entry.file_size_bytes, entry.age_hours(now)))
+        rescored.sort(key=lambda c: c[1])
+        
+        indexed = (c for c in self._eviction_index.iter_candidates(now) if c[0] not in context)
+        return heapq.merge(indexed, rescored, key=lambda c: c[1])
     
     def get_source(self, file_path: str) -> str:
         """Get the source (ondeck/watchlist/etc) for a cached file."""
@@ -255,9 +698,9 @@ class CacheTimestampTracker(BaseTracker):
         with self._lock:
             missing = [p for p in self._data if not os.path.exists(p)]
             for path in missing:
-                del self._data[path]
+                self._delete_entry(path)
             if missing:
-                self._save()
+                self._save_entries(*missing)
                 logger.info(f"Cleaned up {len(missing)} stale timestamp entries")
             return len(missing)
 
@@ -268,8 +711,9 @@ class WatchlistTracker(BaseTracker):
     Used for watchlist retention - files auto-expire X days after being added.
     """
     
-    def __init__(self, tracker_file: str):
-        super().__init__(tracker_file, "watchlist")
+    def __init__(self, tracker_file: str, store: Optional[TrackerStore] = None,
+                 lazy: bool = False):
+        super().__init__(tracker_file, "watchlist", store, lazy)
     
     def update_entry(self, file_path: str, username: str, 
                      watchlisted_at: Optional[datetime] = None) -> None:
@@ -299,13 +743,13 @@ class WatchlistTracker(BaseTracker):
                     else:
                         entry['watchlisted_at'] = watchlisted_at.isoformat()
             else:
-                self._data[file_path] = {
+                self._set_entry(file_path, {
                     'watchlisted_at': (watchlisted_at or now).isoformat(),
                     'users': [username],
                     'last_seen': now.isoformat(),
-                }
+                })
             
-            self._save()
+            self._save_entries(file_path)
     
     def get_user_count(self, file_path: str) -> int:
         """Get number of users with this file on their watchlist."""
@@ -354,10 +798,10 @@ class WatchlistTracker(BaseTracker):
                     stale.append(path)
             
             for path in stale:
-                del self._data[path]
+                self._delete_entry(path)
             
             if stale:
-                self._save()
+                self._save_entries(*stale)
                 logger.info(f"Cleaned up {len(stale)} stale watchlist entries")
             
             return len(stale)
@@ -369,8 +813,60 @@ class OnDeckTracker(BaseTracker):
     OnDeck status is ephemeral - cleared at start of each run.
     """
     
-    def __init__(self, tracker_file: str):
-        super().__init__(tracker_file, "ondeck")
+    def __init__(self, tracker_file: str, store: Optional[TrackerStore] = None,
+                 lazy: bool = False):
+        # Per-show position index: show (lowercase) -> sorted (season, episode, path)
+        self._show_positions: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._show_current: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._indexed: Dict[str, Tuple[str, int, int, bool]] = {}  # path -> indexed key
+        super().__init__(tracker_file, "ondeck", store, lazy)
+    
+    def _set_entry(self, file_path: str, entry: Dict[str, Any]) -> None:
+        super()._set_entry(file_path, entry)
+        self._index_episode(file_path)
+    
+    def _delete_entry(self, file_path: str) -> None:
+        super()._delete_entry(file_path)
+        self._unindex_episode(file_path)
+    
+    def _replace_data(self, data: Dict[str, Dict[str, Any]]) -> None:
+        self._show_positions = {}
+        self._show_current = {}
+        self._indexed = {}
+        super()._replace_data(data)
+    
+    def _index_episode(self, file_path: str) -> None:
+        """(Re)index a path's episode position after its entry changed."""
+        ep_info = self._data[file_path].get('episode_info')
+        key = None
+        if ep_info and ep_info.get('season') is not None and ep_info.get('episode') is not None:
+            key = (ep_info.get('show', '').lower(), ep_info['season'], ep_info['episode'],
+                   bool(ep_info.get('is_current_ondeck')))
+        if self._indexed.get(file_path) == key:
+            return
+        
+        self._unindex_episode(file_path)
+        if key is None:
+            return
+        file_path = self.paths.canonical(file_path)
+        show, season, episode, is_current = key
+        bisect.insort(self._show_positions.setdefault(show, []), (season, episode, file_path))
+        if is_current:
+            bisect.insort(self._show_current.setdefault(show, []), (season, episode, file_path))
+        self._indexed[file_path] = key
+    
+    def _unindex_episode(self, file_path: str) -> None:
+        key = self._indexed.pop(file_path, None)
+        if key is None:
+            return
+        show, season, episode, is_current = key
+        indexes = (self._show_positions, self._show_current) if is_current else (self._show_positions,)
+        for index in indexes:
+            positions = index[show]
+            i = bisect.bisect_left(positions, (season, episode, file_path))
+            del positions[i]
+            if not positions:
+                del index[show]
     
     def update_entry(self, file_path: str, username: str,
                      episode_info: Optional[EpisodeInfo] = None,
@@ -385,10 +881,10 @@ class OnDeckTracker(BaseTracker):
                     entry.setdefault('users', []).append(username)
                 entry['last_seen'] = now.isoformat()
             else:
-                self._data[file_path] = {
+                self._set_entry(file_path, {
                     'users': [username],
                     'last_seen': now.isoformat(),
-                }
+                })
             
             if episode_info:
                 self._data[file_path]['episode_info'] = {
@@ -397,8 +893,9 @@ class OnDeckTracker(BaseTracker):
                     'episode': episode_info.episode,
                     'is_current_ondeck': is_current_ondeck,
                 }
+                self._index_episode(file_path)
             
-            self._save()
+            self._save_entries(file_path)
     
     def get_user_count(self, file_path: str) -> int:
         """Get number of users with this file on their OnDeck."""
@@ -426,32 +923,59 @@ class OnDeckTracker(BaseTracker):
         Returns list of (season, episode) tuples.
         """
         with self._lock:
-            positions = []
-            show_lower = show_name.lower()
-            
-            for path, entry in self._data.items():
-                ep_info = entry.get('episode_info')
-                if ep_info and ep_info.get('is_current_ondeck'):
-                    if ep_info.get('show', '').lower() == show_lower:
-                        season = ep_info.get('season')
-                        episode = ep_info.get('episode')
-                        if season is not None and episode is not None:
-                            positions.append((season, episode))
-            
-            return positions
+            return [(season, episode)
+                    for season, episode, _ in self._show_current.get(show_name.lower(), ())]
     
     def get_earliest_ondeck(self, show_name: str) -> Optional[Tuple[int, int]]:
         """Get earliest OnDeck position for a show (for eviction calculations)."""
-        positions = self.get_ondeck_positions(show_name)
-        if positions:
-            positions.sort()
-            return positions[0]
-        return None
+        with self._lock:
+            positions = self._show_current.get(show_name.lower())
+            if positions:
+                return positions[0][:2]
+            return None
+    
+    def get_episodes_ahead(self, show_name: str, season: int, episode: int) -> int:
+        """Count tracked episodes of a show after its earliest OnDeck position, up to this one.
+        
+        Returns 0 if the show has no OnDeck position or the episode is not past it.
+        """
+        with self._lock:
+            show = show_name.lower()
+            current = self._show_current.get(show)
+            if not current:
+                return 0
+            earliest = current[0][:2]
+            if (season, episode) <= earliest:
+                return 0
+            positions = self._show_positions[show]
+            # Positions in (earliest, (season, episode)] - chr(0x10FFFF) sorts after any path
+            start = bisect.bisect_left(positions, (earliest[0], earliest[1], chr(0x10FFFF)))
+            end = bisect.bisect_right(positions, (season, episode, chr(0x10FFFF)))
+            return max(0, end - start)
+    
+    def get_scoring_context(self) -> Dict[str, Dict[str, Any]]:
+        """Episode position of every tracked episode, as eviction scoring reads it.
+        
+        Returns {path: {'episode_info': {..., 'episodes_ahead': n}}}, for
+        CacheTimestampTracker.get_eviction_candidates(context=...).
+        """
+        with self._lock:
+            context = {}
+            for path, (show, season, episode, is_current) in self._indexed.items():
+                ep_info = self._data[path]['episode_info']
+                context[path] = {'episode_info': {
+                    'show': ep_info.get('show', ''),
+                    'season': season,
+                    'episode': episode,
+                    'is_current_ondeck': is_current,
+                    'episodes_ahead': 0 if is_current else self.get_episodes_ahead(show, season, episode),
+                }}
+            return context
     
     def clear_for_run(self) -> None:
         """Clear all entries at start of a run (OnDeck is ephemeral)."""
         with self._lock:
-            self._data = {}
+            self._replace_data({})
             self._save()
             logger.debug("Cleared OnDeck tracker for new run")
     
@@ -477,10 +1001,10 @@ class OnDeckTracker(BaseTracker):
                     stale.append(path)
             
             for path in stale:
-                del self._data[path]
+                self._delete_entry(path)
             
             if stale:
-                self._save()
+                self._save_entries(*stale)
                 logger.debug(f"Cleaned up {len(stale)} stale OnDeck entries")
             
             return len(stale)
@@ -509,17 +1033,81 @@ class CachePriorityScorer:
         'unknown': 0,
     }
     
+    # Recency tiers: < 2h, < 6h, < 24h, < 72h, <= 1 week, > 1 week
+    RECENCY_TIER_HOURS = (2, 6, 24, 72, 168)
+    RECENCY_BONUS = (20, 15, 10, 5, 0, -10)
+    
+    @classmethod
+    def recency_tier(cls, hours: float) -> int:
+        """Index into RECENCY_BONUS for a file cached `hours` ago."""
+        if hours < 2:
+            return 0
+        elif hours < 6:
+            return 1
+        elif hours < 24:
+            return 2
+        elif hours < 72:
+            return 3
+        elif hours > 168:  # > 1 week
+            return 5
+        return 4
+    
+    # Source codes for columnar scoring (index into this tuple)
+    SOURCE_CODES = tuple(SOURCE_SCORES)
+    
+    @classmethod
+    def base_score(cls, entry: Mapping, number_episodes_setting: int = 5) -> int:
+        """Time-independent part of the score (everything except recency), unclamped."""
+        ep_info = entry.get('episode_info') or {}
+        return cls._base_from_parts(
+            cls.SOURCE_SCORES.get(entry.get('source', 'unknown'), 0),
+            len(entry.get('users', [])),
+            bool(ep_info.get('is_current_ondeck', False)),
+            ep_info.get('episodes_ahead', 0),
+            entry.get('access_count', 0),
+            number_episodes_setting,
+        )
+    
+    @staticmethod
+    def _base_from_parts(source_score: int,
+                         user_count: int,
+                         is_current_ondeck: bool,
+                         episodes_ahead: int,
+                         access_count: int,
+                         number_episodes_setting: int) -> int:
+        score = 50  # Base score
+        
+        # Source bonus
+        score += source_score
+        
+        # User count bonus (+5 per user, max +15)
+        score += min(user_count * 5, 15)
+        
+        # Episode position bonus
+        if is_current_ondeck:
+            score += 15
+        elif 0 < episodes_ahead <= max(1, number_episodes_setting // 2):
+            # Future episodes get smaller bonus
+            score += 10
+        
+        # Access count bonus
+        score += min(access_count * 2, 10)
+        
+        return score
+    
     @classmethod
     def calculate(cls, 
-                  entry: Dict[str, Any],
+                  entry: Mapping,
                   actively_playing: bool = False,
-                  number_episodes_setting: int = 5) -> int:
+                  number_episodes_setting: int = 5,
+                  now: Optional[float] = None) -> int:
         """Calculate priority score for a cached file.
         
         Args:
-            entry: Tracker entry dict
+            entry: Tracker entry (dict or TimestampRecord)
             actively_playing: Whether file is currently being played
             number_episodes_setting: NUMBER_EPISODES config setting
+            now: Epoch seconds to score against (default: current time)
             
         Returns:
             Priority score 0-100
@@ -527,107 +1115,211 @@ class CachePriorityScorer:
         if actively_playing:
             return 100  # Never evict playing files
         
-        score = 50  # Base score
+        score = cls.base_score(entry, number_episodes_setting)
         
-        # Source bonus
-        source = entry.get('source', 'unknown')
-        score += cls.SOURCE_SCORES.get(source, 0)
+        # Recency bonus/penalty
+        hours = _entry_age_hours(entry, now if now is not None else time.time())
+        if hours is not None:
+            score += cls.RECENCY_BONUS[cls.recency_tier(hours)]
         
-        # User count bonus (+5 per user, max +15)
-        user_count = len(entry.get('users', []))
-        score += min(user_count * 5, 15)
+        return max(0, min(100, score))
+    
+    @classmethod
+    def to_columns(cls,
+                   entries: Dict[str, Mapping],
+                   now: Optional[float] = None) -> Dict[str, list]:
+        """Split entries into the columns calculate_batch() takes.
         
-        # Recency bonus/penalty
-        cached_at = entry.get('cached_at')
-        if cached_at:
-            try:
-                dt = datetime.fromisoformat(cached_at.replace('Z', '+00:00'))
-                now = datetime.now(timezone.utc)
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                hours = (now - dt).total_seconds() / 3600
-                
-                if hours < 2:
-                    score += 20
-                elif hours < 6:
-                    score += 15
-                elif hours < 24:
-                    score += 10
-                elif hours < 72:
-                    score += 5
-                elif hours > 168:  # > 1 week
-                    score -= 10
-                elif hours > 336:  # > 2 weeks
-                    score -= 20
-            except (ValueError, TypeError):
-                pass
+        Ages are in hours (NaN when the cache time is unknown).
+        """
+        now = now if now is not None else time.time()
+        unknown = cls.SOURCE_CODES.index('unknown')
+        codes = {source: i for i, source in enumerate(cls.SOURCE_CODES)}
+        columns = {
+            'paths': [], 'age_hours': [], 'source_codes': [], 'user_counts': [],
+            'access_counts': [], 'is_current_ondeck': [], 'episodes_ahead': [],
+        }
         
-        # Episode position bonus
-        ep_info = entry.get('episode_info')
-        if ep_info:
-            is_current = ep_info.get('is_current_ondeck', False)
-            if is_current:
-                score += 15
-            else:
-                # Future episodes get smaller bonus
-                episode_ahead = ep_info.get('episodes_ahead', 0)
-                if 0 < episode_ahead <= max(1, number_episodes_setting // 2):
-                    score += 10
+        for path, entry in entries.items():
+            hours = _entry_age_hours(entry, now)
+            ep_info = entry.get('episode_info') or {}
+            columns['paths'].append(path)
+            columns['age_hours'].append(float('nan') if hours is None else hours)
+            columns['source_codes'].append(codes.get(entry.get('source', 'unknown'), unknown))
+            columns['user_counts'].append(len(entry.get('users', [])))
+            columns['access_counts'].append(entry.get('access_count', 0))
+            columns['is_current_ondeck'].append(bool(ep_info.get('is_current_ondeck', False)))
+            columns['episodes_ahead'].append(ep_info.get('episodes_ahead', 0))
         
-        # Access count bonus
-        access_count = entry.get('access_count', 0)
-        score += min(access_count * 2, 10)
+        return columns
+    
+    @classmethod
+    def calculate_batch(cls,
+                        age_hours: Any,
+                        source_codes: Any,
+                        user_counts: Any,
+                        access_counts: Any,
+                        is_current_ondeck: Any,
+                        episodes_ahead: Any,
+                        actively_playing: Any = None,
+                        number_episodes_setting: int = 5) -> Any:
+        """Score many files at once from columnar inputs.
         
-        return max(0, min(100, score))
+        Produces exactly what calculate() returns for each row. Uses NumPy
+        when available (returns an int64 array), otherwise falls back to the
+        scalar scoring path (returns a list).
+        
+        Args:
+            age_hours: Hours since caching per file (NaN = unknown)
+            source_codes: Index into SOURCE_CODES per file
+            user_counts: Number of users per file
+            access_counts: Access count per file
+            is_current_ondeck: Whether the file is a current OnDeck episode
+            episodes_ahead: Episodes ahead of the OnDeck position (0 = n/a)
+            actively_playing: Optional per-file playing flags
+            number_episodes_setting: NUMBER_EPISODES config setting
+        """
+        if not NUMPY_AVAILABLE:
+            return cls._calculate_batch_scalar(
+                age_hours, source_codes, user_counts, access_counts,
+                is_current_ondeck, episodes_ahead, actively_playing,
+                number_episodes_setting,
+            )
+        
+        ages = np.asarray(age_hours, dtype=np.float64)
+        source_scores = np.array([cls.SOURCE_SCORES[s] for s in cls.SOURCE_CODES], dtype=np.int64)
+        ahead = np.asarray(episodes_ahead, dtype=np.int64)
+        
+        score = np.full(ages.shape, 50, dtype=np.int64)
+        score += source_scores[np.asarray(source_codes, dtype=np.intp)]
+        score += np.minimum(np.asarray(user_counts, dtype=np.int64) * 5, 15)
+        
+        # Recency tiers; 72h-1 week is the default (NaN compares False -> no bonus)
+        bonus = cls.RECENCY_BONUS
+        score += np.select(
+            [ages < 2, ages < 6, ages < 24, ages < 72, ages > 168],
+            [bonus[0], bonus[1], bonus[2], bonus[3], bonus[5]],
+            default=bonus[4],
+        )
+        
+        next_episode = (ahead > 0) & (ahead <= max(1, number_episodes_setting // 2))
+        score += np.where(np.asarray(is_current_ondeck, dtype=bool), 15,
+                          np.where(next_episode, 10, 0))
+        score += np.minimum(np.asarray(access_counts, dtype=np.int64) * 2, 10)
+        
+        score = np.clip(score, 0, 100)
+        if actively_playing is not None:
+            score = np.where(np.asarray(actively_playing, dtype=bool), 100, score)
+        return score
+    
+    @classmethod
+    def score_entries(cls,
+                      entries: Dict[str, Mapping],
+                      actively_playing_files: Optional[Set[str]] = None,
+                      number_episodes_setting: int = 5,
+                      now: Optional[float] = None) -> List[Tuple[str, int]]:
+        """calculate() for every entry in one calculate_batch() call.
+        
+        Returns (path, priority) in entry order.
+        """
+        columns = cls.to_columns(entries, now)
+        playing = None
+        if actively_playing_files:
+            playing = [path in actively_playing_files for path in columns['paths']]
+        scores = cls.calculate_batch(
+            columns['age_hours'], columns['source_codes'], columns['user_counts'],
+            columns['access_counts'], columns['is_current_ondeck'], columns['episodes_ahead'],
+            actively_playing=playing,
+            number_episodes_setting=number_episodes_setting,
+        )
+        return [(path, int(score)) for path, score in zip(columns['paths'], scores)]
+    
+    @classmethod
+    def _calculate_batch_scalar(cls, age_hours, source_codes, user_counts, access_counts,
+                                is_current_ondeck, episodes_ahead, actively_playing,
+                                number_episodes_setting) -> List[int]:
+        scores = []
+        for i, hours in enumerate(age_hours):
+            if actively_playing is not None and actively_playing[i]:
+                scores.append(100)
+                continue
+            score = cls._base_from_parts(
+                cls.SOURCE_SCORES[cls.SOURCE_CODES[source_codes[i]]],
+                user_counts[i],
+                is_current_ondeck[i],
+                episodes_ahead[i],
+                access_counts[i],
+                number_episodes_setting,
+            )
+            if hours == hours:  # Not NaN
+                score += cls.RECENCY_BONUS[cls.recency_tier(hours)]
+            scores.append(max(0, min(100, score)))
+        return scores
     
     @classmethod
     def get_eviction_candidates(cls,
-                                entries: Dict[str, Dict[str, Any]],
+                                entries: Dict[str, Mapping],
                                 target_bytes: int,
                                 min_priority: int = 60,
                                 actively_playing_files: Optional[Set[str]] = None,
-                                protected_hours: float = 2.0) -> List[Tuple[str, int, int]]:
+                                protected_hours: float = 2.0,
+                                strategy: str = "priority",
+                                now: Optional[float] = None) -> List[Tuple[str, int, int]]:
         """Get files to evict to free target_bytes.
         
         Returns list of (path, priority, size_bytes) sorted by priority ascending.
         Only returns files with priority < min_priority.
+        See select_victims() for strategies.
         """
         if actively_playing_files is None:
             actively_playing_files = set()
         
         candidates = []
-        now = datetime.now(timezone.utc)
+        now = now if now is not None else time.time()
         
+        eligible = {}
         for path, entry in entries.items():
             # Skip actively playing
             if path in actively_playing_files:
                 continue
             
             # Skip recently cached (protected period)
-            cached_at = entry.get('cached_at')
-            if cached_at:
-                try:
-                    dt = datetime.fromisoformat(cached_at.replace('Z', '+00:00'))
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=timezone.utc)
-                    hours = (now - dt).total_seconds() / 3600
-                    if hours < protected_hours:
-                        continue
-                except (ValueError, TypeError):
-                    pass
-            
-            # Calculate priority
-            is_playing = path in actively_playing_files
-            priority = cls.calculate(entry, actively_playing=is_playing)
-            
-            # Only consider files below min_priority
+            hours = _entry_age_hours(entry, now)
+            if hours is not None and hours < protected_hours:
+                continue
+            eligible[path] = entry
+        
+        # Score everything left in one pass, keep files below min_priority
+        for path, priority in cls.score_entries(eligible, now=now):
             if priority < min_priority:
-                size = entry.get('file_size_bytes', 0)
-                candidates.append((path, priority, size))
+                candidates.append((path, priority, entries[path].get('file_size_bytes', 0)))
         
         # Sort by priority ascending (lowest first)
         candidates.sort(key=lambda x: x[1])
         
+        return cls.select_victims(candidates, target_bytes, strategy)
+    
+    @classmethod
+    def select_victims(cls,
+                       candidates: List[Tuple[str, int, int]],
+                       target_bytes: int,
+                       strategy: str = "priority") -> List[Tuple[str, int, int]]:
+        """Pick which eligible files to evict.
+        
+        Args:
+            candidates: (path, priority, size) sorted by priority ascending
+            target_bytes: Bytes that need to be freed
+            strategy: "priority" takes lowest priority first until the target
+                is met; "size_aware" minimizes the total priority lost for the
+                bytes freed (a 60 GB low-value remux beats twenty episodes)
+        
+        Returns:
+            Selected (path, priority, size) sorted by priority ascending
+        """
+        if strategy == "size_aware":
+            selected = cls._select_size_aware(candidates, target_bytes)
+            return sorted(selected, key=lambda x: x[1])
+        
         # Select enough to meet target
         selected = []
         freed = 0
@@ -638,3 +1330,159 @@ class CachePriorityScorer:
             freed += size
         
         return selected
+    
+    @staticmethod
+    def _select_size_aware(candidates: List[Tuple[str, int, int]],
+                           target_bytes: int) -> List[Tuple[str, int, int]]:
+        """Approximate min-cost cover: free target_bytes losing least priority.
+        
+        Each eviction costs priority + 1, so zero-priority files aren't free
+        and fewer evictions win ties. Takes the better of greedy-by-density
+        (cost per byte) and the cheapest single file that covers the target,
+        then drops files the selection doesn't need.
+        """
+        if target_bytes <= 0:
+            return []
+        
+        sized = [c for c in candidates if c[2] > 0]
+        if sum(c[2] for c in sized) <= target_bytes:
+            return sized  # Can't reach the target - evict everything eligible
+        
+        def cost(item: Tuple[str, int, int]) -> int:
+            return item[1] + 1
+        
+        # Greedy by cost density
+        greedy = []
+        freed = 0
+        for item in sorted(sized, key=lambda c: cost(c) / c[2]):
+            if freed >= target_bytes:
+                break
+            greedy.append(item)
+            freed += item[2]
+        
+        # Drop the most expensive files that are no longer needed
+        for item in sorted(greedy, key=cost, reverse=True):
+            if freed - item[2] >= target_bytes:
+                greedy.remove(item)
+                freed -= item[2]
+        
+        # Cheapest single file that frees enough on its own
+        covering = [c for c in sized if c[2] >= target_bytes]
+        if covering:
+            single = min(covering, key=lambda c: (cost(c), c[2]))
+            if cost(single) <= sum(cost(c) for c in greedy):
+                return [single]
+        
+        return greedy
+
+
+class EvictionIndex:
+    """Incrementally maintained eviction order for tracked files.
+    
+    A file's score is base_score + recency bonus, and the recency bonus only
+    changes when the file crosses one of the 2/6/24/72/168 hour tier
+    boundaries. Files are therefore bucketed by (base_score, tier). Each
+    tier keeps a min-heap of cache times so files that aged into the next
+    tier are moved lazily on the next query, and victims are read bucket by
+    bucket in ascending score order without rescoring every file.
+    
+    Not thread-safe on its own; the owning tracker's lock guards it.
+    """
+    
+    NO_TIMESTAMP = -1  # Tier for entries without a valid cache time
+    
+    def __init__(self):
+        # path -> (base score, tier, cached_at, size)
+        self._entries: Dict[str, Tuple[int, int, Optional[float], int]] = {}
+        # (base score, tier) -> ordered set of paths
+        self._buckets: Dict[Tuple[int, int], Dict[str, None]] = {}
+        # tier -> heap of (cached_at, path); may hold stale items
+        self._aging: List[List[Tuple[float, str]]] = [
+            [] for _ in CachePriorityScorer.RECENCY_BONUS
+        ]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def update(self, path: str, entry: Mapping, now: Optional[float] = None) -> None:
+        """Add or re-score a file."""
+        if path in self._entries:
+            self.remove(path)
+        
+        if isinstance(entry, TimestampRecord):
+            cached_at = entry.cached_at
+        else:
+            cached_at = parse_timestamp(entry.get('cached_at'))
+        
+        if cached_at is None:
+            tier = self.NO_TIMESTAMP
+        else:
+            now = now if now is not None else time.time()
+            tier = CachePriorityScorer.recency_tier((now - cached_at) / 3600)
+        
+        base = CachePriorityScorer.base_score(entry)
+        self._insert(path, base, tier, cached_at, entry.get('file_size_bytes', 0))
+    
+    def remove(self, path: str) -> None:
+        """Forget a file (its aging heap item is dropped lazily)."""
+        item = self._entries.pop(path, None)
+        if item is None:
+            return
+        key = (item[0], item[1])
+        bucket = self._buckets[key]
+        del bucket[path]
+        if not bucket:
+            del self._buckets[key]
+    
+    def clear(self) -> None:
+        """Forget all files."""
+        self._entries.clear()
+        self._buckets.clear()
+        for heap in self._aging:
+            heap.clear()
+    
+    def iter_candidates(self,
+                        now: Optional[float] = None) -> Iterator[Tuple[str, int, int, Optional[float]]]:
+        """Yield (path, priority, size, age_hours) in ascending priority order."""
+        now = now if now is not None else time.time()
+        self._advance(now)
+        
+        def priority(key: Tuple[int, int]) -> int:
+            base, tier = key
+            bonus = 0 if tier == self.NO_TIMESTAMP else CachePriorityScorer.RECENCY_BONUS[tier]
+            return max(0, min(100, base + bonus))
+        
+        # Equal scores: older tiers first
+        for key in sorted(self._buckets, key=lambda k: (priority(k), -k[1])):
+            score = priority(key)
+            for path in list(self._buckets.get(key, ())):
+                _, _, cached_at, size = self._entries[path]
+                age = None if cached_at is None else (now - cached_at) / 3600
+                yield path, score, size, age
+    
+    def _insert(self, path: str, base: int, tier: int,
+                cached_at: Optional[float], size: int) -> None:
+        self._entries[path] = (base, tier, cached_at, size)
+        self._buckets.setdefault((base, tier), {})[path] = None
+        # Files in the last tier never move again, so they need no aging item
+        if tier != self.NO_TIMESTAMP and tier < len(self._aging) - 1:
+            heapq.heappush(self._aging[tier], (cached_at, path))
+    
+    def _advance(self, now: float) -> None:
+        """Move files that crossed a tier boundary since the last query."""
+        last_tier = len(self._aging) - 1
+        for tier in range(last_tier):
+            heap = self._aging[tier]
+            while heap:
+                cached_at, path = heap[0]
+                item = self._entries.get(path)
+                if item is None or item[1] != tier or item[2] != cached_at:
+                    heapq.heappop(heap)  # Stale: removed or re-scored
+                    continue
+                new_tier = CachePriorityScorer.recency_tier((now - cached_at) / 3600)
+                if new_tier == tier:
+                    break  # Oldest file in this tier hasn't aged out yet
+                heapq.heappop(heap)
+                base, _, _, size = item
+                self.remove(path)
+                self._insert(path, base, new_tier, cached_at, size)
@@ -0,0 +1,412 @@
+"""
+Background transfer service for Cacherr.
+
+Every copy to the cache and every restore runs on one long-lived set of
+worker threads instead of a thread pool per call. Requests are queued by
+priority (active playback first, Trakt last), a request for a transfer
+that is already queued or running gets the existing future, and the queue
+is persisted so transfers interrupted by a restart are picked up again.
+
+With a DiskScheduler, a worker only picks a job whose disk has a free
+stream slot, and holds that slot while the job runs. Jobs for a busy disk
+stay queued while jobs for other disks go ahead.
+
+A runner that has to wait on something slow it doesn't need a worker for
+(e.g. eviction to make cache space) raises TransferDeferred: the job goes
+back into the queue, keeping its future, and runs again after a delay.
+"""
+
+import time
+import heapq
+import logging
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import IntEnum
+from typing import Dict, List, Set, Tuple, Any, Callable, Optional
+
+from .disks import DiskScheduler
+from ..db.store import TrackerStore
+
+
+logger = logging.getLogger(__name__)
+
+
+class TransferDeferred(Exception):
+    """Raised by a runner to put its job back in the queue for later."""
+
+    def __init__(self, reason: str, delay: float):
+        super().__init__(reason)
+        self.delay = delay
+
+
+class TransferPriority(IntEnum):
+    """Queue order of transfers (lower runs first)."""
+    ACTIVE_WATCHING = 0
+    ONDECK_CURRENT = 1
+    ONDECK_NEXT = 2
+    WATCHLIST = 3
+    TRAKT = 4
+    OTHER = 5
+
+    @classmethod
+    def for_source(cls, source: str, is_current_ondeck: bool = True) -> "TransferPriority":
+        """Priority for a transfer requested for the given cache source."""
+        if source == 'active_watching':
+            return cls.ACTIVE_WATCHING
+        if source in ('ondeck', 'continue_watching'):
+            return cls.ONDECK_CURRENT if is_current_ondeck else cls.ONDECK_NEXT
+        if source == 'watchlist':
+            return cls.WATCHLIST
+        if source == 'trakt':
+            return cls.TRAKT
+        return cls.OTHER
+
+
+@dataclass
+class TransferJob:
+    """A queued or running transfer."""
+    path: str
+    operation: str  # OperationType value
+    source: str = "unknown"
+    priority: int = TransferPriority.OTHER
+    enqueued_at: str = ""
+    options: Dict[str, Any] = field(default_factory=dict)  # Extra runner arguments
+    future: Future = field(default_factory=Future, repr=False)
+    started: bool = False
+    disk: Optional[str] = field(default=None, repr=False)  # Backing disk, not saved
+    not_before: float = field(default=0.0, repr=False)  # Monotonic time a deferred job may run again
+
+    @property
+    def key(self) -> str:
+        return f"{self.operation}:{self.path}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'operation': self.operation,
+            'source': self.source,
+            'priority': int(self.priority),
+            'enqueued_at': self.enqueued_at,
+            'options': self.options,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TransferJob":
+        return cls(
+            path=data['path'],
+            operation=data['operation'],
+            source=data.get('source', 'unknown'),
+            priority=data.get('priority', TransferPriority.OTHER),
+            enqueued_at=data.get('enqueued_at', ''),
+            options=data.get('options') or {},
+        )
+
+
+class TransferService:
+    """Persistent priority queue of transfers with deduplicated futures.
+
+    Each operation type has its own queue and workers, so restores never
+    wait behind copies to the cache. Two transfers of the same path never
+    run at the same time.
+    """
+
+    # How often workers waiting only on busy disks look again; slots freed
+    # outside the queue (direct transfers) don't wake them
+    DISK_RECHECK_SECONDS = 1.0
+
+    def __init__(self,
+                 runner: Callable[[TransferJob], Any],
+                 workers: Dict[str, int],
+                 disks: Optional[DiskScheduler] = None):
+        """
+        Initialize transfer service. Workers start on the first submit().
+
+        Args:
+            runner: Performs a job and returns its result
+            workers: Worker threads per operation type
+            disks: Per-disk stream slots taken when a job is picked
+        """
+        self.runner = runner
+        self.workers = dict(workers)
+        self.disks = disks
+
+        self._cond = threading.Condition()
+        # Queued and running jobs by key - duplicate requests share these futures
+        self._active_operations: Dict[str, TransferJob] = {}
+        self._queues: Dict[str, List[Tuple[int, int, str]]] = {op: [] for op in self.workers}
+        self._running_paths: Set[str] = set()
+        self._seq = 0
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+        self._store: Optional[TrackerStore] = None
+        # Saved form of every active job; keys changed since the last write
+        self._saved: Dict[str, Dict[str, Any]] = {}
+        self._pending: Set[str] = set()
+        # Held by the one thread writing to the store (never while holding _cond)
+        self._writing = threading.Lock()
+        self._listeners: List[Callable[[TransferJob, Any], None]] = []
+        self._counters = {'submitted': 0, 'deduplicated': 0, 'deferred': 0, 'completed': 0, 'failed': 0}
+
+    def add_listener(self, callback: Callable[[TransferJob, Any], None]) -> None:
+        """Register callback(job, result), called before the job's future resolves.
+
+        result is None if the runner raised.
+        """
+        self._listeners.append(callback)
+
+    def attach_store(self, store: TrackerStore) -> int:
+        """Persist the queue in a store and requeue transfers saved there.
+
+        Returns the number of transfers restored from the store.
+        """
+        try:
+            saved = store.load()
+        except Exception as e:
+            logger.warning(f"Could not load transfer queue: {e}")
+            saved = {}
+
+        restored = 0
+        for entry in saved.values():
+            try:
+                job = TransferJob.from_dict(entry)
+            except (KeyError, TypeError) as e:
+                logger.warning(f"Skipping corrupt transfer queue entry: {e}")
+                continue
+            self.submit(job.path, job.operation, job.source, job.priority, **job.options)
+            restored += 1
+
+        with self._writing, self._cond:
+            self._store = store
+            self._saved = {key: job.to_dict() for key, job in self._active_operations.items()}
+            self._pending.clear()
+            self._store.replace(self._saved)
+        if restored:
+            logger.info(f"Resuming {restored} queued transfers")
+        return restored
+
+    def submit(self,
+               path: str,
+               operation: str,
+               source: str = "unknown",
+               priority: int = TransferPriority.OTHER,
+               **options: Any) -> Future:
+        """Queue a transfer, or join the identical one already queued or running.
+
+        Returns a future resolving to the runner's result.
+        """
+        operation = getattr(operation, 'value', operation)
+        if operation not in self._queues:
+            raise ValueError(f"Unknown transfer operation: {operation}")
+        disk = self.disks.resolve(path) if self.disks is not None else None
+
+        with self._cond:
+            key = f"{operation}:{path}"
+            job = self._active_operations.get(key)
+            if job is not None:
+                self._counters['deduplicated'] += 1
+                if not job.started and priority < job.priority:
+                    job.priority = priority
+                    job.source = source
+                    self._push(job)
+                    self._persist(job)
+                future = job.future
+            else:
+                job = TransferJob(
+                    path=path,
+                    operation=operation,
+                    source=source,
+                    priority=priority,
+                    enqueued_at=datetime.now(timezone.utc).isoformat(),
+                    options=options,
+                    disk=disk,
+                )
+                self._active_operations[key] = job
+                self._counters['submitted'] += 1
+                self._push(job)
+                self._persist(job)
+                self._ensure_workers()
+                self._cond.notify_all()
+                future = job.future
+        self._flush()
+        return future
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop workers after their current transfer; queued transfers stay persisted."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            threads = list(self._threads)
+        for thread in threads:
+            thread.join(timeout=timeout)
+        self._flush()
+        with self._writing, self._cond:
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+
+    def active_paths(self, operation: str) -> Set[str]:
+        """Paths with a queued or running transfer of the given operation."""
+        operation = getattr(operation, 'value', operation)
+        with self._cond:
+            return {job.path for job in self._active_operations.values() if job.operation == operation}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue statistics for status reporting."""
+        with self._cond:
+            queued: Dict[str, int] = {op: 0 for op in self._queues}
+            for job in self._active_operations.values():
+                if not job.started:
+                    queued[job.operation] += 1
+            return {
+                'queued': queued,
+                'running': len(self._running_paths),
+                'persistent': self._store is not None,
+                **self._counters,
+            }
+
+    def _push(self, job: TransferJob) -> None:
+        self._seq += 1
+        heapq.heappush(self._queues[job.operation], (int(job.priority), self._seq, job.key))
+
+    def _persist(self, job: TransferJob, done: bool = False) -> None:
+        """Note one job change for the next _flush() (caller holds the lock)."""
+        if self._store is None:
+            return
+        if done:
+            self._saved.pop(job.key, None)
+        else:
+            self._saved[job.key] = job.to_dict()
+        self._pending.add(job.key)
+
+    def _flush(self) -> None:
+        """Write noted job changes to the store (caller must not hold the lock).
+
+        Only one thread writes at a time. Changes noted while it writes are
+        left for it: it writes them as one batch before it returns, so
+        other threads never wait for the store.
+        """
+        while self._writing.acquire(blocking=False):
+            try:
+                with self._cond:
+                    store = self._store
+                    changes = {key: self._saved.get(key) for key in self._pending}
+                    self._pending.clear()
+                    saved = dict(self._saved) if changes else None  # Whole-file stores write all of it
+                if store is not None and changes:
+                    try:
+                        store.apply(saved, changes)
+                    except Exception as e:
+                        logger.error(f"Could not save transfer queue: {e}")
+            finally:
+                self._writing.release()
+            with self._cond:
+                if self._store is None or not self._pending:
+                    return  # Otherwise noted while writing, and nobody else took them
+
+    def _ensure_workers(self) -> None:
+        if self._threads or self._stopping:
+            return
+        for operation, count in self.workers.items():
+            for i in range(max(1, count)):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(operation,),
+                    name=f"cacherr-{operation}-{i + 1}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _next(self, operation: str) -> Tuple[Optional[TransferJob], Optional[float]]:
+        """Pop the highest-priority runnable job (caller holds the lock).
+
+        The job's disk slot is taken for the calling worker. Without a
+        runnable job, also returns how long to wait before looking again
+        when a skipped job may become runnable on its own (None = until
+        notified).
+        """
+        queue = self._queues[operation]
+        blocked = []
+        retry_in = None
+        now = time.monotonic()
+        job = None
+        while queue:
+            priority, seq, key = heapq.heappop(queue)
+            candidate = self._active_operations.get(key)
+            if candidate is None or candidate.started or candidate.priority != priority:
+                continue  # Finished, or superseded by a higher-priority entry
+            if candidate.path in self._running_paths:
+                blocked.append((priority, seq, key))  # Other operation on this path running
+                continue
+            if candidate.not_before > now:
+                blocked.append((priority, seq, key))  # Deferred
+                retry_in = min(retry_in or float('inf'), candidate.not_before - now)
+                continue
+            if candidate.disk is not None and not self.disks.try_acquire(candidate.disk):
+                blocked.append((priority, seq, key))  # Disk already at its stream limit
+                retry_in = min(retry_in or float('inf'), self.DISK_RECHECK_SECONDS)
+                continue
+            job = candidate
+            break
+        for entry in blocked:
+            heapq.heappush(queue, entry)
+        return job, retry_in
+
+    def _worker(self, operation: str) -> None:
+        while True:
+            with self._cond:
+                job = None
+                while not self._stopping:
+                    job, retry_in = self._next(operation)
+                    if job is not None:
+                        break
+                    self._cond.wait(retry_in)
+                if job is None:
+                    return
+                job.started = True
+                self._running_paths.add(job.path)
+
+            result = None
+            error: Optional[BaseException] = None
+            try:
+                result = self.runner(job)
+            except TransferDeferred as e:
+                logger.debug(f"Transfer deferred ({job.operation}): {job.path}: {e}")
+                with self._cond:
+                    job.started = False
+                    job.not_before = time.monotonic() + e.delay
+                    self._running_paths.discard(job.path)
+                    self._counters['deferred'] += 1
+                    self._push(job)
+                    self._cond.notify_all()
+                continue
+            except Exception as e:
+                logger.error(f"Transfer failed ({job.operation}): {job.path}: {e}")
+                error = e
+            finally:
+                if job.disk is not None:
+                    self.disks.release(job.disk)
+
+            # Before the job leaves the active map, so a request for the
+            # same transfer made meanwhile still joins this one
+            for callback in self._listeners:
+                try:
+                    callback(job, result)
+                except Exception as e:
+                    logger.error(f"Transfer listener error: {e}")
+
+            with self._cond:
+                self._active_operations.pop(job.key, None)
+                self._running_paths.discard(job.path)
+                self._persist(job, done=True)
+                ok = error is None and getattr(result, 'success', True)
+                self._counters['completed' if ok else 'failed'] += 1
+                self._cond.notify_all()
+            self._flush()
+
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
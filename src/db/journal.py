@@ -0,0 +1,249 @@
+"""
+Append-only journal tracker storage for Cacherr.
+
+Keeps the plain JSON tracker file as a snapshot and appends every change
+to `<tracker_file>.journal` as one JSON line:
+    {"op": "set", "path": "...", "entry": {...}}
+    {"op": "del", "path": "..."}
+
+Loading reads the snapshot and replays the journal. When the journal
+grows past `compact_bytes`, a background thread folds it into a new
+snapshot, so each write is an O(1) append and startup cost tracks the
+snapshot size rather than the write history.
+"""
+
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from .store import TrackerStore, json_default
+
+
+logger = logging.getLogger(__name__)
+
+
+# Default journal size that triggers compaction
+DEFAULT_COMPACT_BYTES = 4 * 1024 * 1024
+
+
+class JournalTrackerStore(TrackerStore):
+    """Snapshot + write-ahead journal tracker store."""
+
+    def __init__(self,
+                 tracker_file: str,
+                 name: str = "tracker",
+                 compact_bytes: int = DEFAULT_COMPACT_BYTES,
+                 fsync: bool = False):
+        """
+        Initialize journal store.
+
+        Args:
+            tracker_file: Snapshot path (same format as the JSON tracker file)
+            name: Tracker name for logging
+            compact_bytes: Journal size that triggers background compaction
+            fsync: fsync after every append (survives power loss, slower)
+        """
+        super().__init__(name)
+        self.tracker_file = tracker_file
+        self.journal_file = tracker_file + ".journal"
+        self.compact_bytes = compact_bytes
+        self.fsync = fsync
+
+        self._lock = threading.RLock()
+        self._journal = None
+        self._journal_size = 0
+        # Bumped by replace() so an in-flight compaction knows it is stale
+        self._generation = 0
+
+        self._compact_requested = threading.Event()
+        self._closed = False
+        self._compactor: Optional[threading.Thread] = None
+
+    def load(self) -> Dict[str, Any]:
+        """Load the snapshot and replay the journal on top of it."""
+        with self._lock:
+            data, consumed = self._read_state()
+            if os.path.exists(self.journal_file) and os.path.getsize(self.journal_file) > consumed:
+                # Drop a torn trailing record so new appends start on a clean line
+                logger.warning(f"Truncating incomplete {self.name} journal record")
+                os.truncate(self.journal_file, consumed)
+            self._open_journal()
+            return data
+
+    def apply(self, data: Dict[str, Any], changes: Dict[str, Optional[Any]]) -> None:
+        """Append one journal record per changed entry."""
+        if not changes:
+            return
+
+        lines = []
+        for path, entry in changes.items():
+            if entry is None:
+                record = {'op': 'del', 'path': path}
+            else:
+                record = {'op': 'set', 'path': path, 'entry': entry}
+            lines.append(json.dumps(record, default=json_default) + "\n")
+        payload = "".join(lines).encode('utf-8')
+
+        with self._lock:
+            try:
+                self._open_journal()
+                self._journal.write(payload)
+                self._journal.flush()
+                if self.fsync:
+                    os.fsync(self._journal.fileno())
+                self._journal_size += len(payload)
+            except (IOError, OSError) as e:
+                logger.error(f"Could not append to {self.name} journal: {e}")
+                return
+
+            if self._journal_size >= self.compact_bytes:
+                self._request_compaction()
+
+    def replace(self, data: Dict[str, Any]) -> None:
+        """Write a fresh snapshot and start an empty journal."""
+        with self._lock:
+            self._generation += 1
+            try:
+                self._write_snapshot(data)
+                self._truncate_journal(b"")
+            except (IOError, OSError) as e:
+                logger.error(f"Could not save {self.name} file: {e}")
+
+    def compact(self) -> bool:
+        """Fold the current journal into the snapshot.
+
+        The expensive replay runs without holding the lock; only the final
+        swap does. Returns False if the journal changed underneath us via
+        replace() and the result had to be discarded.
+        """
+        with self._lock:
+            if self._journal is not None:
+                self._journal.flush()
+            generation = self._generation
+            offset = self._journal_size
+
+        try:
+            data, replayed = self._read_state(journal_limit=offset)
+        except (json.JSONDecodeError, IOError, OSError) as e:
+            logger.error(f"Could not compact {self.name} journal: {e}")
+            return False
+
+        with self._lock:
+            if generation != self._generation:
+                return False
+            try:
+                # Records appended while we were replaying stay in the journal
+                with open(self.journal_file, 'rb') as f:
+                    f.seek(replayed)
+                    tail = f.read()
+
+                # A crash between these two steps leaves the new snapshot with
+                # the old journal; replaying set/del records is idempotent.
+                self._write_snapshot(data)
+                self._truncate_journal(tail)
+            except (IOError, OSError) as e:
+                logger.error(f"Could not compact {self.name} journal: {e}")
+                return False
+
+        logger.debug(f"Compacted {self.name} journal ({offset} bytes, {len(data)} entries)")
+        return True
+
+    def close(self) -> None:
+        """Compact outstanding journal records and stop the compactor."""
+        self._closed = True
+        self._compact_requested.set()
+        if self._compactor is not None and self._compactor.is_alive():
+            self._compactor.join(timeout=30)
+
+        if self._journal_size > 0:
+            self.compact()
+
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def _read_state(self, journal_limit: Optional[int] = None) -> Tuple[Dict[str, Any], int]:
+        """Read snapshot + journal. Returns (data, journal bytes consumed)."""
+        data: Dict[str, Any] = {}
+        if os.path.exists(self.tracker_file):
+            with open(self.tracker_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+        consumed = 0
+        if not os.path.exists(self.journal_file):
+            return data, consumed
+
+        with open(self.journal_file, 'rb') as f:
+            raw = f.read() if journal_limit is None else f.read(journal_limit)
+
+        for line in raw.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # Torn write from a crash - ignore the partial record
+            consumed += len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping corrupt {self.name} journal record")
+                continue
+
+            path = record.get('path')
+            if record.get('op') == 'set':
+                data[path] = record.get('entry')
+            elif record.get('op') == 'del':
+                data.pop(path, None)
+
+        return data, consumed
+
+    def _open_journal(self) -> None:
+        if self._journal is None:
+            Path(self.journal_file).parent.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self.journal_file, 'ab')
+            self._journal_size = self._journal.tell()
+
+    def _write_snapshot(self, data: Dict[str, Any]) -> None:
+        """Atomically write the snapshot file."""
+        Path(self.tracker_file).parent.mkdir(parents=True, exist_ok=True)
+        temp = self.tracker_file + ".tmp"
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, default=json_default)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self.tracker_file)
+
+    def _truncate_journal(self, tail: bytes) -> None:
+        """Replace the journal with `tail` and reopen it for appending."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+        temp = self.journal_file + ".tmp"
+        with open(temp, 'wb') as f:
+            f.write(tail)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self.journal_file)
+        self._open_journal()
+
+    def _request_compaction(self) -> None:
+        if self._compactor is None or not self._compactor.is_alive():
+            self._compactor = threading.Thread(
+                target=self._compaction_loop,
+                name=f"cacherr-{self.name}-compactor",
+                daemon=True
+            )
+            self._compactor.start()
+        self._compact_requested.set()
+
+    def _compaction_loop(self) -> None:
+        """Background thread: compact whenever asked until closed."""
+        while not self._closed:
+            self._compact_requested.wait()
+            self._compact_requested.clear()
+            if self._closed:
+                break
+            if self._journal_size >= self.compact_bytes:
+                self.compact()
@@ -0,0 +1,177 @@
+"""
+SQLite tracker storage for Cacherr.
+
+All trackers share one database file in WAL mode. Each tracker entry is a
+row keyed by (tracker, path), so recording or removing a file is a single
+row upsert/delete instead of a rewrite of the whole tracker file.
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional, Iterator
+
+from .store import TrackerStore, json_default
+
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracker_entries (
+    tracker TEXT NOT NULL,
+    path TEXT NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (tracker, path)
+);
+"""
+
+
+class TrackerDatabase:
+    """Shared SQLite connection for tracker stores.
+
+    A single connection is used from all threads; access is serialized
+    with a lock and every write runs in its own transaction.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        logger.debug(f"Opened tracker database: {db_path}")
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements inside a single write transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def query(self, sql: str, params: tuple = ()) -> list:
+        """Run a read query and return all rows."""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing tracker database: {e}")
+
+
+class SqliteTrackerStore(TrackerStore):
+    """Row-per-entry tracker store backed by a TrackerDatabase.
+
+    If `legacy_file` is given and the tracker has no rows yet, the old JSON
+    tracker file is imported on first load and renamed to `*.migrated`.
+    """
+
+    def __init__(self, db: TrackerDatabase, name: str, legacy_file: Optional[str] = None):
+        super().__init__(name)
+        self.db = db
+        self.legacy_file = legacy_file
+
+    def load(self) -> Dict[str, Any]:
+        """Load all entries for this tracker."""
+        self._migrate_legacy_file()
+
+        rows = self.db.query(
+            "SELECT path, data FROM tracker_entries WHERE tracker = ? ORDER BY rowid",
+            (self.name,)
+        )
+        data = {}
+        for path, raw in rows:
+            try:
+                data[path] = json.loads(raw)
+            except ValueError:
+                logger.warning(f"Skipping corrupt {self.name} entry: {path}")
+        return data
+
+    def apply(self, data: Dict[str, Any], changes: Dict[str, Optional[Any]]) -> None:
+        """Upsert/delete only the changed rows."""
+        if not changes:
+            return
+        try:
+            with self.db.transaction() as conn:
+                self._write_changes(conn, changes)
+        except sqlite3.Error as e:
+            logger.error(f"Could not save {self.name} entries: {e}")
+
+    def replace(self, data: Dict[str, Any]) -> None:
+        """Replace every row for this tracker."""
+        try:
+            with self.db.transaction() as conn:
+                conn.execute("DELETE FROM tracker_entries WHERE tracker = ?", (self.name,))
+                self._write_changes(conn, data)
+        except sqlite3.Error as e:
+            logger.error(f"Could not save {self.name} entries: {e}")
+
+    def _write_changes(self, conn: sqlite3.Connection, changes: Dict[str, Optional[Any]]) -> None:
+        upserts = []
+        deletes = []
+        for path, entry in changes.items():
+            if entry is None:
+                deletes.append((self.name, path))
+            else:
+                upserts.append((self.name, path, json.dumps(entry, default=json_default)))
+
+        if deletes:
+            conn.executemany(
+                "DELETE FROM tracker_entries WHERE tracker = ? AND path = ?",
+                deletes
+            )
+        if upserts:
+            conn.executemany(
+                "INSERT INTO tracker_entries (tracker, path, data) VALUES (?, ?, ?) "
+                "ON CONFLICT (tracker, path) DO UPDATE SET data = excluded.data",
+                upserts
+            )
+
+    def _migrate_legacy_file(self) -> None:
+        """Import the old JSON tracker file on first start."""
+        if not self.legacy_file or not os.path.exists(self.legacy_file):
+            return
+
+        existing = self.db.query(
+            "SELECT COUNT(*) FROM tracker_entries WHERE tracker = ?", (self.name,)
+        )[0][0]
+
+        if existing == 0:
+            try:
+                with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"Could not migrate {self.name} file: {e}")
+                return
+
+            try:
+                with self.db.transaction() as conn:
+                    self._write_changes(conn, legacy)
+            except sqlite3.Error as e:
+                logger.error(f"Could not migrate {self.name} file: {e}")
+                return
+
+            logger.info(f"Migrated {len(legacy)} {self.name} entries from {self.legacy_file}")
+
+        # Rows are in the database now - keep the old file only as a backup
+        try:
+            os.replace(self.legacy_file, self.legacy_file + ".migrated")
+        except OSError as e:
+            logger.warning(f"Could not rename migrated {self.name} file: {e}")
@@ -0,0 +1,81 @@
+"""
+Tracker persistence backends for Cacherr.
+
+A tracker keeps its entries in memory and hands every change to a store:
+- JsonTrackerStore: legacy whole-file JSON (one rewrite per change)
+- SqliteTrackerStore (see sqlite.py): row-level upserts/deletes
+"""
+
+import os
+import json
+import logging
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+def json_default(obj: Any) -> Any:
+    """json.dump hook: persist mapping-like entry records as plain dicts."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class TrackerStore:
+    """Interface for tracker persistence backends.
+
+    `changes` maps a file path to its new entry, or to None when the entry
+    was removed. `data` is always the tracker's complete in-memory mapping,
+    for backends that can only persist everything at once.
+    """
+
+    def __init__(self, name: str = "tracker"):
+        self.name = name
+
+    def load(self) -> Dict[str, Any]:
+        """Load all entries."""
+        raise NotImplementedError
+
+    def apply(self, data: Dict[str, Any], changes: Dict[str, Optional[Any]]) -> None:
+        """Persist a set of changed entries."""
+        raise NotImplementedError
+
+    def replace(self, data: Dict[str, Any]) -> None:
+        """Persist the complete mapping, discarding anything stored before."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+        pass
+
+
+class JsonTrackerStore(TrackerStore):
+    """Whole-file JSON store (the original tracker file format)."""
+
+    def __init__(self, tracker_file: str, name: str = "tracker"):
+        super().__init__(name)
+        self.tracker_file = tracker_file
+
+    def load(self) -> Dict[str, Any]:
+        """Load tracker data from file."""
+        if not os.path.exists(self.tracker_file):
+            return {}
+        with open(self.tracker_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def apply(self, data: Dict[str, Any], changes: Dict[str, Optional[Any]]) -> None:
+        """JSON files can't be patched in place - rewrite the whole file."""
+        self.replace(data)
+
+    def replace(self, data: Dict[str, Any]) -> None:
+        """Save tracker data to file."""
+        try:
+            # Ensure directory exists
+            Path(self.tracker_file).parent.mkdir(parents=True, exist_ok=True)
+            with open(self.tracker_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, default=json_default)
+        except IOError as e:
+            logger.error(f"Could not save {self.name} file: {e}")
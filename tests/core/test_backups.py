@@ -0,0 +1,82 @@
+"""BackupIndex lookups match probing .name.plexcached, then .name.N.plexcached."""
+
+import os
+
+import pytest
+
+from src.core.backups import BackupIndex
+
+
+EXT = ".plexcached"
+
+
+@pytest.fixture
+def media_dir(tmp_path):
+    for name in [
+        ".Movie.mkv.plexcached",
+        ".Show S01E01.mkv.3.plexcached",
+        ".Show S01E01.mkv.1.plexcached",
+        ".Show S01E02.mkv.2.plexcached",
+        ".Other.mkv.2.plexcached",  # Unnumbered backup of "Other.mkv.2"
+        "Show S01E03.mkv",
+        ".hidden",
+    ]:
+        (tmp_path / name).write_bytes(b"")
+    return tmp_path
+
+
+def probe(original_path):
+    """What restores did before the index: stat each candidate name in turn."""
+    directory, name = os.path.split(original_path)
+    candidates = [f".{name}{EXT}"] + [f".{name}.{n}{EXT}" for n in range(1, 10)]
+    for candidate in candidates:
+        if os.path.exists(os.path.join(directory, candidate)):
+            return os.path.join(directory, candidate)
+    return None
+
+
+@pytest.mark.parametrize('name', [
+    "Movie.mkv", "Show S01E01.mkv", "Show S01E02.mkv", "Show S01E03.mkv",
+    "Other.mkv", "Other.mkv.2", "Missing.mkv",
+])
+def test_find_matches_probing(media_dir, name):
+    index = BackupIndex(EXT)
+    assert index.find(str(media_dir / name)) == probe(str(media_dir / name))
+
+
+def test_one_scan_per_directory(media_dir):
+    index = BackupIndex(EXT)
+    for name in ["Movie.mkv", "Show S01E01.mkv", "Missing.mkv"]:
+        index.find(str(media_dir / name))
+
+    stats = index.get_stats()
+    assert stats['scans'] == 1
+    assert (stats['hits'], stats['misses']) == (2, 1)
+
+
+def test_add_and_discard_update_numbered_backups(media_dir):
+    index = BackupIndex(EXT)
+    original = str(media_dir / "Show S01E01.mkv")
+    assert index.find(original).endswith(".1" + EXT)
+
+    index.discard(str(media_dir / f".Show S01E01.mkv.1{EXT}"))
+    assert index.find(original).endswith(".3" + EXT)
+
+    index.add(str(media_dir / f".Show S01E01.mkv{EXT}"))
+    assert index.find(original) == str(media_dir / f".Show S01E01.mkv{EXT}")
+
+    index.discard(str(media_dir / f".Show S01E01.mkv{EXT}"))
+    index.discard(str(media_dir / f".Show S01E01.mkv.3{EXT}"))
+    assert index.find(original) is None
+
+
+def test_invalidate_picks_up_outside_changes(media_dir):
+    index = BackupIndex(EXT)
+    original = str(media_dir / "Show S01E03.mkv")
+    assert index.find(original) is None
+
+    (media_dir / f".Show S01E03.mkv.4{EXT}").write_bytes(b"")
+    assert index.find(original) is None
+
+    index.invalidate()
+    assert index.find(original) == str(media_dir / f".Show S01E03.mkv.4{EXT}")
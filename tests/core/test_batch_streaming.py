@@ -0,0 +1,90 @@
+"""Batch operations yield results and run callbacks as each file finishes."""
+
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from src.core.file_operations import AtomicFileOperations, OperationResult, OperationType
+
+
+PATHS = ['/array/a.mkv', '/array/b.mkv', '/array/c.mkv']
+
+
+class GatedCopy:
+    """Stands in for copy_to_cache_atomic; each file finishes when its gate opens."""
+
+    def __init__(self, paths):
+        self.gates = {path: threading.Event() for path in paths}
+        self.started = threading.Semaphore(0)
+
+    def __call__(self, source_path, **kwargs):
+        self.started.release()
+        self.gates[source_path].wait(5)
+        return OperationResult(True, source_path, source_path + '.cached', OperationType.CACHE)
+
+
+@pytest.fixture
+def ops(tmp_path):
+    (tmp_path / "cache").mkdir()
+    ops = AtomicFileOperations(str(tmp_path / "cache"), str(tmp_path / "array"),
+                               max_concurrent_cache=len(PATHS), adaptive_concurrency=False,
+                               streams_per_disk=len(PATHS), drop_page_cache=False)
+    yield ops
+    ops.stop(timeout=5)
+
+
+@pytest.fixture
+def copy(ops):
+    copy = GatedCopy(PATHS)
+    ops.copy_to_cache_atomic = copy
+    yield copy
+    for gate in copy.gates.values():
+        gate.set()
+
+
+def test_results_come_in_completion_order(ops, copy):
+    futures = {path: ops.submit_cache(path) for path in PATHS}
+    results = (result for _, result in ops.iter_results(futures, OperationType.CACHE))
+    for _ in PATHS:
+        assert copy.started.acquire(timeout=5)
+
+    # The last file finishing first is yielded while the others still run
+    copy.gates['/array/c.mkv'].set()
+    assert next(results).source_path == '/array/c.mkv'
+    copy.gates['/array/a.mkv'].set()
+    assert next(results).source_path == '/array/a.mkv'
+    copy.gates['/array/b.mkv'].set()
+    assert next(results).source_path == '/array/b.mkv'
+    assert next(results, None) is None
+
+
+def test_batch_callback_runs_per_file(ops, copy):
+    seen = []
+
+    def finish_next(result):
+        # Each callback runs before the next file is allowed to finish
+        seen.append(result.source_path)
+        remaining = [p for p in ('/array/b.mkv', '/array/a.mkv') if p not in seen]
+        if remaining:
+            copy.gates[remaining[0]].set()
+
+    copy.gates['/array/c.mkv'].set()
+    results = ops.batch_cache(PATHS, callback=finish_next)
+
+    assert seen == ['/array/c.mkv', '/array/b.mkv', '/array/a.mkv']
+    assert [r.source_path for r in results] == seen
+
+
+def test_failed_futures_become_failed_results(ops):
+    done, failed = Future(), Future()
+    failed.set_exception(OSError("disk gone"))
+    done.set_result(OperationResult(True, '/array/a.mkv', '/cache/a.mkv', OperationType.CACHE))
+
+    results = dict(ops.iter_results({'/array/a.mkv': done, '/array/b.mkv': failed},
+                                    OperationType.CACHE))
+
+    assert results['/array/a.mkv'].success
+    assert not results['/array/b.mkv'].success
+    assert results['/array/b.mkv'].error == "disk gone"
+    assert results['/array/b.mkv'].operation is OperationType.CACHE
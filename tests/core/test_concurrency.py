@@ -0,0 +1,93 @@
+"""AIMDController: additive increase, multiplicative decrease, and the slot limit."""
+
+import threading
+
+from src.core.concurrency import AIMDController
+
+
+MB = 1_000_000
+
+
+def controller(limit, min_limit=1, max_limit=8):
+    aimd = AIMDController("test", min_limit, max_limit)
+    aimd.limit = limit
+    return aimd
+
+
+def adjust(aimd, throughput, latency):
+    """End a measurement window (the controller's lock is held there)."""
+    with aimd._cond:
+        aimd._adjust(throughput, latency)
+
+
+def test_starts_at_the_maximum():
+    assert AIMDController("test", 1, 4).limit == 4
+    assert AIMDController("test", 1, 4, enabled=False).limit == 4
+
+
+def test_adds_workers_while_throughput_improves_then_settles_at_the_knee():
+    aimd = controller(2)
+    adjust(aimd, 100 * MB, 0.01)
+    adjust(aimd, 150 * MB, 0.01)
+    assert (aimd.limit, aimd._last_change) == (4, "increase")
+
+    adjust(aimd, 152 * MB, 0.01)  # The fourth worker added under 5%
+    assert (aimd.limit, aimd._last_change) == (3, "knee")
+    adjust(aimd, 151 * MB, 0.01)
+    assert (aimd.limit, aimd._last_change) == (3, "hold")
+
+
+def test_increase_stops_at_the_maximum():
+    aimd = controller(7)
+    adjust(aimd, 100 * MB, 0.01)
+    adjust(aimd, 200 * MB, 0.01)
+    assert aimd.limit == 8
+
+
+def test_throughput_loss_halves_the_limit():
+    aimd = controller(8)
+    adjust(aimd, 200 * MB, 0.01)
+    aimd.limit = 8
+    adjust(aimd, 150 * MB, 0.01)
+    assert (aimd.limit, aimd._last_change) == (4, "decrease (throughput)")
+
+
+def test_latency_growth_halves_the_limit_but_not_below_the_minimum():
+    aimd = controller(4, min_limit=2)
+    adjust(aimd, 100 * MB, 0.01)
+    aimd.limit = 4
+    adjust(aimd, 100 * MB, 0.05)
+    assert (aimd.limit, aimd._last_change) == (2, "decrease (latency)")
+    adjust(aimd, 100 * MB, 0.05)
+    assert aimd.limit == 2
+
+
+def test_window_closes_after_limit_transfers():
+    aimd = controller(3)
+    with aimd.slot():
+        pass
+    aimd.record(100 * MB, 1.0)
+    aimd.record(100 * MB, 1.0)
+    assert aimd._last_change == "start"
+    aimd.record(100 * MB, 1.0)
+    assert aimd._last_change == "increase"
+
+    # Renames and failures say nothing about throughput
+    aimd.record(0, 1.0)
+    assert aimd._window_ops == 0
+
+
+def test_slots_wait_for_the_limit():
+    aimd = controller(1)
+    entered = threading.Event()
+
+    def second():
+        with aimd.slot():
+            entered.set()
+
+    with aimd.slot():
+        waiter = threading.Thread(target=second)
+        waiter.start()
+        assert not entered.wait(0.1)
+    waiter.join(5)
+    assert entered.is_set()
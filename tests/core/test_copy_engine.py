@@ -0,0 +1,146 @@
+"""CopyEngine: method fallback order, fast paths and the callbacks copies report through."""
+
+import errno
+import os
+
+import pytest
+
+from src.core.file_operations import CopyEngine, CopyMethod
+
+
+MiB = 1024 * 1024
+
+
+class FlakyEngine(CopyEngine):
+    """Engine whose kernel copy methods fail as the test says."""
+
+    CHUNK_SIZE = MiB
+    BUFFER_SIZE = MiB
+
+    def __init__(self, failures=None):
+        super().__init__(reflink=False, drop_cache=False)
+        self.failures = dict(failures or {})  # method -> (errno, chunks that succeed first)
+        self.calls = []
+
+    def _copy_chunk(self, method, src, dst, offset, remaining):
+        self.calls.append((method, offset))
+        if method in self.failures:
+            error, succeed = self.failures[method]
+            if succeed <= 0:
+                raise OSError(error, os.strerror(error))
+            self.failures[method] = (error, succeed - 1)
+        return super()._copy_chunk(method, src, dst, offset, remaining)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "movie.mkv"
+    path.write_bytes(os.urandom(3 * MiB))
+    return str(path)
+
+
+def methods(engine):
+    return [method for method, _ in engine.calls]
+
+
+def engine_key(source, directory):
+    return (os.stat(source).st_dev, os.stat(directory).st_dev)
+
+
+def test_kernel_copy_is_tried_first(tmp_path, source):
+    engine = FlakyEngine()
+    report = engine.copy(source, str(tmp_path / "copy.mkv"))
+
+    assert report.method is CopyMethod.COPY_FILE_RANGE
+    assert (tmp_path / "copy.mkv").read_bytes() == open(source, 'rb').read()
+
+
+def test_unsupported_methods_fall_through_and_are_remembered(tmp_path, source):
+    engine = FlakyEngine({CopyMethod.COPY_FILE_RANGE: (errno.EXDEV, 0),
+                          CopyMethod.SENDFILE: (errno.ENOSYS, 0)})
+    report = engine.copy(source, str(tmp_path / "first.mkv"))
+
+    assert report.method is CopyMethod.READINTO
+    assert methods(engine)[:2] == [CopyMethod.COPY_FILE_RANGE, CopyMethod.SENDFILE]
+
+    # The next copy between the same devices goes straight to what worked
+    engine.calls.clear()
+    engine.copy(source, str(tmp_path / "second.mkv"))
+    assert set(methods(engine)) == {CopyMethod.READINTO}
+    assert (tmp_path / "second.mkv").read_bytes() == open(source, 'rb').read()
+
+
+def test_failure_part_way_resumes_at_the_same_offset(tmp_path, source):
+    engine = FlakyEngine({CopyMethod.COPY_FILE_RANGE: (errno.EINVAL, 1)})
+    report = engine.copy(source, str(tmp_path / "copy.mkv"))
+
+    assert report.method is CopyMethod.SENDFILE
+    assert engine.calls[:3] == [(CopyMethod.COPY_FILE_RANGE, 0), (CopyMethod.COPY_FILE_RANGE, MiB),
+                                (CopyMethod.SENDFILE, MiB)]
+    assert (tmp_path / "copy.mkv").read_bytes() == open(source, 'rb').read()
+
+
+def test_real_errors_are_not_masked(tmp_path, source):
+    engine = FlakyEngine({CopyMethod.COPY_FILE_RANGE: (errno.EIO, 0)})
+    with pytest.raises(OSError) as exc:
+        engine.copy(source, str(tmp_path / "copy.mkv"))
+    assert exc.value.errno == errno.EIO
+    assert methods(engine) == [CopyMethod.COPY_FILE_RANGE]
+
+
+def test_link_counts_as_allocated_and_written(tmp_path):
+    source = tmp_path / "movie.mkv"
+    source.write_bytes(b"x" * 4096)
+    calls = []
+
+    report = CopyEngine(reflink=False, hardlink_fallback=True).copy(
+        str(source), str(tmp_path / "linked.mkv"),
+        preallocated=lambda: calls.append('allocated'),
+        progress=calls.append,
+    )
+
+    assert report.method is CopyMethod.HARDLINK
+    assert os.path.samefile(source, tmp_path / "linked.mkv")
+    assert calls == ['allocated', 4096]
+
+
+@pytest.fixture
+def no_reflink(monkeypatch):
+    """A filesystem without FICLONE, whatever the test directory is on."""
+    import src.core.file_operations as file_operations
+
+    def ioctl(fd, request, arg):
+        raise OSError(errno.EOPNOTSUPP, os.strerror(errno.EOPNOTSUPP))
+
+    monkeypatch.setattr(file_operations, 'FCNTL_AVAILABLE', True)
+    monkeypatch.setattr(file_operations, 'fcntl', type('fcntl', (), {'ioctl': staticmethod(ioctl)}))
+
+
+def test_reflink_falls_back_to_a_data_copy(tmp_path, source, no_reflink):
+    engine = CopyEngine(reflink=True, drop_cache=False)
+    report = engine.copy(source, str(tmp_path / "copy.mkv"))
+
+    assert report.method in (CopyMethod.COPY_FILE_RANGE, CopyMethod.SENDFILE, CopyMethod.READINTO)
+    assert not os.path.samefile(source, tmp_path / "copy.mkv")
+    assert (tmp_path / "copy.mkv").read_bytes() == open(source, 'rb').read()
+    assert not engine._supported(engine_key(source, tmp_path), CopyMethod.REFLINK)
+
+
+def test_hardlink_replaces_the_file_a_failed_reflink_left(tmp_path, source, no_reflink):
+    engine = CopyEngine(reflink=True, hardlink_fallback=True, drop_cache=False)
+    report = engine.copy(source, str(tmp_path / "linked.mkv"))
+
+    assert report.method is CopyMethod.HARDLINK
+    assert os.path.samefile(source, tmp_path / "linked.mkv")
+
+
+def test_resumed_copies_never_link(tmp_path, source):
+    dest = tmp_path / "resumed.mkv"
+    dest.write_bytes(open(source, 'rb').read()[:MiB])
+
+    engine = CopyEngine(reflink=False, hardlink_fallback=True, drop_cache=False)
+    report = engine.copy(source, str(dest), resume_offset=MiB)
+
+    assert report.method is not CopyMethod.HARDLINK
+    assert not os.path.samefile(source, dest)
+    assert dest.read_bytes() == open(source, 'rb').read()
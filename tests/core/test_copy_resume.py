@@ -0,0 +1,133 @@
+"""Interrupted cache copies resume from their .part file and checkpoint."""
+
+import errno
+import os
+
+import pytest
+
+from src.core.file_operations import (
+    CHECKPOINT_SUFFIX,
+    PART_SUFFIX,
+    AtomicFileOperations,
+    CopyEngine,
+)
+
+
+MiB = 1024 * 1024
+SIZE = 6 * MiB
+
+
+class Interrupt:
+    """Throttle that fails the copy once `after` bytes went through."""
+
+    limited = True
+
+    def __init__(self, after, error=errno.EIO):
+        self.after = after
+        self.error = error
+        self.seen = 0
+
+    def __call__(self, nbytes):
+        self.seen += nbytes
+        if self.seen > self.after:
+            raise OSError(self.error, os.strerror(self.error))
+        return 0.0
+
+
+@pytest.fixture
+def ops(tmp_path):
+    (tmp_path / "cache").mkdir()
+    (tmp_path / "array").mkdir(exist_ok=True)
+    ops = AtomicFileOperations(str(tmp_path / "cache"), str(tmp_path / "array"),
+                               reflink=False, drop_page_cache=False)
+    ops.copy_engine.THROTTLED_CHUNK_SIZE = MiB
+    ops.copy_engine.CHECKPOINT_BYTES = 2 * MiB
+    return ops
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "array" / "movie.mkv"
+    path.parent.mkdir(exist_ok=True)
+    path.write_bytes(os.urandom(SIZE))
+    return str(path)
+
+
+@pytest.fixture
+def dest(ops):
+    return str(ops.cache_path / "movie.mkv")
+
+
+def test_resumes_from_last_checkpoint(ops, source, dest):
+    with pytest.raises(OSError):
+        ops._copy_resumable(source, dest, Interrupt(after=4.5 * MiB))
+
+    assert not os.path.exists(dest)
+    assert os.path.exists(dest + PART_SUFFIX)
+    assert os.path.exists(dest + CHECKPOINT_SUFFIX)
+    assert ops.partial_bytes() > 0
+
+    report = ops._copy_resumable(source, dest)
+
+    assert report.resumed_from == 4 * MiB
+    assert report.bytes_copied == SIZE - 4 * MiB
+    with open(source, 'rb') as a, open(dest, 'rb') as b:
+        assert a.read() == b.read()
+    assert not os.path.exists(dest + PART_SUFFIX)
+    assert not os.path.exists(dest + CHECKPOINT_SUFFIX)
+    assert ops.partial_bytes() == 0
+
+
+def test_changed_source_restarts(ops, source, dest):
+    with pytest.raises(OSError):
+        ops._copy_resumable(source, dest, Interrupt(after=4.5 * MiB))
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    report = ops._copy_resumable(source, dest)
+
+    assert report.resumed_from == 0
+    assert report.bytes_copied == SIZE
+
+
+def test_failure_before_a_checkpoint_discards_the_part(ops, source, dest):
+    with pytest.raises(OSError):
+        ops._copy_resumable(source, dest, Interrupt(after=1.5 * MiB))
+
+    assert not os.path.exists(dest + PART_SUFFIX)
+    assert ops.partial_bytes() == 0
+
+
+def test_out_of_space_discards_the_part(ops, source, dest):
+    with pytest.raises(OSError):
+        ops._copy_resumable(source, dest, Interrupt(after=4.5 * MiB, error=errno.ENOSPC))
+
+    assert not os.path.exists(dest + PART_SUFFIX)
+    assert not os.path.exists(dest + CHECKPOINT_SUFFIX)
+
+
+def test_engine_keeps_data_before_resume_offset(tmp_path, source):
+    dest = str(tmp_path / "copy.mkv")
+    with open(dest, 'wb') as f:
+        f.write(b'\0' * (3 * MiB))  # Stands in for data synced by an earlier attempt
+
+    report = CopyEngine(reflink=False).copy(source, dest, resume_offset=3 * MiB)
+
+    with open(source, 'rb') as a, open(dest, 'rb') as b:
+        original, copied = a.read(), b.read()
+    assert report.resumed_from == 3 * MiB
+    assert copied[:3 * MiB] == b'\0' * (3 * MiB)
+    assert copied[3 * MiB:] == original[3 * MiB:]
+
+
+def test_cached_file_stays_reserved_until_recorded(ops, source, dest):
+    seen = []
+    ops._atomic_symlink_replace = lambda source_path, cache_path: True
+
+    def on_cached(result):
+        seen.append((result.dest_path, ops.space.get_stats()['held']))
+
+    assert ops.copy_to_cache_atomic(source, on_cached=on_cached).success
+    assert seen == [(dest, 1)]
+    # Released by the copy itself, with or without a recorder
+    assert ops.space.get_stats()['reservations'] == 0
@@ -0,0 +1,83 @@
+"""DiskScheduler: stream slots on disk mounts only, and mounts picked up later."""
+
+import os
+import threading
+
+import pytest
+
+from src.core.disks import DiskScheduler
+
+
+@pytest.fixture
+def array(tmp_path):
+    """A user share backed by disk1 and disk2."""
+    for disk, name in [('disk1', 'a.mkv'), ('disk2', 'b.mkv')]:
+        (tmp_path / disk / 'movies').mkdir(parents=True)
+        (tmp_path / disk / 'movies' / name).write_bytes(b"")
+    (tmp_path / 'user' / 'movies').mkdir(parents=True)
+    (tmp_path / 'other').mkdir()
+    return tmp_path
+
+
+def scheduler(root, streams=1):
+    return DiskScheduler(streams, user_share_root=str(root / 'user'),
+                         disk_glob=str(root / 'disk[0-9]*'))
+
+
+def test_user_share_files_resolve_to_their_disk(array):
+    disks = scheduler(array)
+    assert disks.resolve(str(array / 'user/movies/a.mkv')) == 'disk1'
+    assert disks.resolve(str(array / 'user/movies/b.mkv')) == 'disk2'
+    assert disks.resolve(str(array / 'other/c.mkv')) == f"dev:{os.lstat(array / 'other').st_dev}"
+
+
+def test_only_disk_mounts_are_limited(array):
+    disks = scheduler(array)
+    device = disks.resolve(str(array / 'other/c.mkv'))
+
+    assert disks.try_acquire('disk1')
+    assert not disks.try_acquire('disk1')
+    assert disks.try_acquire('disk2')
+    # A device may span the whole array, so it never runs out of slots
+    assert disks.try_acquire(device) and disks.try_acquire(device)
+
+    disks.release('disk1')
+    assert disks.try_acquire('disk1')
+    assert disks.get_stats()['disks']['disk1'] == {'queued': 0, 'active': 1, 'completed': 1}
+
+
+def test_slot_waits_for_the_disk_and_is_reentrant(array):
+    disks = scheduler(array)
+    path = str(array / 'user/movies/a.mkv')
+    entered = threading.Event()
+
+    def other_copy():
+        with disks.slot(path):
+            entered.set()
+
+    assert disks.try_acquire('disk1')  # As the transfer queue does
+    with disks.slot(path) as disk:  # The job's own copy reuses the slot
+        assert disk == 'disk1'
+        waiter = threading.Thread(target=other_copy)
+        waiter.start()
+        assert not entered.wait(0.1)
+    assert not entered.wait(0.1)
+
+    disks.release('disk1')
+    waiter.join(5)
+    assert entered.is_set()
+
+
+def test_new_disk_mounts_are_picked_up(array):
+    disks = scheduler(array)
+    disks.MOUNT_RETRY_SECONDS = 0
+    path = str(array / 'user/movies/c.mkv')
+    assert disks.resolve(path).startswith('dev:')
+
+    (array / 'disk3' / 'movies').mkdir(parents=True)
+    (array / 'disk3' / 'movies' / 'c.mkv').write_bytes(b"")
+    assert disks.resolve(str(array / 'user/movies/new.mkv')).startswith('dev:')
+
+    # Listing the new mount drops paths resolved before it appeared
+    assert disks.resolve(path) == 'disk3'
+    assert disks.is_physical('disk3')
@@ -0,0 +1,78 @@
+"""EvictionIndex must list files in the order full rescoring would, as they age."""
+
+import pytest
+
+from src.core.trackers import CachePriorityScorer, EvictionIndex, TimestampRecord
+
+
+HOUR = 3600.0
+T0 = 1_700_000_000.0
+
+
+@pytest.fixture
+def index_with_files():
+    """Files cached at staggered times just before T0, from every source."""
+    index = EvictionIndex()
+    entries = {}
+    sources = list(CachePriorityScorer.SOURCE_SCORES)
+    for i in range(60):
+        cached_at = T0 - (i * 2.7 + 0.5) * HOUR
+        entry = TimestampRecord(cached_at, sources[i % len(sources)],
+                                file_size_bytes=(i + 1) * 1000, access_count=i % 4)
+        entries[f'/cache/f{i:02d}.mkv'] = entry
+        index.update(f'/cache/f{i:02d}.mkv', entry, now=T0)
+    return index, entries
+
+
+def expected_order(entries, now):
+    return sorted(CachePriorityScorer.calculate(entry, now=now) for entry in entries.values())
+
+
+@pytest.mark.parametrize('hours_later', [0, 1.6, 5, 23.5, 24, 71, 100, 170, 1000])
+def test_scores_follow_tier_boundaries(index_with_files, hours_later):
+    index, entries = index_with_files
+    now = T0 + hours_later * HOUR
+
+    candidates = list(index.iter_candidates(now))
+
+    assert [c[1] for c in candidates] == expected_order(entries, now)
+    for path, priority, size, age in candidates:
+        assert priority == CachePriorityScorer.calculate(entries[path], now=now)
+        assert size == entries[path].file_size_bytes
+        assert age == pytest.approx(entries[path].age_hours(now))
+
+
+def test_repeated_queries_move_files_forward_only(index_with_files):
+    index, entries = index_with_files
+    for step in range(0, 200, 7):
+        now = T0 + step * HOUR
+        assert [c[1] for c in index.iter_candidates(now)] == expected_order(entries, now)
+
+
+def test_removed_and_rescored_files(index_with_files):
+    index, entries = index_with_files
+    removed = list(entries)[::3]
+    for path in removed:
+        index.remove(path)
+        del entries[path]
+    bumped = list(entries)[0]
+    entries[bumped].access_count += 3
+    index.update(bumped, entries[bumped], now=T0)
+
+    now = T0 + 30 * HOUR
+    candidates = list(index.iter_candidates(now))
+
+    assert len(index) == len(entries)
+    assert {c[0] for c in candidates} == set(entries)
+    assert [c[1] for c in candidates] == expected_order(entries, now)
+
+
+def test_missing_timestamp_scores_without_recency():
+    index = EvictionIndex()
+    entry = {'source': 'watchlist', 'file_size_bytes': 5}
+    index.update('/cache/x.mkv', entry)
+
+    [(path, priority, size, age)] = index.iter_candidates(T0)
+
+    assert (path, size, age) == ('/cache/x.mkv', 5, None)
+    assert priority == CachePriorityScorer.calculate(entry, now=T0)
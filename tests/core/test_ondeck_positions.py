@@ -0,0 +1,56 @@
+"""OnDeckTracker's per-show index matches a scan of every entry."""
+
+import pytest
+
+from src.core.trackers import EpisodeInfo, OnDeckTracker
+
+
+def add(tracker, show, season, episode, current, user='alice'):
+    path = f'/media/tv/{show}/S{season:02d}E{episode:02d}.mkv'
+    tracker.update_entry(path, user, EpisodeInfo(show, season, episode), is_current_ondeck=current)
+    return path
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    tracker = OnDeckTracker(str(tmp_path / "ondeck.json"))
+    # Two users on different episodes of one show, plus the episodes after
+    add(tracker, 'Show', 1, 3, True)
+    add(tracker, 'Show', 2, 1, True, user='bob')
+    for episode in (4, 5, 6):
+        add(tracker, 'Show', 1, episode, False)
+    add(tracker, 'Show', 2, 2, False)
+    add(tracker, 'Other Show', 1, 1, True)
+    yield tracker
+    tracker.close()
+
+
+def test_positions_are_per_show_and_case_insensitive(tracker):
+    assert tracker.get_ondeck_positions('show') == [(1, 3), (2, 1)]
+    assert tracker.get_earliest_ondeck('SHOW') == (1, 3)
+    assert tracker.get_earliest_ondeck('Missing') is None
+
+
+def test_episodes_ahead_counts_tracked_episodes_after_the_earliest(tracker):
+    assert tracker.get_episodes_ahead('Show', 1, 3) == 0
+    assert tracker.get_episodes_ahead('Show', 1, 5) == 2
+    assert tracker.get_episodes_ahead('Show', 2, 2) == 5  # 1x4-1x6, 2x1 and itself
+    assert tracker.get_episodes_ahead('Other Show', 1, 1) == 0
+
+
+def test_scoring_context_carries_episodes_ahead(tracker):
+    context = tracker.get_scoring_context()
+    assert context['/media/tv/Show/S01E04.mkv']['episode_info']['episodes_ahead'] == 1
+    assert context['/media/tv/Show/S01E03.mkv']['episode_info']['is_current_ondeck']
+    assert context['/media/tv/Show/S01E03.mkv']['episode_info']['episodes_ahead'] == 0
+
+
+def test_index_follows_changes(tracker):
+    # Bob moves on: 2x1 is no longer a current position
+    add(tracker, 'Show', 2, 1, False, user='bob')
+    assert tracker.get_ondeck_positions('Show') == [(1, 3)]
+
+    tracker.cleanup_stale(max_days=-1)
+    assert tracker.get_ondeck_positions('Show') == []
+    assert tracker.get_episodes_ahead('Show', 2, 2) == 0
+    assert tracker.get_scoring_context() == {}
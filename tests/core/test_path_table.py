@@ -0,0 +1,77 @@
+"""PathTable: shared strings, reference counting and honest memory stats."""
+
+import sys
+
+from src.core.path_table import PathTable
+
+
+def episode(i):
+    return (f"/media/tv/Show {i // 50}/Season 01/"
+            f"Show {i // 50} - S01E{i % 50:02d} - An Episode Title [WEBDL-1080p].mkv")
+
+
+def copy_of(path):
+    """An equal string that is a different object (as loaded from another store)."""
+    return (path + ".")[:-1]
+
+
+def test_owners_share_one_string():
+    table = PathTable()
+    path = episode(1)
+    first = table.intern(path)
+    second = table.intern(copy_of(path))
+
+    assert second is first
+    assert table.canonical(copy_of(path)) is first
+    assert table.get_stats()['intern_hits'] == 1
+
+
+def test_path_is_dropped_with_its_last_reference():
+    table = PathTable()
+    path = episode(1)
+    for _ in range(3):
+        table.intern(copy_of(path))
+
+    table.release(path)
+    table.release(path)
+    assert len(table) == 1
+    table.release(path)
+    assert len(table) == 0
+    table.release(path)  # Unknown paths are ignored
+
+    stats = table.get_stats()
+    assert (stats['references'], stats['string_bytes'], stats['saved_bytes']) == (0, 0, 0)
+
+
+def test_stats_match_a_full_walk():
+    table = PathTable()
+    owners = {}
+    for i in range(300):
+        for _ in range(i % 4 + 1):
+            table.intern(copy_of(episode(i)))
+        owners[episode(i)] = i % 4 + 1
+    for i in range(0, 300, 7):
+        table.release(episode(i))
+        owners[episode(i)] -= 1
+    owners = {path: count for path, count in owners.items() if count}
+
+    stats = table.get_stats()
+    assert stats['unique_paths'] == len(owners)
+    assert stats['references'] == sum(owners.values())
+    assert stats['shared_paths'] == sum(1 for count in owners.values() if count > 1)
+    assert stats['string_bytes'] == sum(sys.getsizeof(p) for p in owners)
+    assert stats['saved_bytes'] == sum(sys.getsizeof(p) * (c - 1) for p, c in owners.items())
+
+
+def test_net_savings_account_for_the_table():
+    unshared = PathTable()
+    shared = PathTable()
+    for i in range(2000):
+        unshared.intern(copy_of(episode(i)))
+        shared.intern(copy_of(episode(i)))
+        shared.intern(copy_of(episode(i)))
+
+    # A path only one owner holds costs its table slot and saves nothing
+    assert unshared.get_stats()['net_saved_bytes'] < 0
+    # A path two owners hold saves a whole string copy
+    assert shared.get_stats()['net_saved_bytes'] > 0
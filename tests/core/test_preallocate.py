@@ -0,0 +1,124 @@
+"""Copies claim the destination's full size before reading data, so a full drive fails early."""
+
+import errno
+import os
+
+import pytest
+
+from src.core.file_operations import PART_SUFFIX, AtomicFileOperations, CopyEngine
+
+
+MiB = 1024 * 1024
+SIZE = 3 * MiB
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'posix_fallocate'),
+                                reason="posix_fallocate not available")
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "movie.mkv"
+    path.write_bytes(os.urandom(SIZE))
+    return str(path)
+
+
+@pytest.fixture
+def fallocate_fails(monkeypatch):
+    """Make posix_fallocate fail with the errno the test sets."""
+    calls = []
+
+    def fail(error):
+        def fallocate(fd, offset, length):
+            calls.append((offset, length))
+            raise OSError(error, os.strerror(error))
+        monkeypatch.setattr(os, 'posix_fallocate', fallocate)
+        return calls
+    return fail
+
+
+def engine():
+    return CopyEngine(reflink=False, drop_cache=False)
+
+
+def test_destination_is_allocated_before_any_data(tmp_path, source):
+    dest = str(tmp_path / "copy.mkv")
+    events = []
+
+    engine().copy(source, dest,
+                  preallocated=lambda: events.append(('allocated', os.stat(dest).st_size)),
+                  progress=lambda nbytes: events.append(('copied', nbytes)))
+
+    assert events[0] == ('allocated', SIZE)
+    assert sum(n for kind, n in events[1:] if kind == 'copied') == SIZE
+    assert open(dest, 'rb').read() == open(source, 'rb').read()
+
+
+def test_no_preallocation_without_a_callback(tmp_path, source, monkeypatch):
+    calls = []
+    monkeypatch.setattr(os, 'posix_fallocate', lambda *args: calls.append(args))
+
+    engine().copy(source, str(tmp_path / "copy.mkv"))
+
+    assert calls == []
+
+
+def test_out_of_space_fails_before_reading(tmp_path, source, fallocate_fails):
+    calls = fallocate_fails(errno.ENOSPC)
+    dest = tmp_path / "copy.mkv"
+    events = []
+
+    with pytest.raises(OSError) as exc:
+        engine().copy(source, str(dest), preallocated=lambda: events.append('allocated'),
+                      progress=events.append)
+
+    assert exc.value.errno == errno.ENOSPC
+    assert calls == [(0, SIZE)]
+    assert events == []
+    assert dest.stat().st_size == 0
+
+
+def test_out_of_space_on_resume_keeps_the_copied_data(tmp_path, source, fallocate_fails):
+    fallocate_fails(errno.ENOSPC)
+    dest = tmp_path / "copy.mkv"
+    dest.write_bytes(open(source, 'rb').read()[:MiB])
+
+    with pytest.raises(OSError):
+        engine().copy(source, str(dest), resume_offset=MiB, preallocated=lambda: None)
+
+    assert dest.read_bytes() == open(source, 'rb').read()[:MiB]
+
+
+def test_unsupported_filesystems_copy_without_preallocation(tmp_path, source, fallocate_fails):
+    fallocate_fails(errno.EOPNOTSUPP)
+    dest = tmp_path / "copy.mkv"
+    events = []
+
+    engine().copy(source, str(dest), preallocated=lambda: events.append('allocated'))
+
+    assert events == []
+    assert dest.read_bytes() == open(source, 'rb').read()
+
+
+def test_reserved_part_is_allocated_and_written(tmp_path, source):
+    (tmp_path / "cache").mkdir()
+    ops = AtomicFileOperations(str(tmp_path / "cache"), str(tmp_path),
+                               reflink=False, drop_page_cache=False)
+    dest = str(ops.cache_path / "movie.mkv")
+    sizes = []
+    try:
+        with ops.space.reserve(dest, SIZE) as reservation:
+            mark_allocated = reservation.mark_allocated
+
+            def allocated():
+                sizes.append(os.stat(dest + PART_SUFFIX).st_size)
+                mark_allocated()
+
+            reservation.mark_allocated = allocated
+            ops._copy_resumable(source, dest, reservation=reservation)
+            assert reservation.allocated
+            assert reservation.unwritten == 0
+    finally:
+        ops.stop(timeout=5)
+
+    assert sizes == [SIZE]
+    assert open(dest, 'rb').read() == open(source, 'rb').read()
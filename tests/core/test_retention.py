@@ -0,0 +1,120 @@
+"""RetentionScheduler deadlines must never be later than CacheManager._should_restore()."""
+
+import itertools
+import json
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.cache_manager import CacheManager
+from src.core.retention import NEVER, RetentionScheduler
+from src.core.trackers import CacheTimestampTracker, OnDeckTracker, WatchlistTracker
+
+
+HOUR = 3600
+DAY = 86400
+
+# Ages and list memberships chosen well away from every policy boundary
+AGES_HOURS = [1, 5, 30, 80, 200, 1000]
+WATCHLISTED_DAYS = [None, 1, 10, 40]
+
+
+def iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+@pytest.fixture
+def library(tmp_path):
+    """Cached files covering every age x OnDeck x watchlist combination."""
+    now = time.time()
+    timestamps, ondeck, watchlist = {}, {}, {}
+    combos = itertools.product(AGES_HOURS, [False, True], WATCHLISTED_DAYS)
+    for i, (age, on_ondeck, watch_days) in enumerate(combos):
+        path = f'/mnt/cache/media/f{i}.mkv'
+        timestamps[path] = {'cached_at': iso(now - age * HOUR), 'source': 'ondeck',
+                            'file_size_bytes': 1}
+        if on_ondeck:
+            ondeck[path] = {'users': ['u'], 'last_seen': iso(now)}
+        if watch_days is not None:
+            watchlist[path] = {'users': ['u'], 'watchlisted_at': iso(now - watch_days * DAY),
+                               'last_seen': iso(now)}
+
+    files = {'timestamps.json': timestamps, 'ondeck.json': ondeck, 'watchlist.json': watchlist}
+    for name, data in files.items():
+        (tmp_path / name).write_text(json.dumps(data))
+
+    return SimpleNamespace(
+        timestamp_tracker=CacheTimestampTracker(str(tmp_path / 'timestamps.json')),
+        ondeck_tracker=OnDeckTracker(str(tmp_path / 'ondeck.json')),
+        watchlist_tracker=WatchlistTracker(str(tmp_path / 'watchlist.json')),
+    )
+
+
+def policy(min_hours=12, watchlist_days=14, max_hours=0, ondeck_protected=True):
+    return SimpleNamespace(retention=SimpleNamespace(
+        min_retention_hours=min_hours,
+        watchlist_retention_days=watchlist_days,
+        max_cache_hours=max_hours,
+        ondeck_protected=ondeck_protected,
+    ))
+
+
+POLICIES = [
+    policy(),
+    policy(max_hours=72),
+    policy(watchlist_days=0, max_hours=500),
+    policy(min_hours=0, ondeck_protected=False, max_hours=24),
+    policy(min_hours=48, watchlist_days=7, ondeck_protected=False),
+]
+
+
+@pytest.mark.parametrize('config', POLICIES)
+def test_deadline_never_later_than_full_scan(library, config):
+    library.config = config
+    scheduler = RetentionScheduler(library.timestamp_tracker, library.ondeck_tracker,
+                                   library.watchlist_tracker, config)
+    now = time.time()
+
+    for path, entry in library.timestamp_tracker.get_all_entries().items():
+        restore, reason = CacheManager._should_restore(library, path, entry)
+        deadline = scheduler._compute_deadline(path, now)
+        if restore:
+            assert deadline <= now, (path, reason)
+        elif not library.ondeck_tracker.get_entry(path) and not library.watchlist_tracker.get_entry(path):
+            # Off every list, the deadline is exact
+            assert deadline > now, (path, reason)
+
+
+def test_pop_due_returns_each_file_once(library):
+    config = policy()
+    scheduler = RetentionScheduler(library.timestamp_tracker, library.ondeck_tracker,
+                                   library.watchlist_tracker, config)
+    now = time.time()
+
+    due = scheduler.pop_due(now)
+
+    assert due
+    assert all(scheduler._compute_deadline(path, now) <= now for path in due)
+    assert scheduler.pop_due(now) == []
+
+    # Kept files come back once their new deadline passes
+    scheduler.reschedule(due[0], now)
+    assert scheduler.pop_due(now) == [due[0]]
+
+
+def test_list_changes_reschedule_files(library):
+    config = policy()
+    scheduler = RetentionScheduler(library.timestamp_tracker, library.ondeck_tracker,
+                                   library.watchlist_tracker, config)
+    now = time.time()
+    scheduler.pop_due(now)
+    protected = next(path for path in library.timestamp_tracker.get_all_entries()
+                     if scheduler._deadlines.get(path) == NEVER)
+
+    library.ondeck_tracker.remove_entry(protected)
+    library.watchlist_tracker.remove_entry(protected)
+
+    later = now + 1000 * HOUR
+    assert protected in scheduler.pop_due(later)
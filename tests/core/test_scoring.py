@@ -0,0 +1,88 @@
+"""Batch eviction scoring must match CachePriorityScorer.calculate() exactly."""
+
+import random
+
+import pytest
+
+from src.core import trackers
+from src.core.trackers import CachePriorityScorer, TimestampRecord
+
+
+NOW = 1_700_000_000.0
+
+# Ages on and around every recency tier boundary, plus missing timestamps
+AGES = [None, 0, 1.99, 2, 5.99, 6, 23.99, 24, 71.99, 72, 167.99, 168, 168.01, 400]
+
+
+def make_entries(count=500, seed=7):
+    rng = random.Random(seed)
+    sources = list(CachePriorityScorer.SOURCE_SCORES) + ['something_new']
+    entries = {}
+    for i in range(count):
+        age = rng.choice(AGES)
+        cached_at = None if age is None else NOW - age * 3600
+        source = rng.choice(sources)
+        access_count = rng.randint(0, 8)
+        if i % 2:
+            entry = TimestampRecord(cached_at, source, rng.randint(0, 10 ** 9), access_count)
+        else:
+            entry = {'source': source, 'access_count': access_count,
+                     'users': ['u'] * rng.randint(0, 5)}
+            if cached_at is not None:
+                entry['cached_at'] = TimestampRecord(cached_at)['cached_at']
+            if rng.random() < 0.5:
+                entry['episode_info'] = {
+                    'is_current_ondeck': rng.random() < 0.3,
+                    'episodes_ahead': rng.randint(0, 6),
+                }
+        entries[f'/media/file{i}.mkv'] = entry
+    return entries
+
+
+@pytest.fixture(params=[True, False], ids=['numpy', 'scalar'])
+def numpy_available(request, monkeypatch):
+    if request.param and not trackers.NUMPY_AVAILABLE:
+        pytest.skip("NumPy not installed")
+    monkeypatch.setattr(trackers, 'NUMPY_AVAILABLE', request.param)
+    return request.param
+
+
+@pytest.mark.parametrize('number_episodes', [1, 2, 5, 10])
+def test_batch_matches_calculate(numpy_available, number_episodes):
+    entries = make_entries()
+    playing = set(list(entries)[::17])
+
+    scores = CachePriorityScorer.score_entries(
+        entries, playing, number_episodes_setting=number_episodes, now=NOW
+    )
+
+    expected = [
+        (path, CachePriorityScorer.calculate(entry, path in playing, number_episodes, now=NOW))
+        for path, entry in entries.items()
+    ]
+    assert scores == expected
+
+
+def test_batch_of_nothing(numpy_available):
+    assert CachePriorityScorer.score_entries({}, now=NOW) == []
+
+
+def test_candidates_match_row_by_row(numpy_available):
+    entries = make_entries(seed=11)
+    now = NOW
+    candidates = CachePriorityScorer.get_eviction_candidates(
+        entries, target_bytes=10 ** 15, min_priority=70, protected_hours=2.0, now=now
+    )
+
+    # Same selection as scoring each eligible row with calculate()
+    scored = []
+    for path, entry in entries.items():
+        hours = trackers._entry_age_hours(entry, now)
+        if hours is not None and hours < 2.0:
+            continue
+        priority = CachePriorityScorer.calculate(entry, now=now)
+        if priority < 70:
+            scored.append((path, priority, entry.get('file_size_bytes', 0)))
+    scored.sort(key=lambda c: c[1])
+
+    assert candidates == scored
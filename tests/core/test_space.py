@@ -0,0 +1,156 @@
+"""SpaceLedger admission against free space and the cache limit."""
+
+import errno
+import threading
+import time
+
+import pytest
+
+from src.core.space import SpaceDeferred, SpaceLedger
+
+
+class FakeDisk(SpaceLedger):
+    """Ledger whose free space is set by the test instead of statvfs."""
+
+    def __init__(self, free, **kwargs):
+        super().__init__("/", **kwargs)
+        self.free = free
+
+    def free_bytes(self):
+        return self.free
+
+
+def test_unallocated_reservations_hide_free_space():
+    ledger = FakeDisk(free=100)
+
+    with ledger.reserve('/cache/a', 60) as first:
+        assert ledger.available_bytes() == 40
+        with pytest.raises(OSError) as exc:
+            with ledger.reserve('/cache/b', 50):
+                pass
+        assert exc.value.errno == errno.ENOSPC
+
+        # Once the blocks are claimed, statvfs accounts for them instead
+        first.mark_allocated()
+        ledger.free = 40
+        assert ledger.available_bytes() == 40
+
+    assert ledger.get_stats()['reservations'] == 0
+
+
+def test_written_bytes_reduce_unwritten():
+    ledger = FakeDisk(free=100)
+    with ledger.reserve('/cache/a', 60) as reservation:
+        reservation.add_written(25)
+        assert ledger.reserved_bytes() == 35
+        reservation.add_written(100)
+        assert reservation.unwritten == 0
+
+
+def test_limit_counts_usage_and_reservations():
+    ledger = FakeDisk(free=10 ** 12, limit_bytes=100)
+    usage = [30]
+    ledger.configure(usage=lambda: usage[0])
+
+    with ledger.reserve('/cache/a', 50):
+        with pytest.raises(OSError):
+            with ledger.reserve('/cache/b', 21):
+                pass
+        with ledger.reserve('/cache/c', 20):
+            assert ledger.available_bytes() == 0
+
+    assert ledger.get_stats()['rejected'] == 1
+
+
+def test_eviction_is_asked_for_the_shortfall_only():
+    ledger = FakeDisk(free=10 ** 12, limit_bytes=100)
+    usage = [90]
+    requests = []
+
+    def make_room(nbytes, priority):
+        requests.append((nbytes, priority, threading.current_thread().name))
+        usage[0] -= nbytes
+        return nbytes
+
+    ledger.configure(usage=lambda: usage[0], make_room=make_room)
+    with ledger.reserve('/cache/a', 25, priority=3):
+        pass
+
+    # Evicted on the ledger's own thread, with the copy's priority as the floor
+    assert requests == [(15, 3, 'cacherr-space-evict')]
+    assert ledger.get_stats()['evicted_bytes'] == 15
+
+
+def test_queued_copy_is_deferred_while_eviction_runs():
+    ledger = FakeDisk(free=10 ** 12, limit_bytes=100)
+    usage = [90]
+    gate = threading.Event()
+
+    def make_room(nbytes, priority):
+        gate.wait(5)
+        usage[0] -= nbytes
+        return nbytes
+
+    ledger.configure(usage=lambda: usage[0], make_room=make_room)
+    with pytest.raises(SpaceDeferred):
+        with ledger.reserve('/cache/a', 25, defer=True):
+            pass
+
+    gate.set()
+    while ledger.get_stats()['eviction_requests'] < 1:
+        time.sleep(0.01)
+    # The retry waits for the eviction it asked for instead of asking again
+    with ledger.reserve('/cache/a', 25, defer=True):
+        pass
+    stats = ledger.get_stats()
+    assert (stats['deferred'], stats['eviction_requests'], stats['admitted']) == (1, 1, 1)
+
+
+def test_waits_for_in_flight_copies():
+    ledger = FakeDisk(free=10 ** 12, limit_bytes=100, wait_seconds=5)
+    ledger.configure(usage=lambda: 0)
+    admitted = threading.Event()
+
+    def copy_b():
+        with ledger.reserve('/cache/b', 50):
+            admitted.set()
+
+    with ledger.reserve('/cache/a', 80):
+        waiter = threading.Thread(target=copy_b)
+        waiter.start()
+        assert not admitted.wait(0.1)
+
+    waiter.join(5)
+    assert admitted.is_set()
+    assert ledger.get_stats()['waited'] == 1
+
+
+def test_held_reservation_counts_until_released():
+    ledger = FakeDisk(free=10 ** 12, limit_bytes=100)
+    usage = [0]
+    ledger.configure(usage=lambda: usage[0])
+
+    with ledger.reserve('/cache/a', 60) as reservation:
+        ledger.hold(reservation)
+
+    # The copy landed but the tracker hasn't recorded it yet
+    assert ledger.available_bytes() == 40
+    assert ledger.get_stats()['held'] == 1
+
+    usage[0] = 60
+    ledger.release('/cache/a')
+    assert ledger.available_bytes() == 40
+    assert ledger.get_stats()['reservations'] == 0
+
+
+def test_hold_covers_the_whole_file():
+    ledger = FakeDisk(free=10 ** 12, limit_bytes=100)
+    ledger.configure(usage=lambda: 0)
+
+    # A resumed copy only reserved what its .part was missing
+    with ledger.reserve('/cache/a', 20) as reservation:
+        ledger.hold(reservation, 70)
+
+    assert ledger.available_bytes() == 30
+    ledger.release('/cache/a')
+    assert ledger.available_bytes() == 100
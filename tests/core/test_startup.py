@@ -0,0 +1,51 @@
+"""Background startup: lazy tracker loads and work gated until start() finishes."""
+
+import json
+import threading
+from types import SimpleNamespace
+
+from src.core.cache_manager import CacheManager
+from src.core.trackers import CacheTimestampTracker
+from src.db.store import JsonTrackerStore
+
+
+class SlowStore(JsonTrackerStore):
+    """JSON store whose load() waits for the test to let it finish."""
+
+    def __init__(self, path):
+        super().__init__(path, "cache_timestamp")
+        self.gate = threading.Event()
+
+    def load(self):
+        self.gate.wait(5)
+        return super().load()
+
+
+def test_lazy_tracker_blocks_callers_until_loaded(tmp_path):
+    path = tmp_path / "timestamps.json"
+    path.write_text(json.dumps({'/cache/a.mkv': {'cached_at': 0.0, 'source': 'ondeck',
+                                                 'file_size_bytes': 10}}))
+    store = SlowStore(str(path))
+
+    tracker = CacheTimestampTracker(str(path), store=store, lazy=True)
+    assert not tracker.ready
+    assert not tracker.wait_ready(0.05)
+
+    sizes = []
+    reader = threading.Thread(target=lambda: sizes.append(tracker.total_size()))
+    reader.start()
+    reader.join(0.05)
+    assert sizes == []  # Still waiting for the load
+
+    store.gate.set()
+    assert tracker.wait_ready(5)
+    reader.join(5)
+    assert sizes == [10]
+    tracker.close()
+
+
+def test_cycle_is_skipped_until_started():
+    manager = SimpleNamespace(started=False)
+    summary = CacheManager.run_cache_cycle(manager)
+    assert summary['skipped'] == 'starting'
+    assert summary['files_cached'] == 0
@@ -0,0 +1,74 @@
+"""Bandwidth limits: validation, token buckets and when copies count as limited."""
+
+import os
+
+import pytest
+
+from src.core.file_operations import CopyEngine
+from src.core.throttle import MB, TO_ARRAY, TO_CACHE, BandwidthLimiter, TokenBucket
+
+
+MiB = 1024 * 1024
+
+
+def test_invalid_change_is_rejected_as_a_whole():
+    limiter = BandwidthLimiter(to_cache_mb_s=50)
+    with pytest.raises(ValueError):
+        limiter.set_limits(to_cache_mb_s=10, per_disk_to_array_mb_s=-1)
+
+    assert limiter.get_limits()[TO_CACHE]['global'] == 50
+    assert limiter.get_limits()[TO_ARRAY]['per_disk'] == 0
+
+
+def test_limited_flag_follows_the_limits_that_apply():
+    limiter = BandwidthLimiter(session_backoff_mb_s=20)
+    to_cache = limiter.for_transfer(TO_CACHE, 'disk1')
+    assert not to_cache.limited
+
+    # The session backoff only applies to disks someone is streaming from
+    limiter.set_busy_disks(['disk2'])
+    assert not to_cache.limited
+    assert limiter.for_transfer(TO_CACHE, 'disk2').limited
+
+    limiter.set_limits(per_disk_to_cache_mb_s=100)
+    assert to_cache.limited
+    assert not limiter.for_transfer(TO_ARRAY, 'disk1').limited
+
+    limiter.set_limits(per_disk_to_cache_mb_s=0)
+    assert not to_cache.limited
+
+
+def test_bucket_charges_the_overdraft():
+    bucket = TokenBucket(rate=10 * MB)
+    assert bucket.delay_for(5 * MB) == pytest.approx(0.5, abs=0.01)
+    assert bucket.delay_for(5 * MB) == pytest.approx(1.0, abs=0.01)
+
+    bucket.set_rate(0)
+    assert bucket.delay_for(100 * MB) == 0
+
+
+def test_unlimited_transfers_are_metered_without_waiting():
+    limiter = BandwidthLimiter()
+    assert limiter.for_transfer(TO_CACHE, 'disk1')(64 * MiB) == 0
+    stats = limiter.get_stats()[TO_CACHE]
+    assert (stats['bytes'], stats['throttled_seconds']) == (64 * MiB, 0)
+
+
+@pytest.mark.parametrize('limited, chunk', [(False, MiB), (True, 256 * 1024)])
+def test_only_limited_copies_use_small_chunks(tmp_path, limited, chunk):
+    source = tmp_path / "movie.mkv"
+    source.write_bytes(os.urandom(2 * MiB))
+    engine = CopyEngine(reflink=False, drop_cache=False)
+    engine.CHUNK_SIZE = MiB
+    engine.THROTTLED_CHUNK_SIZE = 256 * 1024
+
+    chunks = []
+
+    class Throttle:
+        def __call__(self, nbytes):
+            chunks.append(nbytes)
+            return 0.0
+
+    Throttle.limited = limited
+    engine.copy(str(source), str(tmp_path / "copy.mkv"), throttle=Throttle())
+    assert set(chunks) == {chunk}
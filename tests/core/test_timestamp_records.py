@@ -0,0 +1,88 @@
+"""Timestamp records persist in the original dict format and load back as records."""
+
+import json
+import time
+
+import pytest
+
+from src.core.trackers import CacheSource, CacheTimestampTracker, TimestampRecord
+from src.db.journal import JournalTrackerStore
+
+
+@pytest.fixture
+def journal_file(tmp_path):
+    return str(tmp_path / "timestamps.json")
+
+
+def reopen(path):
+    return CacheTimestampTracker(path, store=JournalTrackerStore(path, "cache_timestamp"))
+
+
+def test_record_reads_like_the_old_dict():
+    record = TimestampRecord(0.0, 'ondeck', 1234, access_count=2, extra={'note': 'x'})
+
+    assert dict(record) == {
+        'cached_at': '1970-01-01T00:00:00+00:00',
+        'source': 'ondeck',
+        'file_size_bytes': 1234,
+        'access_count': 2,
+        'note': 'x',
+    }
+    assert record.source is CacheSource.ONDECK
+    assert TimestampRecord.from_dict(dict(record)).cached_at == 0.0
+
+
+def test_journal_replay_restores_records(journal_file):
+    tracker = reopen(journal_file)
+    tracker.record('/cache/a.mkv', source='watchlist', file_size=100)
+    tracker.record('/cache/b.mkv', source='ondeck', file_size=200)
+    tracker.record_access('/cache/b.mkv')
+    tracker.remove_entry('/cache/a.mkv')
+    tracker.close()
+
+    reloaded = reopen(journal_file)
+    record = reloaded.get_record('/cache/b.mkv')
+    assert isinstance(record, TimestampRecord)
+    assert record.source is CacheSource.ONDECK
+    assert (record.file_size_bytes, record.access_count) == (200, 1)
+    assert abs(record.age_hours()) < 0.1
+    assert reloaded.get_record('/cache/a.mkv') is None
+    assert reloaded.total_size() == 200
+
+
+def test_old_string_entries_are_migrated(journal_file):
+    with open(journal_file, 'w') as f:
+        json.dump({'/cache/old.mkv': '2024-01-01T00:00:00+00:00'}, f)
+
+    tracker = reopen(journal_file)
+    record = tracker.get_record('/cache/old.mkv')
+    assert record.cached_at == 1704067200.0
+    assert record.source is CacheSource.UNKNOWN
+    tracker.close()
+
+    with open(journal_file) as f:
+        assert json.load(f)['/cache/old.mkv']['source'] == 'unknown'
+
+
+def test_unparseable_timestamp_is_kept(journal_file):
+    with open(journal_file, 'w') as f:
+        json.dump({'/cache/bad.mkv': {'cached_at': 'yesterday', 'source': 'ondeck'}}, f)
+
+    tracker = reopen(journal_file)
+    record = tracker.get_record('/cache/bad.mkv')
+    assert record.age_hours(time.time()) is None
+    assert record['cached_at'] == 'yesterday'
+
+
+def test_all_entries_is_a_read_only_live_view(journal_file):
+    tracker = reopen(journal_file)
+    tracker.record('/cache/a.mkv', file_size=1)
+    entries = tracker.get_all_entries()
+
+    with pytest.raises(TypeError):
+        entries['/cache/b.mkv'] = {}
+
+    tracker.record('/cache/b.mkv', file_size=2)
+    with tracker.locked():
+        assert sorted(entries) == ['/cache/a.mkv', '/cache/b.mkv']
+        assert isinstance(entries['/cache/b.mkv'], TimestampRecord)
@@ -0,0 +1,60 @@
+"""BaseTracker.batch(): one store write per batch, and never more than a few seconds late."""
+
+import time
+
+import pytest
+
+from src.core.trackers import WatchlistTracker
+from src.db.store import JsonTrackerStore
+
+
+class CountingStore(JsonTrackerStore):
+    """JSON store that records each write's changed keys."""
+
+    def __init__(self, path):
+        super().__init__(path, "watchlist")
+        self.writes = []
+
+    def apply(self, data, changes):
+        self.writes.append(sorted(changes))
+        super().apply(data, changes)
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    path = str(tmp_path / "watchlist.json")
+    tracker = WatchlistTracker(path, store=CountingStore(path))
+    yield tracker
+    tracker.close()
+
+
+def test_each_change_is_written_outside_a_batch(tracker):
+    tracker.update_entry('/media/a.mkv', 'alice')
+    tracker.update_entry('/media/b.mkv', 'bob')
+    assert tracker._store.writes == [['/media/a.mkv'], ['/media/b.mkv']]
+
+
+def test_batch_writes_once_when_the_outermost_batch_exits(tracker):
+    with tracker.batch():
+        tracker.update_entry('/media/a.mkv', 'alice')
+        with tracker.batch():
+            tracker.update_entry('/media/b.mkv', 'bob')
+        tracker.update_entry('/media/a.mkv', 'bob')
+        tracker.remove_entry('/media/b.mkv')
+        assert tracker._store.writes == []
+
+    assert tracker._store.writes == [['/media/a.mkv', '/media/b.mkv']]
+    assert set(tracker._store.load()) == {'/media/a.mkv'}
+
+
+def test_long_batch_is_flushed_after_max_dirty_seconds(tracker):
+    tracker.max_dirty_seconds = 0.05
+    with tracker.batch():
+        tracker.update_entry('/media/a.mkv', 'alice')
+        deadline = time.monotonic() + 5
+        while not tracker._store.writes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert tracker._store.writes == [['/media/a.mkv']]
+
+        tracker.update_entry('/media/b.mkv', 'bob')
+    assert tracker._store.writes == [['/media/a.mkv'], ['/media/b.mkv']]
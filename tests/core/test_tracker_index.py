@@ -0,0 +1,49 @@
+"""BaseTracker's basename index answers filename-only get_entry() lookups."""
+
+import pytest
+
+from src.core.trackers import WatchlistTracker
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    tracker = WatchlistTracker(str(tmp_path / "watchlist.json"))
+    tracker.update_entry('/mnt/user/media/movies/Movie (2020).mkv', 'alice')
+    tracker.update_entry('/mnt/user/media/tv/Show/S01E01.mkv', 'alice')
+    tracker.update_entry('/mnt/user/media/tv/Other/S01E01.mkv', 'bob')
+    yield tracker
+    tracker.close()
+
+
+def test_exact_path_is_not_a_fuzzy_match(tracker):
+    assert tracker.get_entry('/mnt/user/media/movies/Movie (2020).mkv')['users'] == ['alice']
+    assert tracker.fuzzy_matches == 0
+
+
+def test_same_file_under_another_root_matches_by_name(tracker):
+    # e.g. the cache path of a file the tracker knows by its array path
+    entry = tracker.get_entry('/mnt/cache/media/movies/Movie (2020).mkv')
+    assert entry['users'] == ['alice']
+    assert tracker.fuzzy_matches == 1
+    assert tracker.get_entry('/mnt/cache/media/movies/Unknown.mkv') is None
+
+
+def test_index_follows_removals(tracker):
+    assert tracker.get_paths_by_name('S01E01.mkv') == [
+        '/mnt/user/media/tv/Show/S01E01.mkv', '/mnt/user/media/tv/Other/S01E01.mkv',
+    ]
+
+    tracker.remove_entry('/mnt/user/media/tv/Show/S01E01.mkv')
+    assert tracker.get_paths_by_name('S01E01.mkv') == ['/mnt/user/media/tv/Other/S01E01.mkv']
+    assert tracker.get_entry('/elsewhere/S01E01.mkv')['users'] == ['bob']
+
+    tracker.remove_entry('/mnt/user/media/tv/Other/S01E01.mkv')
+    assert tracker.get_paths_by_name('S01E01.mkv') == []
+    assert tracker.get_entry('/elsewhere/S01E01.mkv') is None
+
+
+def test_index_is_rebuilt_on_load(tmp_path, tracker):
+    tracker.flush()
+    reloaded = WatchlistTracker(str(tmp_path / "watchlist.json"))
+    assert len(reloaded.get_paths_by_name('S01E01.mkv')) == 2
+    reloaded.close()
@@ -0,0 +1,236 @@
+"""TransferService: deduplication, priority bumps, per-path and per-disk exclusion."""
+
+import threading
+import time
+
+import pytest
+
+from src.core.disks import DiskScheduler
+from src.core.transfers import TransferDeferred, TransferJob, TransferPriority, TransferService
+from src.db.store import JsonTrackerStore
+
+
+class GatedRunner:
+    """Runs jobs only while the gate is open and records what ran when."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.order = []
+        self.overlaps = []
+        self._running = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, job):
+        with self._lock:
+            if job.path in self._running:
+                self.overlaps.append(job.key)
+            self._running.add(job.path)
+            self.order.append(job.key)
+        self.started.set()
+        self.gate.wait(5)
+        time.sleep(0.01)
+        with self._lock:
+            self._running.discard(job.path)
+        return job.key
+
+
+@pytest.fixture
+def runner():
+    runner = GatedRunner()
+    yield runner
+    runner.gate.set()
+
+
+@pytest.fixture
+def service(runner):
+    service = TransferService(runner, {'cache': 1, 'restore': 1})
+    yield service
+    service.stop(timeout=5)
+
+
+def test_duplicate_requests_share_a_future(service, runner):
+    first = service.submit('/a', 'cache')
+    runner.started.wait(5)
+    running_dup = service.submit('/a', 'cache')
+    queued = service.submit('/b', 'cache')
+    queued_dup = service.submit('/b', 'cache')
+
+    assert running_dup is first
+    assert queued_dup is queued
+
+    runner.gate.set()
+    assert first.result(5) == 'cache:/a'
+    assert queued.result(5) == 'cache:/b'
+    assert runner.order == ['cache:/a', 'cache:/b']
+    assert service.get_stats()['deduplicated'] == 2
+
+
+def test_higher_priority_request_moves_a_queued_job_up(service, runner):
+    service.submit('/blocker', 'cache')
+    runner.started.wait(5)
+    later = service.submit('/later', 'cache', source='trakt', priority=TransferPriority.TRAKT)
+    service.submit('/middle', 'cache', source='watchlist', priority=TransferPriority.WATCHLIST)
+
+    # Someone starts watching the Trakt file
+    bumped = service.submit('/later', 'cache', source='active_watching',
+                            priority=TransferPriority.ACTIVE_WATCHING)
+    # A lower-priority duplicate never demotes it
+    service.submit('/later', 'cache', priority=TransferPriority.OTHER)
+
+    runner.gate.set()
+    bumped.result(5)
+    service.stop(timeout=5)
+
+    assert bumped is later
+    assert runner.order == ['cache:/blocker', 'cache:/later', 'cache:/middle']
+
+
+def test_operations_on_one_path_never_overlap(runner):
+    service = TransferService(runner, {'cache': 2, 'restore': 2})
+    try:
+        futures = [service.submit('/same', 'cache'), service.submit('/other', 'cache')]
+        runner.started.wait(5)
+        futures.append(service.submit('/same', 'restore'))
+        time.sleep(0.05)
+        assert 'restore:/same' not in runner.order
+
+        runner.gate.set()
+        for future in futures:
+            future.result(5)
+    finally:
+        service.stop(timeout=5)
+
+    assert runner.overlaps == []
+    assert runner.order.index('restore:/same') > runner.order.index('cache:/same')
+
+
+def test_busy_disk_does_not_hold_up_other_disks(runner):
+    disks = DiskScheduler(1, user_share_root='/nonexistent', disk_glob='/nonexistent')
+    disks.is_physical = lambda disk: True
+    disks.resolve = lambda path: path.split('/')[1]
+    service = TransferService(runner, {'cache': 2, 'restore': 1}, disks=disks)
+    try:
+        first = service.submit('/disk1/a', 'cache')
+        runner.started.wait(5)
+        same_disk = service.submit('/disk1/b', 'cache', priority=TransferPriority.ACTIVE_WATCHING)
+        other_disk = service.submit('/disk2/c', 'cache', priority=TransferPriority.TRAKT)
+        while len(runner.order) < 2:
+            time.sleep(0.01)
+        # The second worker skipped the higher-priority job for the busy disk
+        assert runner.order == ['cache:/disk1/a', 'cache:/disk2/c']
+
+        runner.gate.set()
+        for future in (first, same_disk, other_disk):
+            future.result(5)
+    finally:
+        service.stop(timeout=5)
+
+    assert disks.get_stats()['disks']['disk1'] == {'queued': 0, 'active': 0, 'completed': 2}
+
+
+def test_deferred_job_waits_in_the_queue():
+    ran = []
+
+    def runner(job):
+        ran.append(job.key)
+        if job.path == '/a' and ran.count(job.key) == 1:
+            raise TransferDeferred("waiting for space", 0.1)
+        return job.key
+
+    service = TransferService(runner, {'cache': 1, 'restore': 1})
+    try:
+        deferred = service.submit('/a', 'cache', priority=TransferPriority.ACTIVE_WATCHING)
+        other = service.submit('/b', 'cache')
+        assert deferred.result(5) == 'cache:/a'
+        other.result(5)
+    finally:
+        service.stop(timeout=5)
+
+    # The worker ran the other job instead of waiting with the deferred one
+    assert ran == ['cache:/a', 'cache:/b', 'cache:/a']
+    assert service.get_stats()['deferred'] == 1
+
+
+def test_listeners_run_before_the_future_resolves(service, runner):
+    seen = []
+    service.add_listener(lambda job, result: seen.append((job.key, result, job.future.done())))
+    runner.gate.set()
+
+    service.submit('/a', 'cache').result(5)
+
+    assert seen == [('cache:/a', 'cache:/a', False)]
+
+
+def test_request_from_a_listener_joins_the_finishing_transfer(service, runner):
+    joined = []
+    service.add_listener(lambda job, result: joined.append(service.submit(job.path, job.operation)))
+    runner.gate.set()
+
+    future = service.submit('/a', 'cache')
+    future.result(5)
+
+    assert joined == [future]
+    assert runner.order == ['cache:/a']
+
+
+class SlowStore(JsonTrackerStore):
+    """Store whose first write waits for the test."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.gate = threading.Event()
+        self.writes = []
+
+    def apply(self, data, changes):
+        self.writes.append(sorted(changes))
+        if len(self.writes) == 1:
+            self.gate.wait(5)
+        super().apply(data, changes)
+
+
+def test_store_writes_dont_hold_up_the_queue(tmp_path, runner):
+    service = TransferService(runner, {'cache': 1, 'restore': 1})
+    store = SlowStore(str(tmp_path / "transfer_queue.json"))
+    service.attach_store(store)
+    try:
+        writer = threading.Thread(target=service.submit, args=('/a', 'cache'))
+        writer.start()
+        while not store.writes:
+            time.sleep(0.01)
+
+        # Queued while the first write is stuck; written by that thread
+        start = time.monotonic()
+        service.submit('/b', 'cache')
+        service.submit('/c', 'cache')
+        assert time.monotonic() - start < 1
+
+        store.gate.set()
+        writer.join(5)
+        assert store.writes == [['cache:/a'], ['cache:/b', 'cache:/c']]
+        assert set(store.load()) == {'cache:/a', 'cache:/b', 'cache:/c'}
+    finally:
+        store.gate.set()
+        runner.gate.set()
+        service.stop(timeout=5)
+
+
+def test_saved_queue_is_resumed(tmp_path, runner):
+    queue_file = str(tmp_path / "transfer_queue.json")
+    saved = TransferJob('/a', 'restore', 'retention', TransferPriority.OTHER,
+                        options={'remove_cache_copy': False})
+    JsonTrackerStore(queue_file).replace({saved.key: saved.to_dict()})
+
+    service = TransferService(runner, {'cache': 1, 'restore': 1})
+    store = JsonTrackerStore(queue_file)
+    try:
+        assert service.attach_store(store) == 1
+        assert set(store.load()) == {'restore:/a'}
+        runner.gate.set()
+        while service.get_stats()['completed'] < 1:
+            time.sleep(0.01)
+    finally:
+        service.stop(timeout=5)
+
+    assert runner.order == ['restore:/a']
+    assert store.load() == {}
@@ -0,0 +1,81 @@
+"""Victim selection: plain priority order vs the size-aware cover, and admission floors."""
+
+from itertools import combinations
+from types import SimpleNamespace
+
+from src.core.cache_manager import CacheManager
+from src.core.transfers import TransferPriority
+from src.core.trackers import CachePriorityScorer
+
+
+GB = 1024 ** 3
+
+select = CachePriorityScorer.select_victims
+
+
+def lost_priority(selection):
+    return sum(priority + 1 for _, priority, _ in selection)
+
+
+def test_priority_strategy_stops_at_target():
+    candidates = [('/a', 5, 10), ('/b', 6, 10), ('/c', 7, 10)]
+    assert select(candidates, 15) == candidates[:2]
+    assert select(candidates, 0) == []
+
+
+def test_one_large_remux_beats_many_episodes():
+    episodes = [(f'/tv/e{i}.mkv', 10, 2 * GB) for i in range(20)]
+    remux = ('/movies/remux.mkv', 40, 60 * GB)
+    candidates = sorted(episodes + [remux], key=lambda c: c[1])
+
+    assert select(candidates, 40 * GB, "priority") == episodes
+    assert select(candidates, 40 * GB, "size_aware") == [remux]
+
+
+def test_selection_covers_target_with_no_spare_files():
+    candidates = [('/a', 1, 5), ('/b', 2, 50), ('/c', 3, 8), ('/d', 30, 100), ('/e', 4, 3)]
+
+    selected = select(candidates, 60, "size_aware")
+
+    freed = sum(size for _, _, size in selected)
+    assert freed >= 60
+    assert all(freed - size < 60 for _, _, size in selected)
+    assert [c[1] for c in selected] == sorted(c[1] for c in selected)
+
+
+def test_close_to_optimal_on_small_inputs():
+    candidates = [('/a', 3, 7), ('/b', 9, 20), ('/c', 0, 2), ('/d', 12, 30),
+                  ('/e', 5, 11), ('/f', 20, 45), ('/g', 1, 4)]
+    target = 33
+
+    best = min(
+        lost_priority(combo)
+        for n in range(1, len(candidates) + 1)
+        for combo in combinations(candidates, n)
+        if sum(c[2] for c in combo) >= target
+    )
+    selected = select(candidates, target, "size_aware")
+
+    assert sum(c[2] for c in selected) >= target
+    assert lost_priority(selected) <= 2 * best
+
+
+def test_unreachable_target_takes_everything_with_a_size():
+    candidates = [('/a', 1, 0), ('/b', 2, 10), ('/c', 3, 10)]
+    assert select(candidates, 100, "size_aware") == [('/b', 2, 10), ('/c', 3, 10)]
+    assert select(candidates, 0, "size_aware") == []
+
+
+def test_admission_eviction_keeps_files_worth_more_than_the_copy():
+    manager = SimpleNamespace(config=SimpleNamespace(
+        cache_limits=SimpleNamespace(eviction_min_priority=100),
+        plex=SimpleNamespace(number_episodes=5),
+    ))
+    floor = lambda priority: CacheManager._eviction_floor(manager, priority)
+    current_ondeck = CachePriorityScorer.calculate(
+        {'source': 'ondeck', 'episode_info': {'is_current_ondeck': True}})
+
+    # Even a week-old current OnDeck episode outranks an incoming Trakt file
+    assert current_ondeck - 10 >= floor(TransferPriority.TRAKT)
+    assert floor(TransferPriority.TRAKT) < floor(TransferPriority.WATCHLIST) < floor(TransferPriority.ONDECK_CURRENT)
+    assert floor(None) == 100
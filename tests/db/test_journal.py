@@ -0,0 +1,85 @@
+"""JournalTrackerStore: appends, replay on load and compaction."""
+
+import json
+import os
+
+import pytest
+
+from src.db.journal import JournalTrackerStore
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / "tracker.json")
+
+
+def open_store(path, **kwargs):
+    store = JournalTrackerStore(path, "test", **kwargs)
+    store.load()
+    return store
+
+
+def test_changes_are_appended_and_replayed(snapshot_path):
+    store = open_store(snapshot_path)
+    store.apply({}, {'/a': {'n': 1}, '/b': {'n': 2}})
+    store.apply({}, {'/a': None})
+    store.apply({}, {'/b': {'n': 3}})
+
+    assert not os.path.exists(snapshot_path)
+    with open(snapshot_path + ".journal") as f:
+        ops = [json.loads(line)['op'] for line in f]
+    assert ops == ['set', 'set', 'del', 'set']
+
+    assert JournalTrackerStore(snapshot_path).load() == {'/b': {'n': 3}}
+
+
+def test_torn_record_is_dropped(snapshot_path):
+    store = open_store(snapshot_path)
+    store.apply({}, {'/a': {'n': 1}})
+    with open(snapshot_path + ".journal", 'a') as f:
+        f.write('{"op": "set", "path": "/b", "ent')
+
+    reopened = open_store(snapshot_path)
+    assert reopened.load() == {'/a': {'n': 1}}
+
+    # Appends after the truncation start on a clean line
+    reopened.apply({}, {'/c': {'n': 2}})
+    assert JournalTrackerStore(snapshot_path).load() == {'/a': {'n': 1}, '/c': {'n': 2}}
+
+
+def test_compact_folds_journal_into_snapshot(snapshot_path):
+    store = open_store(snapshot_path)
+    store.replace({'/a': {'n': 0}})
+    for i in range(20):
+        store.apply({}, {f'/f{i}': {'n': i}})
+    store.apply({}, {'/a': None})
+
+    assert store.compact()
+
+    assert os.path.getsize(snapshot_path + ".journal") == 0
+    with open(snapshot_path) as f:
+        snapshot = json.load(f)
+    assert snapshot == {f'/f{i}': {'n': i} for i in range(20)}
+    assert JournalTrackerStore(snapshot_path).load() == snapshot
+
+
+def test_replace_discards_the_journal(snapshot_path):
+    store = open_store(snapshot_path)
+    store.apply({}, {'/a': {'n': 1}})
+
+    store.replace({'/b': {'n': 2}})
+
+    assert os.path.getsize(snapshot_path + ".journal") == 0
+    assert JournalTrackerStore(snapshot_path).load() == {'/b': {'n': 2}}
+
+
+def test_close_compacts_outstanding_records(snapshot_path):
+    store = open_store(snapshot_path, compact_bytes=256)
+    for i in range(50):
+        store.apply({}, {f'/f{i}': {'n': i}})
+    store.apply({}, {'/f0': None})
+    store.close()
+
+    assert os.path.getsize(snapshot_path + ".journal") == 0
+    with open(snapshot_path) as f:
+        assert json.load(f) == {f'/f{i}': {'n': i} for i in range(1, 50)}
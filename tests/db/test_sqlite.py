@@ -0,0 +1,50 @@
+"""SqliteTrackerStore: row-level changes and one-time JSON migration."""
+
+import json
+
+import pytest
+
+from src.db.sqlite import SqliteTrackerStore, TrackerDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = TrackerDatabase(str(tmp_path / "cacherr.db"))
+    yield database
+    database.close()
+
+
+def test_apply_writes_only_changed_rows(db):
+    store = SqliteTrackerStore(db, "ondeck")
+    store.replace({'/a': {'users': ['x']}, '/b': {'users': ['y']}})
+
+    store.apply({}, {'/a': None, '/c': {'users': ['z']}})
+
+    assert store.load() == {'/b': {'users': ['y']}, '/c': {'users': ['z']}}
+
+
+def test_trackers_share_the_database(db):
+    ondeck = SqliteTrackerStore(db, "ondeck")
+    watchlist = SqliteTrackerStore(db, "watchlist")
+    ondeck.apply({}, {'/a': {'n': 1}})
+    watchlist.apply({}, {'/a': {'n': 2}})
+
+    watchlist.replace({})
+
+    assert ondeck.load() == {'/a': {'n': 1}}
+    assert watchlist.load() == {}
+
+
+def test_legacy_file_is_migrated_once(db, tmp_path):
+    legacy = tmp_path / "ondeck_tracker.json"
+    legacy.write_text(json.dumps({'/a': {'users': ['x']}}))
+
+    store = SqliteTrackerStore(db, "ondeck", legacy_file=str(legacy))
+    assert store.load() == {'/a': {'users': ['x']}}
+    assert not legacy.exists()
+    assert (tmp_path / "ondeck_tracker.json.migrated").exists()
+
+    # A stale file showing up again doesn't overwrite rows already in the database
+    legacy.write_text(json.dumps({'/old': {}}))
+    store.apply({}, {'/b': {'users': []}})
+    assert set(store.load()) == {'/a', '/b'}